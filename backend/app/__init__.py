@@ -37,15 +37,29 @@ def create_app(debug=False):
 
 
     
+    # Fast JSON encoding for jsonify() and request bodies
+    from app.utils.json_provider import init_json_provider
+    init_json_provider(app)
+    
     # Enable CORS
     CORS(app, supports_credentials=True, origins=[app.config["FRONTEND_URL"]])
     
+    # Compress large JSON responses
+    from app.middlewares.compression import init_compression
+    init_compression(app)
+    
     
     # Initialize extensions with app
     db.init_app(app)
     oauth.init_app(app)
     
-    # Register OAuth provider
+    # Register OAuth provider (ID tokens are verified against a cached JWKS)
+    from app.utils.jwks_cache import jwks_cache, CachedJWKSOAuth2App
+    jwks_cache.configure(
+        app.config['OAUTH_JWKS_URI'],
+        ttl=app.config['OAUTH_JWKS_CACHE_TTL'],
+        min_refresh_interval=app.config['OAUTH_JWKS_MIN_REFRESH_INTERVAL']
+    )
     oauth.register(
         name='oauth_provider',
         client_id=app.config['OAUTH_CLIENT_ID'],
@@ -57,7 +71,7 @@ def create_app(debug=False):
         client_kwargs={'scope': 'openid profile uuid email groups', 'response_type': 'code', 'state_in_authorization_response': True},
         redirect_uri=app.config['OAUTH_REDIRECT_URI'],
         token_endpoint_auth_method='client_secret_post',
-        
+        client_cls=CachedJWKSOAuth2App,
     )
     
     # File upload configuration
@@ -86,6 +100,7 @@ def create_app(debug=False):
     from app.routes.backpack_routes import backpack_bp
     from app.routes.collaboration_routes import collaboration_bp
     from app.routes.assignment_routes import assignment_bp
+    from app.routes.search_routes import search_bp
     app.register_blueprint(backpack_bp, url_prefix='/api/backpack')
     app.register_blueprint(auth_bp, url_prefix='/')
     app.register_blueprint(api_bp, url_prefix='/api')
@@ -94,6 +109,15 @@ def create_app(debug=False):
     app.register_blueprint(collaboration_bp, url_prefix='/api/collaboration')
     app.register_blueprint(teacher_bp, url_prefix='/api/teacher')
     app.register_blueprint(assignment_bp, url_prefix='/api/assignments')
+    app.register_blueprint(search_bp, url_prefix='/api/search')
+    
+    # Keep the full-text search index in sync with ORM writes
+    from app.utils.search_index import register_search_listeners
+    register_search_listeners()
+    
+    # Optimize uploaded assets after their transaction commits
+    from app.utils.asset_optimizer import register_optimizer_listeners
+    register_optimizer_listeners()
     
 
     return app
\ No newline at end of file
@@ -13,6 +13,9 @@ class Config:
     OAUTH_USERINFO_URL = os.environ.get('OAUTH_USERINFO_URL')
     OAUTH_JWKS_URI = os.environ.get('OAUTH_JWKS_URI')
     OAUTH_REDIRECT_URI = os.environ.get('OAUTH_REDIRECT_URI')
+    # Seconds the JWKS key set is cached for local ID-token verification
+    OAUTH_JWKS_CACHE_TTL = int(os.environ.get('OAUTH_JWKS_CACHE_TTL', 3600))
+    OAUTH_JWKS_MIN_REFRESH_INTERVAL = int(os.environ.get('OAUTH_JWKS_MIN_REFRESH_INTERVAL', 60))
     
     # Frontend URL for redirects after auth
     FRONTEND_URL = os.environ.get('FRONTEND_URL')
@@ -21,6 +24,29 @@ class Config:
     ROLE_TEACHER = os.environ.get('ROLE_TEACHER')
     ROLE_ADMIN = os.environ.get('ROLE_ADMIN')
 
+    # Expired session reaper (interval in seconds, 0 disables it)
+    SESSION_REAPER_INTERVAL = int(os.environ.get('SESSION_REAPER_INTERVAL', 3600))
+    SESSION_REAPER_GRACE = timedelta(days=int(os.environ.get('SESSION_REAPER_GRACE_DAYS', 7)))
+    SESSION_REAPER_BATCH_SIZE = int(os.environ.get('SESSION_REAPER_BATCH_SIZE', 500))
+    SESSION_REAPER_MAX_BATCHES = int(os.environ.get('SESSION_REAPER_MAX_BATCHES', 100))
+
+    # Auto-freeze scheduler (seconds between due-date resyncs, 0 disables it)
+    AUTO_FREEZE_RESYNC_INTERVAL = int(os.environ.get('AUTO_FREEZE_RESYNC_INTERVAL', 300))
+
+    # Commit stats backfill (worker processes, 0 disables it)
+    COMMIT_STATS_BACKFILL_WORKERS = int(os.environ.get('COMMIT_STATS_BACKFILL_WORKERS', 2))
+
+    # Lossless asset optimization after upload (served instead of the original)
+    ASSET_OPTIMIZATION = os.environ.get('ASSET_OPTIMIZATION', 'false').lower() == 'true'
+    ASSET_OPTIMIZATION_WORKERS = int(os.environ.get('ASSET_OPTIMIZATION_WORKERS', 2))
+
+    # gzip for JSON/text responses (level 1-9, 0 disables it; bodies below the size stay plain)
+    RESPONSE_COMPRESSION_LEVEL = int(os.environ.get('RESPONSE_COMPRESSION_LEVEL', 6))
+    RESPONSE_COMPRESSION_MIN_SIZE = int(os.environ.get('RESPONSE_COMPRESSION_MIN_SIZE', 1024))
+
+    # JSON encoder: 'orjson' (falls back without it), 'default' or an import path (utils/json_provider.py)
+    JSON_PROVIDER = os.environ.get('JSON_PROVIDER', 'orjson')
+
 class DevelopmentConfig(Config):
     DEBUG = True
     # Supports both SQLite and PostgreSQL
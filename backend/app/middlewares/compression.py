@@ -0,0 +1,95 @@
+"""
+Response compression
+gzip for large JSON/text responses of all routes (after_request hook).
+Buffered bodies are compressed in one go, streamed bodies chunk by chunk
+as they are produced (sync-flushed every STREAM_FLUSH_SIZE input bytes,
+so the client can decode the first rows while the rest is generated). Files (send_file), responses that already carry a
+Content-Encoding and binary formats (sb3, png, zip) are passed through.
+"""
+from flask import request
+import gzip
+import zlib
+
+COMPRESSIBLE_MIMETYPES = {
+    'application/json',
+    'text/plain',
+    'text/html',
+    'text/csv',
+}
+
+# Uncompressed bytes of a streamed body after which its output is flushed
+# (zlib otherwise holds back output until its internal buffer is full)
+STREAM_FLUSH_SIZE = 4 * 1024
+
+
+def _gzip_stream(chunks, level):
+    """Compress an iterable of body chunks into a gzip stream"""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    pending = 0
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            chunk = chunk.encode('utf-8')
+        data = compressor.compress(chunk)
+        pending += len(chunk)
+        if pending >= STREAM_FLUSH_SIZE:
+            data += compressor.flush(zlib.Z_SYNC_FLUSH)
+            pending = 0
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def compress_response(response, level, min_size):
+    """
+    gzip a response if the client accepts it and it is worth it
+
+    Args:
+        response: Flask response
+        level: zlib compression level (1-9)
+        min_size: Smallest buffered body that is compressed (bytes)
+
+    Returns: The (possibly modified) response
+    """
+    if response.mimetype not in COMPRESSIBLE_MIMETYPES:
+        return response
+
+    response.vary.add('Accept-Encoding')
+
+    if (request.method == 'HEAD'
+            or response.status_code < 200 or response.status_code in (204, 206, 304)
+            or 'Content-Encoding' in response.headers
+            or request.accept_encodings['gzip'] <= 0):
+        return response
+
+    if response.is_streamed:
+        # send_file responses are file wrappers (direct passthrough), not generated bodies
+        if response.direct_passthrough:
+            return response
+        original = response.response
+        response.response = _gzip_stream(original, level)
+        if hasattr(original, 'close'):
+            response.call_on_close(original.close)
+        response.headers.pop('Content-Length', None)
+    else:
+        data = response.get_data()
+        if len(data) < min_size:
+            return response
+        response.set_data(gzip.compress(data, compresslevel=level, mtime=0))
+
+    response.headers['Content-Encoding'] = 'gzip'
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        # Same entity, different bytes
+        response.set_etag(etag, weak=True)
+    return response
+
+
+def init_compression(app):
+    """Compress responses of the app (RESPONSE_COMPRESSION_LEVEL 0 disables it)"""
+
+    @app.after_request
+    def _compress(response):
+        level = app.config.get('RESPONSE_COMPRESSION_LEVEL', 6)
+        if level <= 0:
+            return response
+        return compress_response(response, min(level, 9), app.config.get('RESPONSE_COMPRESSION_MIN_SIZE', 1024))
@@ -22,4 +22,20 @@ class Asset(db.Model):
     owner = db.relationship('User', backref='assets')
     
     def __repr__(self):
-        return f'<Asset {self.asset_id}.{self.data_format}>'
\ No newline at end of file
+        return f'<Asset {self.asset_id}.{self.data_format}>'
+
+class AssetVariant(db.Model):
+    """
+    Derived file of an asset (e.g. a minified SVG), keyed to the original md5
+    The original file stays byte-exact; variants are only used for serving.
+    """
+    __tablename__ = 'asset_variants'
+    
+    asset_id = db.Column(db.String(128), db.ForeignKey('assets.asset_id', ondelete='CASCADE'), primary_key=True)
+    variant = db.Column(db.String(20), primary_key=True)  # optimized
+    file_path = db.Column(db.String(255), nullable=False)
+    size = db.Column(db.Integer, nullable=False)
+    created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
+    
+    def __repr__(self):
+        return f'<AssetVariant {self.asset_id} {self.variant}>'
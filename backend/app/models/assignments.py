@@ -1,4 +1,5 @@
 from app import db
+from app.utils.pagination import pick_fields
 from datetime import datetime, timezone
 from enum import Enum
 
@@ -195,9 +196,259 @@ class Assignment(db.Model):
     def has_submitted(self, user):
         """Check if user has submitted this assignment"""
         return self.get_submission(user) is not None
-    
-    def to_dict(self, include_assignments=False, include_submissions=False):
-        """Convert assignment to dictionary"""
+
+    @property
+    def freeze_reason(self):
+        """frozen_reason written on permissions frozen for this assignment"""
+        return f"Assignment submission: Assignment #{self.id}"
+
+    def freeze_submissions(self, frozen_by=None):
+        """
+        Freeze all submitted projects that are not frozen yet (set-based)
+
+        Args:
+            frozen_by: User ID of the organizer; None records the submitting
+                student (used by the auto-freeze job)
+
+        Returns: Number of frozen projects
+        """
+        from app.models.projects import CollaborativeProjectPermission
+
+        already_frozen = db.exists().where(
+            CollaborativeProjectPermission.collaborative_project_id == AssignmentSubmission.collaborative_project_id,
+            CollaborativeProjectPermission.is_frozen == True
+        )
+        project_ids = db.session.execute(
+            db.select(AssignmentSubmission.collaborative_project_id)
+            .where(AssignmentSubmission.assignment_id == self.id, ~already_frozen)
+            .distinct()
+        ).scalars().all()
+
+        if not project_ids:
+            return 0
+
+        if frozen_by is None:
+            frozen_by = db.select(AssignmentSubmission.user_id).where(
+                AssignmentSubmission.assignment_id == self.id,
+                AssignmentSubmission.collaborative_project_id == CollaborativeProjectPermission.collaborative_project_id
+            ).limit(1).scalar_subquery()
+
+        CollaborativeProjectPermission.freeze_projects(project_ids, frozen_by, self.freeze_reason)
+        return len(project_ids)
+
+    def unfreeze_submissions(self, own_only=False):
+        """
+        Unfreeze all submitted projects (set-based)
+
+        Args:
+            own_only: Only unfreeze permissions frozen for this assignment
+
+        Returns: Tuple (unfrozen projects, unfrozen permissions)
+        """
+        from app.models.projects import CollaborativeProjectPermission
+
+        reason = self.freeze_reason if own_only else None
+
+        query = db.select(CollaborativeProjectPermission.collaborative_project_id).where(
+            CollaborativeProjectPermission.collaborative_project_id.in_(
+                db.select(AssignmentSubmission.collaborative_project_id)
+                .where(AssignmentSubmission.assignment_id == self.id)
+            ),
+            CollaborativeProjectPermission.is_frozen == True
+        )
+        if reason is not None:
+            query = query.where(CollaborativeProjectPermission.frozen_reason == reason)
+        project_ids = db.session.execute(query.distinct()).scalars().all()
+
+        if not project_ids:
+            return 0, 0
+
+        permission_count = CollaborativeProjectPermission.unfreeze_projects(project_ids, reason)
+        return len(project_ids), permission_count
+
+    # ============================================================
+    # BULK QUERIES (several assignments at once)
+    # ============================================================
+
+    @staticmethod
+    def assigned_users_subquery(assignment_ids):
+        """
+        (assignment_id, user_id) of all assigned users, directly or via groups
+
+        UNION removes users that are assigned both ways.
+        """
+        from app.models.users import user_groups
+
+        direct = db.select(
+            AssignmentUser.assignment_id.label('assignment_id'),
+            AssignmentUser.user_id.label('user_id')
+        ).where(AssignmentUser.assignment_id.in_(assignment_ids))
+
+        via_groups = db.select(
+            AssignmentGroup.assignment_id,
+            user_groups.c.user_id
+        ).join(
+            user_groups, user_groups.c.group_id == AssignmentGroup.group_id
+        ).where(AssignmentGroup.assignment_id.in_(assignment_ids))
+
+        return db.union(direct, via_groups).subquery('assigned_users')
+
+    @classmethod
+    def get_statistics(cls, assignment_ids):
+        """
+        Organizer statistics for several assignments in two grouped queries
+
+        Returns: Dict assignment_id -> {'total_assigned', 'total_submitted', 'submission_rate'}
+        """
+        if not assignment_ids:
+            return {}
+
+        assigned = cls.assigned_users_subquery(assignment_ids)
+        assigned_counts = dict(db.session.execute(
+            db.select(assigned.c.assignment_id, db.func.count())
+            .group_by(assigned.c.assignment_id)
+        ).all())
+
+        submitted_counts = dict(db.session.execute(
+            db.select(
+                AssignmentSubmission.assignment_id,
+                db.func.count(db.distinct(AssignmentSubmission.user_id))
+            )
+            .where(AssignmentSubmission.assignment_id.in_(assignment_ids))
+            .group_by(AssignmentSubmission.assignment_id)
+        ).all())
+
+        statistics = {}
+        for assignment_id in assignment_ids:
+            total_assigned = assigned_counts.get(assignment_id, 0)
+            total_submitted = submitted_counts.get(assignment_id, 0)
+            statistics[assignment_id] = {
+                'total_assigned': total_assigned,
+                'total_submitted': total_submitted,
+                'submission_rate': (total_submitted / total_assigned * 100) if total_assigned > 0 else 0
+            }
+        return statistics
+
+    @staticmethod
+    def get_user_submissions(assignment_ids, user_id):
+        """
+        A user's submissions for several assignments in one query
+
+        Returns: Dict assignment_id -> AssignmentSubmission
+        """
+        if not assignment_ids:
+            return {}
+
+        submissions = AssignmentSubmission.query.filter(
+            AssignmentSubmission.assignment_id.in_(assignment_ids),
+            AssignmentSubmission.user_id == user_id
+        ).order_by(AssignmentSubmission.id).all()
+
+        # First submission per assignment, like get_submission()
+        result = {}
+        for submission in submissions:
+            result.setdefault(submission.assignment_id, submission)
+        return result
+
+    def get_roster(self, sort='username', descending=False, limit=50, offset=0):
+        """
+        Assigned users x submission x frozen state, one page
+
+        Includes students assigned via groups that have not submitted yet
+        (submission columns are NULL) and users who submitted but are no
+        longer assigned. One row per submission.
+
+        Args:
+            sort: 'username' or 'submitted_at' (not submitted rows last)
+            descending: Reverse sort order
+            limit: Page size
+            offset: Page offset
+
+        Returns: Tuple (list of row mappings, total row count)
+        """
+        from app.models.users import User
+        from app.models.projects import CollaborativeProject, CollaborativeProjectPermission, Commit
+        from app.utils.commit_stats import stats_columns
+
+        assigned = self.assigned_users_subquery([self.id])
+        roster_users = db.union(
+            db.select(assigned.c.user_id),
+            db.select(AssignmentSubmission.user_id).where(AssignmentSubmission.assignment_id == self.id)
+        ).subquery('roster_users')
+
+        is_frozen = db.exists().where(
+            CollaborativeProjectPermission.collaborative_project_id == AssignmentSubmission.collaborative_project_id,
+            CollaborativeProjectPermission.is_frozen == True
+        )
+
+        query = db.select(
+            User.id.label('user_id'),
+            User.username,
+            AssignmentSubmission.id.label('submission_id'),
+            AssignmentSubmission.submitted_at,
+            AssignmentSubmission.submitted_commit_id,
+            CollaborativeProject.id.label('collaborative_project_id'),
+            CollaborativeProject.name.label('collaborative_project_name'),
+            is_frozen.label('is_frozen'),
+            *stats_columns()
+        ).select_from(roster_users).join(
+            User, User.id == roster_users.c.user_id
+        ).outerjoin(
+            AssignmentSubmission, db.and_(
+                AssignmentSubmission.assignment_id == self.id,
+                AssignmentSubmission.user_id == User.id
+            )
+        ).outerjoin(
+            CollaborativeProject, CollaborativeProject.id == AssignmentSubmission.collaborative_project_id
+        ).outerjoin(
+            Commit, Commit.project_id == AssignmentSubmission.submitted_commit_id
+        )
+
+        total = db.session.execute(
+            db.select(db.func.count()).select_from(query.subquery())
+        ).scalar()
+
+        username_order = db.func.lower(User.username)
+        if sort == 'submitted_at':
+            submitted_order = AssignmentSubmission.submitted_at.desc() if descending \
+                else AssignmentSubmission.submitted_at.asc()
+            order_by = [AssignmentSubmission.submitted_at.is_(None), submitted_order, username_order]
+        else:
+            order_by = [username_order.desc() if descending else username_order]
+        order_by += [User.id, AssignmentSubmission.id]
+
+        rows = db.session.execute(
+            query.order_by(*order_by).limit(limit).offset(offset)
+        ).mappings().all()
+
+        return rows, total
+
+    @staticmethod
+    def get_organized_ids(assignment_ids, user_id):
+        """IDs of the given assignments that the user organizes"""
+        if not assignment_ids:
+            return set()
+
+        return set(db.session.execute(
+            db.select(assignment_organizers.c.assignment_id).where(
+                assignment_organizers.c.assignment_id.in_(assignment_ids),
+                assignment_organizers.c.user_id == user_id
+            )
+        ).scalars().all())
+
+    def to_dict(self, include_assignments=False, include_submissions=False, member_counts=None, fields=None):
+        """
+        Convert assignment to dictionary
+
+        Args:
+            member_counts: Optional precomputed Group.get_member_counts() result,
+                avoids loading the members of every assigned group
+            fields: Optional set of keys to return, unrequested relationships
+                (organizers, assignment lists) are not loaded
+        """
+        def wanted(field):
+            return fields is None or field in fields
+        
         # Helper to format datetime with timezone
         def format_datetime(dt):
             if not dt:
@@ -211,55 +462,61 @@ class Assignment(db.Model):
             'id': self.id,
             'name': self.name,
             'description': self.description,
-            'organizers': [{
-                'id': org.id,
-                'username': org.username
-            } for org in self.organizers],
             'created_at': format_datetime(self.created_at),
             'updated_at': format_datetime(self.updated_at),
             'due_date': format_datetime(self.due_date),
             'auto_freeze_on_due': self.auto_freeze_on_due,
             'is_deleted': self.is_deleted
         }
+        if wanted('organizers'):
+            data['organizers'] = [{
+                'id': org.id,
+                'username': org.username
+            } for org in self.organizers]
         
         if include_assignments:
             # Return user assignments with full structure
-            data['user_assignments'] = [{
-                'user': {
-                    'id': au.user.id,
-                    'username': au.user.username
-                },
-                'assigned_at': format_datetime(au.assigned_at)
-            } for au in self.user_assignments]
+            if wanted('user_assignments'):
+                data['user_assignments'] = [{
+                    'user': {
+                        'id': au.user.id,
+                        'username': au.user.username
+                    },
+                    'assigned_at': format_datetime(au.assigned_at)
+                } for au in self.user_assignments]
             
             # Return group assignments with full structure
-            data['group_assignments'] = [{
-                'group': {
-                    'id': ag.group.id,
-                    'name': ag.group.name,
-                    'external_id': ag.group.external_id,
-                    'member_count': len(ag.group.members) if ag.group.members else 0
-                },
-                'assigned_at': format_datetime(ag.assigned_at)
-            } for ag in self.group_assignments]
+            if wanted('group_assignments'):
+                data['group_assignments'] = [{
+                    'group': {
+                        'id': ag.group.id,
+                        'name': ag.group.name,
+                        'external_id': ag.group.external_id,
+                        'member_count': member_counts.get(ag.group_id, 0) if member_counts is not None
+                                        else len(ag.group.members) if ag.group.members else 0
+                    },
+                    'assigned_at': format_datetime(ag.assigned_at)
+                } for ag in self.group_assignments]
             
             # Also include simplified lists for backward compatibility
-            data['assigned_users'] = [{
-                'id': u.id,
-                'username': u.username
-            } for u in self.get_assigned_users()]
+            if wanted('assigned_users'):
+                data['assigned_users'] = [{
+                    'id': u.id,
+                    'username': u.username
+                } for u in self.get_assigned_users()]
             
-            data['assigned_groups'] = [{
-                'id': g.id,
-                'name': g.name,
-                'external_id': g.external_id
-            } for g in self.get_assigned_groups()]
+            if wanted('assigned_groups'):
+                data['assigned_groups'] = [{
+                    'id': g.id,
+                    'name': g.name,
+                    'external_id': g.external_id
+                } for g in self.get_assigned_groups()]
         
         if include_submissions:
             data['submissions'] = [sub.to_dict() for sub in self.submissions]
             data['submission_count'] = len(self.submissions)
         
-        return data
+        return pick_fields(data, fields)
 
 
 # ============================================================
@@ -349,8 +606,8 @@ class AssignmentSubmission(db.Model):
     def __repr__(self):
         return f'<AssignmentSubmission assignment:{self.assignment_id} user:{self.user_id} project:{self.collaborative_project_id}>'
     
-    def to_dict(self):
-        """Convert submission to dictionary"""
+    def to_dict(self, fields=None):
+        """Convert submission to dictionary (fields: optional set of keys to return)"""
         # Helper to format datetime with timezone
         def format_datetime(dt):
             if not dt:
@@ -360,17 +617,49 @@ class AssignmentSubmission(db.Model):
                 dt = dt.replace(tzinfo=timezone.utc)
             return dt.isoformat()
         
-        return {
+        data = {
             'id': self.id,
             'assignment_id': self.assignment_id,
-            'user': {
+            'submitted_at': format_datetime(self.submitted_at),
+            'submitted_commit_id': self.submitted_commit_id
+        }
+        if fields is None or 'user' in fields:
+            data['user'] = {
                 'id': self.user.id,
                 'username': self.user.username
-            },
-            'collaborative_project': {
+            }
+        if fields is None or 'collaborative_project' in fields:
+            data['collaborative_project'] = {
                 'id': self.collaborative_project.id,
                 'name': self.collaborative_project.name
-            },
-            'submitted_at': format_datetime(self.submitted_at),
-            'submitted_commit_id': self.submitted_commit_id
-        }
+            }
+        return pick_fields(data, fields)
+
+
+# ============================================================
+# ASSIGNMENT STARTER PROJECT
+# ============================================================
+
+class AssignmentStarterProject(db.Model):
+    """
+    Records the starter project handed out to a user for an assignment
+    (one per user, so repeated fan-outs only create the missing ones)
+    """
+    __tablename__ = 'assignment_starter_projects'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    assignment_id = db.Column(db.Integer, db.ForeignKey('assignments.id'), nullable=False)
+    user_id = db.Column(db.String(128), db.ForeignKey('users.id'), nullable=False)
+    collaborative_project_id = db.Column(db.Integer, db.ForeignKey('collaborative_projects.id'), nullable=False)
+    
+    # Commit (Project ID) the starter was created from
+    template_commit_id = db.Column(db.Integer, db.ForeignKey('projects.id'), nullable=True)
+    
+    created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
+    
+    __table_args__ = (
+        db.UniqueConstraint('assignment_id', 'user_id', name='unique_assignment_starter_project'),
+    )
+    
+    def __repr__(self):
+        return f'<AssignmentStarterProject assignment:{self.assignment_id} user:{self.user_id} project:{self.collaborative_project_id}>'
@@ -1,5 +1,6 @@
 from app import db
 from datetime import datetime, timezone
+from sqlalchemy import event
 import uuid
 
 def generate_id():
@@ -27,6 +28,11 @@ class BackpackItem(db.Model):
     updated_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc), 
                            onupdate=lambda: datetime.now(timezone.utc))
     
+    __table_args__ = (
+        # Covers the keyset-paginated listing (newest first per user)
+        db.Index('ix_backpack_owner_updated_id', 'owner_id', 'updated_at', 'id'),
+    )
+    
     def __repr__(self):
         return f'<BackpackItem {self.type}:{self.name}>'
     
@@ -47,4 +53,87 @@ class BackpackItem(db.Model):
         data['thumbnailUrl'] = f"/backend/api/assets/{self.thumbnail}"
         data['bodyUrl'] = f"/backend/api/assets/{self.body}.{self.mime.split('/')[1]}"
             
-        return data
\ No newline at end of file
+        return data
+
+
+class BackpackCounter(db.Model):
+    """
+    Number of backpack items per user, maintained on insert/delete
+    (created by the first read or change, see BackpackCounter.get_count)
+    """
+    __tablename__ = 'backpack_counters'
+    
+    owner_id = db.Column(db.String(128), db.ForeignKey('users.id', ondelete='CASCADE'), primary_key=True)
+    item_count = db.Column(db.Integer, nullable=False, default=0)
+    
+    @staticmethod
+    def get_count(owner_id):
+        """
+        Backpack item count of a user (counted once, then maintained)
+
+        A missing counter row is created in its own short transaction on a
+        separate connection, so reading the count never commits the caller's
+        session. Count and insert are one statement, and an item inserted
+        concurrently either is counted or finds the new row and adjusts it.
+        """
+        count = db.session.execute(
+            db.select(BackpackCounter.item_count).where(BackpackCounter.owner_id == owner_id)
+        ).scalar()
+        if count is not None:
+            return count
+
+        with db.engine.begin() as connection:
+            connection.execute(_counter_upsert(owner_id).on_conflict_do_nothing())
+            return connection.execute(
+                db.select(BackpackCounter.item_count).where(BackpackCounter.owner_id == owner_id)
+            ).scalar()
+
+
+def _counter_upsert(owner_id):
+    """INSERT of a user's counter row holding a fresh count of their items"""
+    from app.utils.db_utils import dialect_insert
+
+    return dialect_insert(BackpackCounter.__table__).from_select(
+        ['owner_id', 'item_count'],
+        db.select(
+            db.literal(owner_id, db.String(128)),
+            db.func.count(BackpackItem.id)
+        ).where(BackpackItem.owner_id == owner_id)
+    )
+
+
+def _adjust_backpack_count(connection, owner_id, delta):
+    updated = connection.execute(
+        db.update(BackpackCounter)
+        .where(BackpackCounter.owner_id == owner_id)
+        .values(item_count=BackpackCounter.item_count + delta)
+    ).rowcount
+    if updated:
+        return
+
+    # No counter yet: create it with a count that includes this flush, or
+    # adjust the one a concurrent first read or flush just created
+    connection.execute(
+        _counter_upsert(owner_id).on_conflict_do_update(
+            index_elements=['owner_id'],
+            set_={'item_count': BackpackCounter.__table__.c.item_count + delta}
+        )
+    )
+
+
+@event.listens_for(db.session, 'after_flush')
+def _backpack_items_flushed(session, flush_context):
+    # One net adjustment per owner once all rows of the flush are written
+    # (session.new/deleted still list the flushed objects here)
+    deltas = {}
+    for delta, objects in ((1, session.new), (-1, session.deleted)):
+        for obj in objects:
+            if isinstance(obj, BackpackItem):
+                deltas[obj.owner_id] = deltas.get(obj.owner_id, 0) + delta
+    if not deltas:
+        return
+
+    connection = session.connection()
+    for owner_id, delta in deltas.items():
+        if delta:
+            _adjust_backpack_count(connection, owner_id, delta)
@@ -76,7 +76,60 @@ class Group(db.Model):
             db.session.flush()
             
         return group
-    
+
+    @classmethod
+    def upsert_many(cls, groups):
+        """
+        Create or rename many groups with set-based statements
+
+        Only new groups are inserted (ON CONFLICT DO NOTHING, which locks no
+        existing row) and only groups whose name changed are updated, so
+        concurrent logins of one class do not serialize on the shared group
+        rows. Keys are written in sorted order (deterministic lock order).
+
+        Args:
+            groups: dict mapping {external_id: name}
+
+        Returns: dict mapping {external_id: group_id}
+        """
+        from app.utils.db_utils import dialect_insert
+
+        if not groups:
+            return {}
+
+        table = cls.__table__
+        external_ids = sorted(groups)
+        existing = dict(db.session.execute(
+            db.select(table.c.external_id, table.c.name).where(table.c.external_id.in_(external_ids))
+        ).all())
+
+        now = datetime.now(timezone.utc)
+        missing = [external_id for external_id in external_ids if external_id not in existing]
+        if missing:
+            db.session.execute(
+                dialect_insert(table).values([
+                    {'external_id': external_id, 'name': groups[external_id], 'created_at': now}
+                    for external_id in missing
+                ]).on_conflict_do_nothing(index_elements=['external_id'])
+            )
+
+        renamed = [external_id for external_id in external_ids
+                   if external_id in existing and existing[external_id] != groups[external_id]]
+        if renamed:
+            db.session.execute(
+                db.update(table)
+                .where(table.c.external_id == db.bindparam('b_external_id'),
+                       table.c.name != db.bindparam('b_name'))
+                .values(name=db.bindparam('b_name')),
+                [{'b_external_id': external_id, 'b_name': groups[external_id]} for external_id in renamed]
+            )
+
+        rows = db.session.execute(
+            db.select(table.c.id, table.c.external_id).where(table.c.external_id.in_(external_ids))
+        ).all()
+
+        return {external_id: group_id for group_id, external_id in rows}
+
     def has_member(self, user):
         """Check if user is a member of this group"""
         return user in self.members
@@ -189,6 +242,24 @@ class Group(db.Model):
     def get_members_count(self):
         """Get number of members in this group"""
         return len(self.members)
+
+    @staticmethod
+    def get_member_counts(group_ids):
+        """
+        Member counts of several groups in one grouped query
+
+        Returns: Dict group_id -> member count (groups without members are missing)
+        """
+        from app.models.users import user_groups
+
+        if not group_ids:
+            return {}
+
+        return dict(db.session.execute(
+            db.select(user_groups.c.group_id, db.func.count())
+            .where(user_groups.c.group_id.in_(group_ids))
+            .group_by(user_groups.c.group_id)
+        ).all())
     
     def get_projects_count(self):
         """Get number of collaborative projects accessible to this group"""
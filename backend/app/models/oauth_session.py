@@ -15,7 +15,7 @@ class OAuthSession(db.Model):
     user_id = db.Column(db.String(128), db.ForeignKey('users.id'), nullable=False)
     access_token = db.Column(db.Text, nullable=False)    # OAuth access token
     refresh_token = db.Column(db.Text, nullable=True)    # OAuth refresh token
-    expires_at = db.Column(db.DateTime, nullable=False)  # Token expiration time
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)  # Token expiration time (indexed for the reaper)
     created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
     last_accessed = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
     
@@ -63,33 +63,60 @@ class OAuthSession(db.Model):
     
     @staticmethod
     def _sync_groups(user, user_data):
-        """Sync user groups from OAuth data"""
+        """
+        Sync user groups from OAuth data
+
+        Only the difference against the stored memberships is written:
+        missing groups are upserted in one statement and membership rows
+        are inserted/deleted only when they changed.
+        """
         from app.models.groups import Group
-        
-        # Clear existing group associations
-        user.groups = []
-        
+        from app.models.users import user_groups
+        from app.utils.db_utils import dialect_insert
+
         # Extract groups from user data
-        oauth_groups = []
+        oauth_groups = {}
         # Check for groups in standard locations
         if 'groups' in user_data and type(user_data['groups']) == dict:
             raw_groups = [elem for elem in user_data.get('groups', {}).values()]
             for group in raw_groups:
                 # Object groups
-                oauth_groups.append({
-                    'id': group.get('act'),
-                    'name': group.get('name', group.get('act', 'Unknown'))
-                })
-        # Now create/update local groups and link to user
-        for oauth_group in oauth_groups:
-            # Create or get group
-            group = Group.get_or_create(
-                external_id=oauth_group['id'],
-                name=oauth_group['name']
+                if group.get('act'):
+                    oauth_groups[group.get('act')] = group.get('name', group.get('act', 'Unknown'))
+
+        # Create/rename local groups in one statement
+        desired_ids = set(Group.upsert_many(oauth_groups).values())
+
+        # Compare with existing memberships
+        current_ids = {
+            row[0] for row in db.session.execute(
+                db.select(user_groups.c.group_id).where(user_groups.c.user_id == user.id)
             )
-            # Add user to group
-            if group not in user.groups:
-                user.groups.append(group)
+        }
+
+        to_add = desired_ids - current_ids
+        to_remove = current_ids - desired_ids
+
+        if to_remove:
+            db.session.execute(
+                user_groups.delete().where(
+                    user_groups.c.user_id == user.id,
+                    user_groups.c.group_id.in_(to_remove)
+                )
+            )
+
+        if to_add:
+            now = datetime.now(timezone.utc)
+            db.session.execute(
+                dialect_insert(user_groups).values([
+                    {'user_id': user.id, 'group_id': group_id, 'joined_at': now}
+                    for group_id in to_add
+                ]).on_conflict_do_nothing()
+            )
+
+        if to_add or to_remove:
+            # Membership was changed behind the ORM's back
+            db.session.expire(user, ['groups'])
     
     def to_dict(self):
         """Convert session to dictionary for client"""
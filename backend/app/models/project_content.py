@@ -0,0 +1,58 @@
+from app import db
+from datetime import datetime, timezone
+
+
+# ============================================================
+# PROJECT CONTENT INDEX
+# ============================================================
+
+class ProjectContentIndex(db.Model):
+    """Marks a commit project whose project.json has been indexed"""
+    __tablename__ = 'project_content_index'
+
+    project_id = db.Column(db.Integer, db.ForeignKey('projects.id', ondelete='CASCADE'), primary_key=True)
+    indexed_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
+    error = db.Column(db.Text, nullable=True)  # Set if project.json could not be read
+
+    def __repr__(self):
+        return f'<ProjectContentIndex project:{self.project_id}>'
+
+
+class ProjectContentItem(db.Model):
+    """
+    One thing a project contains, with how often it occurs
+    kind: opcode, sprite, extension, variable or list
+    """
+    __tablename__ = 'project_content_items'
+
+    project_id = db.Column(db.Integer, db.ForeignKey('projects.id', ondelete='CASCADE'), primary_key=True)
+    kind = db.Column(db.String(20), primary_key=True)
+    name = db.Column(db.String(255), primary_key=True)
+    name_lower = db.Column(db.String(255), nullable=False)  # Case-insensitive lookups (str.lower())
+    count = db.Column(db.Integer, nullable=False, default=1)
+
+    __table_args__ = (
+        db.Index('idx_content_kind_name', 'kind', 'name'),
+        db.Index('idx_content_kind_name_lower', 'kind', 'name_lower'),
+    )
+
+    def __repr__(self):
+        return f'<ProjectContentItem {self.kind}:{self.name} x{self.count} project:{self.project_id}>'
+
+
+# ============================================================
+# COMMIT DIFF CACHE
+# ============================================================
+
+class CommitDiff(db.Model):
+    """Cached structural diff between two commits (commits never change)"""
+    __tablename__ = 'commit_diffs'
+
+    from_project_id = db.Column(db.Integer, db.ForeignKey('projects.id', ondelete='CASCADE'), primary_key=True)
+    to_project_id = db.Column(db.Integer, db.ForeignKey('projects.id', ondelete='CASCADE'), primary_key=True)
+    version = db.Column(db.Integer, nullable=False)  # project_diff.DIFF_VERSION used
+    diff = db.Column(db.JSON, nullable=False)
+    created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
+
+    def __repr__(self):
+        return f'<CommitDiff {self.from_project_id} -> {self.to_project_id}>'
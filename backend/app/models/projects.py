@@ -1,4 +1,5 @@
 from app import db
+from app.utils.pagination import pick_fields
 from datetime import datetime, timezone
 import uuid
 from enum import Enum
@@ -70,7 +71,80 @@ class CollaborativeProjectPermission(db.Model):
         self.frozen_at = None
         self.frozen_by = None
         self.frozen_reason = None
-    
+
+    @classmethod
+    def freeze_projects(cls, project_ids, frozen_by, reason=None):
+        """
+        Freeze every permission of the given projects (set-based)
+
+        Projects without an owner permission row get one first, so
+        single-owner projects are frozen as well.
+
+        Args:
+            project_ids: List of collaborative project IDs (or a SELECT of them)
+            frozen_by: User ID, or a SQL expression evaluated per permission row
+            reason: Freeze reason
+
+        Returns: Number of frozen permission rows
+
+        The session is not synchronized; callers commit or expire afterwards.
+        """
+        now = datetime.now(timezone.utc)
+
+        owner_has_row = db.exists().where(
+            cls.collaborative_project_id == CollaborativeProject.id,
+            cls.user_id == CollaborativeProject.created_by
+        )
+        missing_owner_rows = db.select(
+            CollaborativeProject.id,
+            CollaborativeProject.created_by,
+            db.literal(PermissionLevel.ADMIN, cls.permission.type),
+            db.literal(False),
+            CollaborativeProject.created_by,
+            db.literal(now, db.DateTime)
+        ).where(
+            CollaborativeProject.id.in_(project_ids),
+            ~owner_has_row
+        )
+        db.session.execute(
+            db.insert(cls).from_select(
+                ['collaborative_project_id', 'user_id', 'permission', 'is_frozen', 'granted_by', 'granted_at'],
+                missing_owner_rows
+            )
+        )
+
+        result = db.session.execute(
+            db.update(cls)
+            .where(cls.collaborative_project_id.in_(project_ids), cls.is_frozen == False)
+            .values(is_frozen=True, frozen_at=now, frozen_by=frozen_by, frozen_reason=reason),
+            execution_options={'synchronize_session': False}
+        )
+        return result.rowcount
+
+    @classmethod
+    def unfreeze_projects(cls, project_ids, reason=None):
+        """
+        Unfreeze the permissions of the given projects (set-based)
+
+        Args:
+            project_ids: List of collaborative project IDs (or a SELECT of them)
+            reason: Only unfreeze permissions frozen with exactly this reason
+
+        Returns: Number of unfrozen permission rows
+        """
+        stmt = db.update(cls).where(
+            cls.collaborative_project_id.in_(project_ids),
+            cls.is_frozen == True
+        )
+        if reason is not None:
+            stmt = stmt.where(cls.frozen_reason == reason)
+
+        result = db.session.execute(
+            stmt.values(is_frozen=False, frozen_at=None, frozen_by=None, frozen_reason=None),
+            execution_options={'synchronize_session': False}
+        )
+        return result.rowcount
+
     def to_dict(self):
         return {
             'id': self.id,
@@ -177,22 +251,28 @@ class Project(db.Model):
         self.deleted_at = None
         self.deleted_by = None
 
-    def to_dict(self, include_collab_info=False):
+    def to_dict(self, include_collab_info=False, fields=None):
+        """
+        Args:
+            fields: Optional set of keys to return (see utils/pagination.py
+                parse_fields), unrequested relationships are not loaded
+        """
         data = {
             'id': self.id,
             'name': self.name,
             'description': self.description,
             'thumbnail_url': self.thumbnail_url,
-            'owner': {
-                'id': self.owner.id,
-                'username': self.owner.username
-            },
             'created_at': self.created_at.isoformat(),
             'updated_at': self.updated_at.isoformat(),
             'is_collaborative': True,  # All projects are collaborative
             'is_working_copy': self.is_working_copy,
             'is_commit': self.is_commit
         }
+        if fields is None or 'owner' in fields:
+            data['owner'] = {
+                'id': self.owner.id,
+                'username': self.owner.username
+            }
         
         if include_collab_info:
             if self.commit_info:
@@ -211,7 +291,7 @@ class Project(db.Model):
                     'has_changes': self.working_copy_info.has_changes
                 }
             
-        return data
+        return pick_fields(data, fields)
 
 
 # ============================================================
@@ -288,28 +368,9 @@ class CollaborativeProject(db.Model):
         """
         reason = f"Assignment submission: Assignment #{assignment_id}"
         
-        # Ensure owner has a permission entry (for single-owner projects)
-        owner_perm = CollaborativeProjectPermission.query.filter_by(
-            collaborative_project_id=self.id,
-            user_id=self.created_by
-        ).first()
-        
-        if not owner_perm:
-            # Create owner permission entry
-            owner_perm = CollaborativeProjectPermission(
-                collaborative_project_id=self.id,
-                user_id=self.created_by,
-                permission=PermissionLevel.ADMIN,
-                granted_by=self.created_by,
-                granted_at=datetime.now(timezone.utc)
-            )
-            db.session.add(owner_perm)
-            db.session.flush()
-        
-        # Freeze all permissions including the owner's
-        for permission in self.permissions:
-            if not permission.is_frozen:
-                permission.freeze(user_id, reason)
+        # Ensures the owner has a permission entry (for single-owner projects)
+        CollaborativeProjectPermission.freeze_projects([self.id], user_id, reason)
+        db.session.expire(self, ['permissions'])
     
     def is_frozen(self):
         """Check if project is frozen (any permission is frozen)"""
@@ -497,18 +558,19 @@ class CollaborativeProject(db.Model):
                 }
         return list(groups_dict.values())
     
-    def to_dict(self, include_permissions=False, include_commits=False):
+    def to_dict(self, include_permissions=False, include_commits=False, fields=None):
         data = {
             'id': self.id,
             'name': self.name,
             'description': self.description,
             'created_by': self.created_by,
-            'creator_username': self.creator.username if self.creator else None,
             'created_at': self.created_at.isoformat(),
             'updated_at': self.updated_at.isoformat(),
             'latest_commit_id': self.latest_commit_id,
             'is_deleted': self.is_deleted
         }
+        if fields is None or 'creator_username' in fields:
+            data['creator_username'] = self.creator.username if self.creator else None
         
         if include_permissions:
             data['permissions'] = [p.to_dict() for p in self.permissions]
@@ -516,7 +578,7 @@ class CollaborativeProject(db.Model):
         if include_commits:
             data['commits'] = [c.to_dict() for c in self.commits]
         
-        return data
+        return pick_fields(data, fields)
 
 
 # ============================================================
@@ -557,6 +619,16 @@ class Commit(db.Model):
     
     committed_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
     
+    # Stats of the committed .sb3, computed once at commit time (NULL = not computed yet)
+    sb3_size = db.Column(db.BigInteger, nullable=True)
+    asset_count = db.Column(db.Integer, nullable=True)
+    asset_bytes = db.Column(db.BigInteger, nullable=True)
+    sprite_count = db.Column(db.Integer, nullable=True)
+    block_count = db.Column(db.Integer, nullable=True)
+    script_count = db.Column(db.Integer, nullable=True)
+    # MinHash signature of the scripts (utils/similarity.py, b'' = unreadable)
+    minhash = db.Column(db.LargeBinary, nullable=True)
+    
     __table_args__ = (
         db.UniqueConstraint('collaborative_project_id', 'commit_number', 
                           name='uq_collab_commit_number'),
@@ -566,16 +638,34 @@ class Commit(db.Model):
     def __repr__(self):
         return f'<Commit #{self.commit_number} of CollabProject {self.collaborative_project_id}>'
     
-    def to_dict(self):
-        return {
+    def to_dict(self, fields=None):
+        data = {
             'id': self.id,
             'project_id': self.project_id,
             'commit_number': self.commit_number,
             'commit_message': self.commit_message,
             'parent_commit_id': self.parent_commit_id,
-            'committed_by': self.committer.username if self.committer else 'Unknown',
-            'committed_at': self.committed_at.isoformat()
+            'committed_at': self.committed_at.isoformat(),
+            'stats': self.stats_dict()
         }
+        if fields is None or 'committed_by' in fields:
+            data['committed_by'] = self.committer.username if self.committer else 'Unknown'
+        return pick_fields(data, fields)
+    
+    def stats_dict(self):
+        """Precomputed stats of the commit (None if not computed yet)"""
+        from app.utils.commit_stats import STATS_COLUMNS
+        
+        if self.sb3_size is None:
+            return None
+        return {column: getattr(self, column) for column in STATS_COLUMNS}
+    
+    def copy_stats_from(self, other):
+        """Take over the stats (and MinHash signature) of a commit with identical content"""
+        from app.utils.commit_stats import STATS_COLUMNS
+        
+        for column in STATS_COLUMNS + ('minhash',):
+            setattr(self, column, getattr(other, column))
 
 
 # ============================================================
@@ -0,0 +1,37 @@
+from app import db
+from datetime import datetime, timezone
+
+
+# ============================================================
+# SEARCH DOCUMENT
+# ============================================================
+
+class SearchDocument(db.Model):
+    """
+    Searchable text of a collaborative project, commit or assignment
+
+    The full-text index on top of this table is dialect specific and
+    created by app.utils.search_index.ensure_search_index():
+    a tsvector column with a GIN index on PostgreSQL, an FTS5 table on SQLite.
+    """
+    __tablename__ = 'search_documents'
+
+    id = db.Column(db.Integer, primary_key=True)
+    doc_type = db.Column(db.String(20), nullable=False)  # project, commit, assignment
+    doc_id = db.Column(db.Integer, nullable=False)
+
+    # Scope used for permission filtering
+    collaborative_project_id = db.Column(db.Integer, nullable=True, index=True)
+    assignment_id = db.Column(db.Integer, nullable=True, index=True)
+
+    title = db.Column(db.Text, nullable=True)
+    body = db.Column(db.Text, nullable=True)
+    updated_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc),
+                          onupdate=lambda: datetime.now(timezone.utc))
+
+    __table_args__ = (
+        db.UniqueConstraint('doc_type', 'doc_id', name='unique_search_document'),
+    )
+
+    def __repr__(self):
+        return f'<SearchDocument {self.doc_type}:{self.doc_id}>'
@@ -14,6 +14,9 @@ user_groups = db.Table('user_groups',
 class User(db.Model):
     """Store permanent user data"""
     __tablename__ = 'users'
+    __table_args__ = (
+        db.Index('ix_users_username_id', 'username', 'id'),  # Keyset pagination of student lists
+    )
     
     id = db.Column(db.String(128), primary_key=True)
     username = db.Column(db.String(128), nullable=False)
@@ -5,16 +5,13 @@ from app.models.groups import Group
 from werkzeug.exceptions import Unauthorized
 from functools import wraps
 from app.middlewares.auth import require_auth
-from datetime import datetime, timedelta
+from datetime import datetime
 from app import db
-from app.utils.assignment_scheduler import check_and_freeze_overdue_assignments
+from app.utils import metrics
+from app.utils.json_stream import stream_json_response, iter_rows
 
 api_bp = Blueprint('api', __name__)
 
-# Auto-freeze cooldown tracking
-_last_auto_freeze_check = None
-_auto_freeze_cooldown = timedelta(minutes=1)
-
 @api_bp.route('/user', methods=['GET'])
 @require_auth
 def get_user(user):  # Accept the user parameter from require_auth
@@ -141,23 +138,20 @@ def api_status():
     """Check API status"""
     """Simple endpoint to check if the backend is online"""
     
-    global _last_auto_freeze_check
-    
-    # Check if we should run auto-freeze (with 1-minute cooldown)
-    now = datetime.now()
-    if _last_auto_freeze_check is None or (now - _last_auto_freeze_check) >= _auto_freeze_cooldown:
-        try:
-            check_and_freeze_overdue_assignments()
-            _last_auto_freeze_check = now
-        except Exception as e:
-            # Don't fail the status check if auto-freeze fails
-            current_app.logger.error(f"Auto-freeze check failed: {str(e)}")
-    
     return jsonify({
         'status': 'ok',
-        'timestamp': now.isoformat()
+        'timestamp': datetime.now().isoformat()
     }), 200
 
+@api_bp.route('/metrics', methods=['GET'])
+@require_auth
+def get_metrics(user_info):
+    """Get background job counters (admins only)"""
+    if user_info.get('role') != 'admin':
+        return jsonify({'error': 'Admin privileges required'}), 403
+
+    return jsonify(metrics.snapshot()), 200
+
 @api_bp.route('/groups', methods=['GET'])
 @require_auth
 def get_user_groups(user_info):
@@ -168,20 +162,23 @@ def get_user_groups(user_info):
         if not user:
             return jsonify({'error': 'User not found'}), 404
 
-        if user.role in ('admin', 'teacher'):
-            source_groups = Group.query.order_by(Group.name).all()
-        else:
-            source_groups = user.groups
-
-        groups = [
-            {
+        def serialize(group):
+            return {
                 'id': group.id,
                 'name': group.name,
                 'external_id': group.external_id,
                 'description': group.description
             }
-            for group in source_groups
-        ]
+
+        if user.role in ('admin', 'teacher'):
+            # All groups: streamed from a server-side cursor
+            def all_groups():
+                for group in iter_rows(db.select(Group).order_by(Group.name)).scalars():
+                    yield serialize(group)
+
+            return stream_json_response('groups', all_groups())
+
+        groups = [serialize(group) for group in user.groups]
 
         return jsonify({'groups': groups}), 200
 
@@ -1,15 +1,18 @@
 from flask import Blueprint, request, jsonify, current_app, send_file
 from app import db
-from app.models.asset import Asset
+from app.models.asset import Asset, AssetVariant
 from app.middlewares.auth import require_auth
-from datetime import datetime, timezone
+from app.utils.asset_ingest import ingest_asset, ingest_many, existing_asset_ids
+from app.utils.asset_optimizer import (
+    OPTIMIZERS, OPTIMIZED, ENCODINGS, COMPRESSIBLE_TYPES, MIN_COMPRESS_SIZE, compressed_variant
+)
 import os
-from werkzeug.utils import secure_filename
-import hashlib
-from sqlalchemy.exc import IntegrityError
 
 assets_bp = Blueprint('assets', __name__)
 
+# Maximum number of assets per batch request
+MAX_BATCH_SIZE = 500
+
 @assets_bp.route('/', methods=['POST'])
 @require_auth
 def create_asset(user_info):
@@ -30,71 +33,92 @@ def create_asset(user_info):
         if asset_file.filename == '':
             return jsonify({'error': 'No asset selected'}), 400
             
-        if asset_file:
-            # Read the file data
-            file_data = asset_file.read()
-            
-            # Calculate MD5 hash of file data
-            md5hash = hashlib.md5(file_data).hexdigest()
-            
-            # Check if asset with this hash and type already exists with lock
-            existing_asset = Asset.query.filter_by(md5=md5hash, asset_type=asset_type).with_for_update().first()
-            if existing_asset:
-                return jsonify({
-                    'status': 'ok',
-                    'assetId': existing_asset.asset_id
-                }), 200
-            
-            # Make a secure filename with the hash
-            filename = secure_filename(f"{md5hash}.{data_format}")
-            upload_folder = os.path.join(current_app.config['UPLOAD_FOLDER'], asset_type)
-            
-            # Create directory if it doesn't exist
-            os.makedirs(upload_folder, exist_ok=True)
-            
-            file_path = os.path.join(upload_folder, filename)
-            
-            # Write the file
-            with open(file_path, 'wb') as f:
-                f.write(file_data)
-            
-            # Create asset record in database
-            asset = Asset(
-                asset_id=md5hash,
-                asset_type=asset_type,
-                data_format=data_format,
-                size=len(file_data),
-                md5=md5hash,
-                owner_id=user.id,
-                file_path=file_path
-            )
-            
-            try:
-                db.session.add(asset)
-                db.session.commit()
-                
-                return jsonify({
-                    'status': 'ok',
-                    'assetId': md5hash
-                }), 200
-            except IntegrityError:
-                # Asset was created by another concurrent request
-                db.session.rollback()
-                # Return existing asset
-                existing_asset = Asset.query.filter_by(md5=md5hash, asset_type=asset_type).first()
-                if existing_asset:
-                    return jsonify({
-                        'status': 'ok',
-                        'assetId': existing_asset.asset_id
-                    }), 200
-                else:
-                    raise
+        # Stream into storage while hashing (no-op for known content)
+        asset_id = ingest_asset(asset_file.stream, asset_type, data_format, user.id)
+        db.session.commit()
+        
+        return jsonify({
+            'status': 'ok',
+            'assetId': asset_id
+        }), 200
             
     except Exception as e:
         current_app.logger.error(f"Error creating asset: {str(e)}")
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
+@assets_bp.route('/missing', methods=['POST'])
+@require_auth
+def get_missing_assets(user_info):
+    """
+    Check which assets the server does not have yet
+    
+    Body: {"assetIds": ["<md5>" or "<md5>.<ext>", ...]}
+    Returns: The given IDs that are not stored, in request order
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        asset_ids = data.get('assetIds')
+        if not isinstance(asset_ids, list) or not all(isinstance(a, str) for a in asset_ids):
+            return jsonify({'error': 'assetIds must be a list of strings'}), 400
+        if len(asset_ids) > MAX_BATCH_SIZE:
+            return jsonify({'error': f'At most {MAX_BATCH_SIZE} assets per request'}), 400
+        
+        md5_of = {asset_id: asset_id.split('.', 1)[0].lower() for asset_id in asset_ids}
+        stored = existing_asset_ids(list(set(md5_of.values())))
+        
+        return jsonify({
+            'status': 'ok',
+            'missing': [asset_id for asset_id in asset_ids if md5_of[asset_id] not in stored]
+        }), 200
+        
+    except Exception as e:
+        current_app.logger.error(f"Error checking assets: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+@assets_bp.route('/batch', methods=['POST'])
+@require_auth
+def create_assets_batch(user_info):
+    """
+    Upload many assets in one multipart request
+    
+    Form fields:
+        asset: File part, repeated once per asset
+        type: Asset type per file (or once for all files)
+        format: Data format per file (default: file name extension)
+    """
+    try:
+        user = request.user
+        asset_files = request.files.getlist('asset')
+        if not asset_files:
+            return jsonify({'error': 'No asset file provided'}), 400
+        if len(asset_files) > MAX_BATCH_SIZE:
+            return jsonify({'error': f'At most {MAX_BATCH_SIZE} assets per request'}), 400
+        
+        types = request.form.getlist('type')
+        formats = request.form.getlist('format')
+        if len(types) not in (0, 1, len(asset_files)) or len(formats) not in (0, len(asset_files)):
+            return jsonify({'error': 'type and format must be given once per file'}), 400
+        
+        uploads = []
+        for index, asset_file in enumerate(asset_files):
+            asset_type = types[index] if len(types) > 1 else (types[0] if types else 'unknown')
+            data_format = formats[index] if formats else os.path.splitext(asset_file.filename or '')[1].lstrip('.')
+            uploads.append((asset_file.stream, asset_type, data_format))
+        
+        results = ingest_many(uploads, user.id)
+        db.session.commit()
+        
+        return jsonify({
+            'status': 'ok',
+            'assets': [{'assetId': asset_id, 'created': created} for asset_id, created in results]
+        }), 200
+        
+    except Exception as e:
+        current_app.logger.error(f"Error creating assets: {str(e)}")
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
 @assets_bp.route('/<asset_id>.<format>', methods=['GET'])
 def get_asset_with_format(asset_id, format):
     """Backward compatible route that redirects to the main asset route"""
@@ -144,11 +168,45 @@ def get_asset_by_id(asset_id):
             # Default to octet-stream for unknown types
             mime_type = 'application/octet-stream'
             
+        original_path = file_path = asset.file_path
+        compressible = mime_type in COMPRESSIBLE_TYPES and asset.size >= MIN_COMPRESS_SIZE
+        encoding = None
+        try:
+            # Serve the optimized variant if there is one (?original=true for the exact upload)
+            base = 'original'
+            wants_original = request.args.get('original', 'false').lower() == 'true'
+            if not wants_original and asset.data_format.lower() in OPTIMIZERS:
+                variant = db.session.get(AssetVariant, (asset.asset_id, OPTIMIZED))
+                if variant and os.path.exists(variant.file_path):
+                    file_path = variant.file_path
+                    base = OPTIMIZED
+            
+            # Precompressed copy for text formats, chosen by Accept-Encoding
+            if compressible:
+                accepted = [e for e in ('br', 'gzip') if e in ENCODINGS and request.accept_encodings[e] > 0]
+                for candidate in accepted:
+                    compressed = compressed_variant(asset.asset_id, base, file_path, asset.data_format, candidate)
+                    if compressed and os.path.exists(compressed.file_path):
+                        file_path = compressed.file_path
+                        encoding = candidate
+                        break
+        except Exception as e:
+            # Variants are an optimization, the stored upload is always servable
+            current_app.logger.error(f"Error selecting variant of asset {asset.asset_id}: {str(e)}")
+            db.session.rollback()
+            file_path = original_path
+            encoding = None
+            
         # Return the asset file with correct MIME type
-        return send_file(
-            asset.file_path,
+        response = send_file(
+            file_path,
             mimetype=mime_type
         )
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+        if compressible:
+            response.vary.add('Accept-Encoding')
+        return response
         
     except Exception as e:
         current_app.logger.error(f"Error retrieving asset: {str(e)}")
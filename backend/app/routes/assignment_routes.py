@@ -1,17 +1,35 @@
-from flask import Blueprint, request, jsonify, current_app
+from flask import Blueprint, request, jsonify, current_app, Response
 from app import db
 from app.models.assignments import (
     Assignment,
     AssignmentUser,
     AssignmentGroup,
-    AssignmentSubmission
+    AssignmentSubmission,
+    AssignmentStarterProject
+)
+from app.models.projects import (
+    CollaborativeProject,
+    CollaborativeProjectPermission,
+    PermissionLevel,
+    Project,
+    Commit
 )
-from app.models.projects import CollaborativeProject
 from app.models.users import User
 from app.models.groups import Group
 from app.middlewares.auth import require_auth
+from app.utils.assignment_scheduler import schedule_auto_freeze
+from app.utils.zip_stream import ZipStream, ZipTooLargeError
+from app.utils.starter_projects import start_starter_project_job, get_job as get_starter_project_job
+from app.utils.commit_stats import stats_from_row
+from app.utils.similarity import assignment_similarity
+from app.utils.pagination import parse_fields
 from datetime import datetime, timezone
+from urllib.parse import quote
 import traceback
+import csv
+import io
+import os
+import re
 
 assignment_bp = Blueprint('assignments', __name__)
 
@@ -103,6 +121,7 @@ def create_assignment(user_info):
                 assignment.assign_to_group(Group.query.get(group_id))
         
         db.session.commit()
+        schedule_auto_freeze(assignment)
         
         current_app.logger.info(f"Assignment {assignment.id} created by {user.username}")
         
@@ -127,10 +146,16 @@ def list_assignments(user_info):
     - for_submission=false/unset: 
         - Teachers/admins: See assignments they organize
         - Students: See assignments assigned to them
+    - fields: Comma-separated keys to return (unrequested relationships and
+      aggregates are not loaded)
     """
     try:
         user = User.query.get(user_info['user_id'])
         for_submission = request.args.get('for_submission', '').lower() == 'true'
+        fields = parse_fields(request.args.get('fields'))
+        
+        def wanted(field):
+            return fields is None or field in fields
         
         if for_submission:
             # For submission: Only show assignments user is actually assigned to
@@ -186,24 +211,29 @@ def list_assignments(user_info):
             else:
                 assignments = []
         
+        # Statistics, submissions and member counts for all assignments at once
+        assignment_ids = [a.id for a in assignments]
+        organized_ids = Assignment.get_organized_ids(assignment_ids, user.id) if wanted('statistics') else set()
+        statistics = Assignment.get_statistics(list(organized_ids))
+        user_submissions = Assignment.get_user_submissions(assignment_ids, user.id) if wanted('user_submission') else {}
+        member_counts = Group.get_member_counts(db.session.execute(
+            db.select(AssignmentGroup.group_id)
+            .where(AssignmentGroup.assignment_id.in_(assignment_ids))
+            .distinct()
+        ).scalars().all()) if wanted('group_assignments') else {}
+        
         assignment_list = []
         for assignment in assignments:
-            assignment_data = assignment.to_dict(include_assignments=True)
+            assignment_data = assignment.to_dict(include_assignments=True, member_counts=member_counts, fields=fields)
             
             # Add submission status for current user
-            submission = assignment.get_submission(user)
-            assignment_data['user_submission'] = submission.to_dict() if submission else None
+            if wanted('user_submission'):
+                submission = user_submissions.get(assignment.id)
+                assignment_data['user_submission'] = submission.to_dict() if submission else None
             
             # For organizers, add statistics
-            if assignment.is_organizer(user):
-                total_assigned = len(assignment.get_all_assigned_users())
-                total_submitted = len(assignment.submissions)
-                
-                assignment_data['statistics'] = {
-                    'total_assigned': total_assigned,
-                    'total_submitted': total_submitted,
-                    'submission_rate': (total_submitted / total_assigned * 100) if total_assigned > 0 else 0
-                }
+            if assignment.id in organized_ids:
+                assignment_data['statistics'] = statistics[assignment.id]
             
             assignment_list.append(assignment_data)
         
@@ -289,6 +319,7 @@ def update_assignment(user_info, assignment_id):
         assignment.updated_at = datetime.now(timezone.utc)
         
         db.session.commit()
+        schedule_auto_freeze(assignment)
         
         current_app.logger.info(f"Assignment {assignment_id} updated by {user.username}")
         
@@ -319,27 +350,12 @@ def delete_assignment(user_info, assignment_id):
             return jsonify({'error': 'Only organizers can delete assignments'}), 403
         
         # Unfreeze all projects that were frozen for this assignment and delete submissions
-        unfrozen_count = 0
-        deleted_submissions_count = 0
-        
-        # Get all submissions before deleting them
-        submissions_to_delete = list(assignment.submissions)
-        
-        for submission in submissions_to_delete:
-            collab_project = submission.collaborative_project
-            if collab_project and collab_project.is_frozen():
-                # Unfreeze all permissions that were frozen for this assignment
-                reason_prefix = f"Assignment submission: Assignment #{assignment_id}"
-                for permission in collab_project.permissions:
-                    if permission.is_frozen and permission.frozen_reason and permission.frozen_reason.startswith(reason_prefix):
-                        permission.unfreeze()
-                        unfrozen_count += 1
-                
-                current_app.logger.info(f"Unfroze project {collab_project.id} (assignment {assignment_id})")
-            
-            # Delete the submission entry
-            db.session.delete(submission)
-            deleted_submissions_count += 1
+        _, unfrozen_count = assignment.unfreeze_submissions(own_only=True)
+        
+        deleted_submissions_count = AssignmentSubmission.query\
+            .filter_by(assignment_id=assignment_id)\
+            .delete(synchronize_session=False)
+        db.session.expire(assignment, ['submissions'])
         
         assignment.soft_delete(user.id)
         db.session.commit()
@@ -585,7 +601,12 @@ def withdraw_submission(user_info, assignment_id):
 @assignment_bp.route('/<int:assignment_id>/submissions', methods=['GET'])
 @require_auth
 def get_submissions(user_info, assignment_id):
-    """Get all submissions for an assignment (only organizers)"""
+    """
+    Get all submissions for an assignment (only organizers)
+    
+    Query Parameters:
+        fields: Comma-separated keys to return (e.g. id,user,submitted_at)
+    """
     try:
         user = User.query.get(user_info['user_id'])
         assignment = Assignment.query.get(assignment_id)
@@ -596,12 +617,29 @@ def get_submissions(user_info, assignment_id):
         if not assignment.is_organizer(user):
             return jsonify({'error': 'Only organizers can view all submissions'}), 403
         
-        submissions = assignment.submissions
-        submission_list = [s.to_dict() for s in submissions]
-        
-        # Add freeze status for each submission
-        for i, submission in enumerate(submissions):
-            submission_list[i]['is_frozen'] = submission.collaborative_project.is_frozen()
+        fields = parse_fields(request.args.get('fields'))
+        
+        # Only join the relationships that are returned
+        query = AssignmentSubmission.query.filter_by(assignment_id=assignment_id)
+        for relationship in ('user', 'collaborative_project'):
+            if fields is None or relationship in fields:
+                query = query.options(db.joinedload(getattr(AssignmentSubmission, relationship)))
+        submissions = query.all()
+        submission_list = [s.to_dict(fields=fields) for s in submissions]
+        
+        # Freeze status of all submitted projects in one query
+        if fields is None or 'is_frozen' in fields:
+            frozen_project_ids = set(db.session.execute(
+                db.select(CollaborativeProjectPermission.collaborative_project_id).where(
+                    CollaborativeProjectPermission.collaborative_project_id.in_(
+                        [s.collaborative_project_id for s in submissions]
+                    ),
+                    CollaborativeProjectPermission.is_frozen == True
+                )
+            ).scalars().all())
+            
+            for i, submission in enumerate(submissions):
+                submission_list[i]['is_frozen'] = submission.collaborative_project_id in frozen_project_ids
         
         return jsonify({
             'success': True,
@@ -615,6 +653,348 @@ def get_submissions(user_info, assignment_id):
         return jsonify({'error': 'Failed to get submissions', 'details': str(e)}), 500
 
 
+@assignment_bp.route('/<int:assignment_id>/roster', methods=['GET'])
+@require_auth
+def get_roster(user_info, assignment_id):
+    """
+    Get the grading roster: every assigned user with submission and freeze status (only organizers)
+    
+    Query Parameters:
+        sort: 'username' (default) or 'submitted_at'
+        order: 'asc' (default) or 'desc'
+        limit: Page size (default 50, max 200)
+        offset: Page offset (default 0)
+    """
+    try:
+        user = User.query.get(user_info['user_id'])
+        assignment = Assignment.query.get(assignment_id)
+        
+        if not assignment or assignment.is_deleted:
+            return jsonify({'error': 'Assignment not found'}), 404
+        
+        if not assignment.is_organizer(user):
+            return jsonify({'error': 'Only organizers can view the roster'}), 403
+        
+        sort = request.args.get('sort', 'username')
+        if sort not in ('username', 'submitted_at'):
+            return jsonify({'error': 'sort must be username or submitted_at'}), 400
+        descending = request.args.get('order', 'asc').lower() == 'desc'
+        limit = min(max(request.args.get('limit', 50, type=int), 1), 200)
+        offset = max(request.args.get('offset', 0, type=int), 0)
+        
+        rows, total = assignment.get_roster(sort=sort, descending=descending, limit=limit, offset=offset)
+        
+        def format_datetime(dt):
+            if not dt:
+                return None
+            if dt.tzinfo is None:
+                dt = dt.replace(tzinfo=timezone.utc)
+            return dt.isoformat()
+        
+        roster = [{
+            'user': {
+                'id': row['user_id'],
+                'username': row['username']
+            },
+            'submission': {
+                'id': row['submission_id'],
+                'collaborative_project': {
+                    'id': row['collaborative_project_id'],
+                    'name': row['collaborative_project_name']
+                },
+                'submitted_at': format_datetime(row['submitted_at']),
+                'submitted_commit_id': row['submitted_commit_id'],
+                'submitted_commit_stats': stats_from_row(row)
+            } if row['submission_id'] else None,
+            'is_submitted': row['submission_id'] is not None,
+            'is_frozen': bool(row['is_frozen'])
+        } for row in rows]
+        
+        return jsonify({
+            'success': True,
+            'roster': roster,
+            'offset': offset,
+            'limit': limit,
+            'total': total,
+            'hasMore': (offset + len(roster)) < total
+        }), 200
+        
+    except Exception as e:
+        current_app.logger.error(f"Error getting roster: {str(e)}")
+        current_app.logger.error(traceback.format_exc())
+        return jsonify({'error': 'Failed to get roster', 'details': str(e)}), 500
+
+
+@assignment_bp.route('/<int:assignment_id>/submissions/download', methods=['GET'])
+@require_auth
+def download_submissions(user_info, assignment_id):
+    """
+    Download all submitted commits of an assignment as one ZIP (only organizers)
+    
+    The archive (one .sb3 per submission plus manifest.csv) is streamed
+    on the fly with a known Content-Length and supports single Range
+    requests (with If-Range) so interrupted downloads can be resumed.
+    """
+    try:
+        user = User.query.get(user_info['user_id'])
+        assignment = Assignment.query.get(assignment_id)
+        
+        if not assignment or assignment.is_deleted:
+            return jsonify({'error': 'Assignment not found'}), 404
+        
+        if not assignment.is_organizer(user):
+            return jsonify({'error': 'Only organizers can download submissions'}), 403
+        
+        rows = db.session.execute(
+            db.select(
+                AssignmentSubmission.id,
+                AssignmentSubmission.submitted_at,
+                AssignmentSubmission.submitted_commit_id,
+                User.id.label('user_id'),
+                User.username,
+                CollaborativeProject.id.label('collaborative_project_id'),
+                CollaborativeProject.name.label('project_name'),
+                Project.sb3_file_path,
+                Commit.commit_number
+            )
+            .join(User, User.id == AssignmentSubmission.user_id)
+            .join(CollaborativeProject, CollaborativeProject.id == AssignmentSubmission.collaborative_project_id)
+            .outerjoin(Project, Project.id == AssignmentSubmission.submitted_commit_id)
+            .outerjoin(Commit, Commit.project_id == AssignmentSubmission.submitted_commit_id)
+            .where(AssignmentSubmission.assignment_id == assignment_id)
+            .order_by(db.func.lower(User.username), AssignmentSubmission.id)
+        ).mappings().all()
+        
+        archive = ZipStream()
+        manifest = io.StringIO()
+        writer = csv.writer(manifest)
+        writer.writerow([
+            'username', 'user_id', 'project_id', 'project_name',
+            'commit_number', 'submitted_at', 'file'
+        ])
+        
+        for row in rows:
+            file_name = ''
+            path = row['sb3_file_path']
+            if path and os.path.exists(path):
+                file_name = archive.add_file(
+                    _archive_name(f"{row['username']}_{row['project_name']}.sb3"),
+                    path,
+                    modified=row['submitted_at']
+                )
+            writer.writerow([
+                row['username'],
+                row['user_id'],
+                row['collaborative_project_id'],
+                row['project_name'],
+                row['commit_number'] or '',
+                row['submitted_at'].isoformat() if row['submitted_at'] else '',
+                file_name or 'missing'
+            ])
+        
+        archive.add_bytes(
+            'manifest.csv',
+            manifest.getvalue().encode('utf-8-sig'),  # BOM so spreadsheet apps detect UTF-8
+            modified=max((row['submitted_at'] for row in rows if row['submitted_at']), default=None)
+        )
+        
+        try:
+            size = archive.size
+        except ZipTooLargeError as e:
+            return jsonify({'error': str(e)}), 413
+        
+        etag = archive.etag
+        start, stop, status = 0, size, 200
+        
+        # Honour a single byte range unless If-Range names another version
+        if_range = request.if_range
+        range_matches = (if_range.etag is None and if_range.date is None) or if_range.etag == etag
+        if request.range and range_matches and len(request.range.ranges) == 1:
+            byte_range = request.range.range_for_length(size)
+            if byte_range is None:
+                return Response(status=416, headers={'Content-Range': f'bytes */{size}'})
+            start, stop = byte_range
+            status = 206
+        
+        download_name = _archive_name(f"{assignment.name}_submissions.zip")
+        response = Response(
+            archive.iter_bytes(start, stop),
+            status=status,
+            mimetype='application/zip',
+            direct_passthrough=True
+        )
+        response.headers['Content-Length'] = str(stop - start)
+        response.headers['Accept-Ranges'] = 'bytes'
+        response.headers['Content-Disposition'] = (
+            f"attachment; filename=\"{download_name.encode('ascii', 'replace').decode('ascii')}\"; "
+            f"filename*=UTF-8''{quote(download_name)}"
+        )
+        response.set_etag(etag)
+        if status == 206:
+            response.headers['Content-Range'] = f'bytes {start}-{stop - 1}/{size}'
+        
+        current_app.logger.info(
+            f"Streaming {len(rows)} submissions of assignment {assignment_id} to {user.username} "
+            f"(bytes {start}-{stop - 1}/{size})"
+        )
+        
+        return response
+        
+    except Exception as e:
+        current_app.logger.error(f"Error downloading submissions: {str(e)}")
+        current_app.logger.error(traceback.format_exc())
+        return jsonify({'error': 'Failed to download submissions', 'details': str(e)}), 500
+
+
+def _archive_name(name):
+    """Make a file name safe for ZIP entries and downloads (keeps umlauts)"""
+    return re.sub(r'[\\/:*?"<>|\x00-\x1f]', '_', name).strip() or 'project.sb3'
+
+
+# ============================================================
+# STARTER PROJECTS
+# ============================================================
+
+@assignment_bp.route('/<int:assignment_id>/starter-project', methods=['POST'])
+@require_auth
+def create_starter_projects(user_info, assignment_id):
+    """
+    Give every assigned user their own copy of a template commit (only organizers)
+
+    Runs in the background; users that already got a starter project are
+    skipped, so the request can be repeated after assigning more users.
+    Body: collaborative_project_id, optional commit_number (default latest), optional name
+    """
+    try:
+        user = User.query.get(user_info['user_id'])
+        assignment = Assignment.query.get(assignment_id)
+
+        if not assignment or assignment.is_deleted:
+            return jsonify({'error': 'Assignment not found'}), 404
+
+        if not assignment.is_organizer(user):
+            return jsonify({'error': 'Only organizers can create starter projects'}), 403
+
+        data = request.get_json() or {}
+        template = CollaborativeProject.query.get(data.get('collaborative_project_id'))
+
+        if not template or template.is_deleted:
+            return jsonify({'error': 'Template project not found'}), 404
+
+        if not template.has_permission(user, PermissionLevel.READ):
+            return jsonify({'error': 'Access denied to template project'}), 403
+
+        if data.get('commit_number') is not None:
+            commit = Commit.query.filter_by(
+                collaborative_project_id=template.id,
+                commit_number=data['commit_number']
+            ).first()
+            template_commit_id = commit.project_id if commit else None
+        else:
+            template_commit_id = template.latest_commit_id
+
+        if not template_commit_id:
+            return jsonify({'error': 'Template commit not found'}), 404
+
+        name = (data.get('name') or template.name).strip()[:255]
+        job_id = start_starter_project_job(
+            current_app._get_current_object(), assignment.id, template_commit_id, name, user.id
+        )
+
+        current_app.logger.info(
+            f"Starter project job {job_id} for assignment {assignment.id} started by {user.username}"
+        )
+
+        return jsonify({
+            'success': True,
+            'job': get_starter_project_job(job_id)
+        }), 202
+
+    except Exception as e:
+        current_app.logger.error(f"Error creating starter projects: {str(e)}")
+        current_app.logger.error(traceback.format_exc())
+        return jsonify({'error': 'Failed to create starter projects', 'details': str(e)}), 500
+
+
+@assignment_bp.route('/<int:assignment_id>/starter-project/jobs/<job_id>', methods=['GET'])
+@require_auth
+def get_starter_project_progress(user_info, assignment_id, job_id):
+    """Get the progress of a starter project job (only organizers)"""
+    try:
+        user = User.query.get(user_info['user_id'])
+        assignment = Assignment.query.get(assignment_id)
+
+        if not assignment or assignment.is_deleted:
+            return jsonify({'error': 'Assignment not found'}), 404
+
+        if not assignment.is_organizer(user):
+            return jsonify({'error': 'Only organizers can view starter project jobs'}), 403
+
+        job = get_starter_project_job(job_id)
+        if not job or job['assignment_id'] != assignment_id:
+            return jsonify({'error': 'Job not found'}), 404
+
+        # Jobs run per worker process; the table is the shared source of truth
+        job['starter_projects'] = db.session.execute(
+            db.select(db.func.count(AssignmentStarterProject.id))
+            .where(AssignmentStarterProject.assignment_id == assignment_id)
+        ).scalar()
+
+        return jsonify({
+            'success': True,
+            'job': job
+        }), 200
+
+    except Exception as e:
+        current_app.logger.error(f"Error getting starter project job: {str(e)}")
+        current_app.logger.error(traceback.format_exc())
+        return jsonify({'error': 'Failed to get starter project job', 'details': str(e)}), 500
+
+
+# ============================================================
+# SIMILARITY
+# ============================================================
+
+@assignment_bp.route('/<int:assignment_id>/similarity', methods=['GET'])
+@require_auth
+def get_submission_similarity(user_info, assignment_id):
+    """
+    Find near-copies among the submissions of an assignment (only organizers)
+    Compares the stored MinHash signatures of the submitted commits.
+    
+    Query Parameters:
+        threshold: Minimum estimated similarity 0..1 (default 0.5)
+        limit: Maximum number of pairs (default 50, max 500)
+    """
+    try:
+        user = User.query.get(user_info['user_id'])
+        assignment = Assignment.query.get(assignment_id)
+        
+        if not assignment or assignment.is_deleted:
+            return jsonify({'error': 'Assignment not found'}), 404
+        
+        if not assignment.is_organizer(user):
+            return jsonify({'error': 'Only organizers can compare submissions'}), 403
+        
+        threshold = request.args.get('threshold', 0.5, type=float)
+        if not 0 <= threshold <= 1:
+            return jsonify({'error': 'threshold must be between 0 and 1'}), 400
+        limit = min(max(request.args.get('limit', 50, type=int), 1), 500)
+        
+        result = assignment_similarity(assignment, threshold=threshold, limit=limit)
+        
+        return jsonify({
+            'success': True,
+            'threshold': threshold,
+            **result
+        }), 200
+        
+    except Exception as e:
+        current_app.logger.error(f"Error comparing submissions: {str(e)}")
+        current_app.logger.error(traceback.format_exc())
+        return jsonify({'error': 'Failed to compare submissions', 'details': str(e)}), 500
+
+
 # ============================================================
 # FREEZE/UNFREEZE MANAGEMENT
 # ============================================================
@@ -678,8 +1058,7 @@ def unfreeze_submission(user_info, submission_id):
             return jsonify({'error': 'Project is not frozen'}), 400
         
         # Unfreeze all permissions
-        for perm in collab_project.permissions:
-            perm.unfreeze()
+        CollaborativeProjectPermission.unfreeze_projects([collab_project.id])
         
         db.session.commit()
         
@@ -713,11 +1092,7 @@ def freeze_all_submissions(user_info, assignment_id):
         if not assignment.is_organizer(user):
             return jsonify({'error': 'Only organizers can freeze submissions'}), 403
         
-        frozen_count = 0
-        for submission in assignment.submissions:
-            if not submission.collaborative_project.is_frozen():
-                submission.collaborative_project.freeze_for_assignment(user.id, assignment_id)
-                frozen_count += 1
+        frozen_count = assignment.freeze_submissions(frozen_by=user.id)
         
         db.session.commit()
         
@@ -752,12 +1127,7 @@ def unfreeze_all_submissions(user_info, assignment_id):
         if not assignment.is_organizer(user):
             return jsonify({'error': 'Only organizers can unfreeze submissions'}), 403
         
-        unfrozen_count = 0
-        for submission in assignment.submissions:
-            if submission.collaborative_project.is_frozen():
-                for perm in submission.collaborative_project.permissions:
-                    perm.unfreeze()
-                unfrozen_count += 1
+        unfrozen_count, _ = assignment.unfreeze_submissions()
         
         db.session.commit()
         
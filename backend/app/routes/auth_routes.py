@@ -65,9 +65,15 @@ def authorize():
         session.modified = True
         # Proceed with token exchange
         token = oauth.oauth_provider.authorize_access_token()
-        
-        user_info = token.get("userinfo") 
-        
+
+        # Claims of the ID token, verified locally against the cached JWKS
+        user_info = token.get("userinfo")
+
+        # Only ask the userinfo endpoint if the ID token lacks the groups (role) claim
+        if not user_info or 'groups' not in user_info:
+            remote_info = oauth.oauth_provider.userinfo(token=token)
+            user_info = {**(user_info or {}), **remote_info}
+
         # Extract user data
         user_id = user_info.get('uuid') or user_info.get('id') or user_info.get('sub')
         username = user_info.get('preferred_username') or user_info.get('username') or user_info.get('name')
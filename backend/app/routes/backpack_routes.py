@@ -1,14 +1,12 @@
 from flask import Blueprint, request, jsonify, current_app, url_for
 from app import db
-from app.models.backpack import BackpackItem
+from app.models.backpack import BackpackItem, BackpackCounter
 from app.models.users import User
-from app.models.asset import Asset
 from app.middlewares.auth import require_auth
+from app.utils.asset_ingest import ingest_asset, ingest_bytes
+from app.utils.pagination import encode_cursor, decode_cursor
+from datetime import datetime
 import base64
-import os
-import uuid
-from werkzeug.utils import secure_filename
-import hashlib
 
 backpack_bp = Blueprint('backpack', __name__)
 
@@ -21,37 +19,53 @@ def get_base_url():
 @backpack_bp.route('', methods=['GET'])
 @require_auth
 def get_backpack_contents(user_info):
-    """Get backpack items for a user"""
+    """
+    Get backpack items for a user (newest first)
+    
+    Query params:
+        limit: Page size (default 20, max 100)
+        cursor: nextCursor of the previous page (keyset on updated_at, id)
+        offset: Legacy paging, used when no cursor is given
+        include_total: Add the item count (maintained per user, no COUNT(*))
+    """
     try:
-            
-        # Get pagination parameters
-        limit = int(request.args.get('limit', 20))
-        offset = int(request.args.get('offset', 0))
+        limit = min(max(request.args.get('limit', 20, type=int), 1), 100)
+        offset = max(request.args.get('offset', 0, type=int), 0)
+        cursor = request.args.get('cursor')
         
-        # Query backpack items
-        items = BackpackItem.query.filter_by(owner_id=user_info['user_id']) \
-                                 .order_by(BackpackItem.updated_at.desc()) \
-                                 .limit(limit) \
-                                 .offset(offset) \
-                                 .all()
-                                 
-        # Get total count for pagination
-        total_count = BackpackItem.query.filter_by(owner_id=user_info['user_id']).count()
+        query = db.select(BackpackItem)\
+            .where(BackpackItem.owner_id == user_info['user_id'])\
+            .order_by(BackpackItem.updated_at.desc(), BackpackItem.id.desc())
         
-        # Convert items to dictionaries with full URLs
-        base_url = get_base_url()
-        items_data = [item.to_dict() for item in items]
+        if cursor:
+            try:
+                updated_at, item_id = decode_cursor(cursor, 2)
+                updated_at = datetime.fromisoformat(updated_at)
+            except (ValueError, TypeError):
+                return jsonify({'error': 'Invalid cursor'}), 400
+            query = query.where(
+                db.tuple_(BackpackItem.updated_at, BackpackItem.id) < (updated_at, item_id)
+            )
+        elif offset:
+            query = query.offset(offset)
         
-        # Check if there are more items available
-        has_more = (offset + len(items)) < total_count
+        # One extra row tells whether another page exists
+        items = db.session.execute(query.limit(limit + 1)).scalars().all()
+        has_more = len(items) > limit
+        items = items[:limit]
         
-        return jsonify({
-            'items': items_data,
-            'offset': offset,
+        response = {
+            'items': [item.to_dict() for item in items],
             'limit': limit,
-            'total': total_count,
-            'hasMore': has_more
-        }), 200
+            'hasMore': has_more,
+            'nextCursor': encode_cursor([items[-1].updated_at.isoformat(), items[-1].id]) if has_more else None
+        }
+        if not cursor:
+            response['offset'] = offset
+        if request.args.get('include_total', 'false').lower() == 'true':
+            response['total'] = BackpackCounter.get_count(user_info['user_id'])
+        
+        return jsonify(response), 200
         
     except Exception as e:
         current_app.logger.error(f"Error getting backpack contents: {str(e)}")
@@ -60,32 +74,54 @@ def get_backpack_contents(user_info):
 @backpack_bp.route('', methods=['POST'])
 @require_auth
 def save_backpack_item(user_info):
-    """Save an item to the backpack"""
+    """
+    Save an item to the backpack
+    
+    Accepts multipart/form-data (fields type, mime, name; binary file parts
+    body and thumbnail, streamed into storage) or JSON with base64 encoded
+    body and thumbnail (compatibility).
+    """
     try:
-            
+        is_multipart = request.mimetype == 'multipart/form-data'
+        
         # Get request data
-        data = request.json
+        if is_multipart:
+            data = request.form
+            files = request.files
+        else:
+            data = request.get_json(silent=True)
+            files = {}
         if not data:
             return jsonify({'error': 'No data provided'}), 400
             
         # Check required fields
         required_fields = ['type', 'mime', 'name', 'body', 'thumbnail']
         for field in required_fields:
-            if field not in data:
+            source = files if is_multipart and field in ('body', 'thumbnail') else data
+            if field not in source:
                 return jsonify({'error': f'Missing required field: {field}'}), 400
+        
+        mime_type = check_asset_mime_type(data['mime'])
                 
         try:
-            # Store the body asset
-            body_asset_id = store_asset_data(data['body'], check_asset_mime_type(data['mime']), data['type'], user_info['user_id'])
-            
-            # Store the thumbnail asset
-            thumbnail_asset_id = store_asset_data(data['thumbnail'], 'image/jpeg', 'thumbnail', user_info['user_id'])
+            if is_multipart:
+                # Binary parts: spooled to disk by the form parser, streamed into storage
+                body_asset_id = ingest_asset(files['body'].stream, data['type'],
+                                             mime_extension(mime_type), user_info['user_id'])
+                thumbnail_asset_id = ingest_asset(files['thumbnail'].stream, 'thumbnail',
+                                                  'jpg', user_info['user_id'])
+            else:
+                # Store the body asset
+                body_asset_id = store_asset_data(data['body'], mime_type, data['type'], user_info['user_id'])
+                
+                # Store the thumbnail asset
+                thumbnail_asset_id = store_asset_data(data['thumbnail'], 'image/jpeg', 'thumbnail', user_info['user_id'])
 
             # Create new backpack item
             backpack_item = BackpackItem(
                 type=data['type'],
                 name=data['name'],
-                mime=check_asset_mime_type(data['mime']),
+                mime=mime_type,
                 body=body_asset_id,
                 thumbnail=thumbnail_asset_id,
                 owner_id=user_info['user_id']
@@ -95,7 +131,6 @@ def save_backpack_item(user_info):
             db.session.commit()
             
             # Return the created item with full URLs
-            base_url = get_base_url()
             return jsonify(backpack_item.to_dict()), 200
         except Exception as db_error:
             current_app.logger.error(f"Database error saving backpack item: {str(db_error)}")
@@ -134,7 +169,7 @@ def delete_backpack_item(user_info, item_id):
         return jsonify({'error': str(e)}), 500
 
 def store_asset_data(base64_data, mime_type, asset_type, user_id):
-    """Store asset data and return the asset ID"""
+    """Store base64 asset data and return the asset ID (the caller commits)"""
     try:
         # Remove potential data URL prefix
         if ',' in base64_data:
@@ -143,52 +178,21 @@ def store_asset_data(base64_data, mime_type, asset_type, user_id):
         # Decode base64 data
         file_data = base64.b64decode(base64_data)
         
-        # Calculate MD5 hash
-        md5hash = hashlib.md5(file_data).hexdigest()
-        
-        # Check if asset with this hash already exists
-        existing_asset = Asset.query.filter_by(md5=md5hash).first()
-
-        # Determine file extension based on mime type
-        extension = mime_type.split('/')[-1]
-        if extension == 'jpeg':
-            extension = 'jpg'
-            
-        # Generate filename with hash
-        filename = secure_filename(f"{md5hash}.{extension}")
-        upload_folder = os.path.join(current_app.config['UPLOAD_FOLDER'], asset_type)
-        # Create directory if it doesn't exist
-        os.makedirs(upload_folder, exist_ok=True)
-        
-        # Write file to disk
-        file_path = os.path.join(upload_folder, filename)
-        with open(file_path, 'wb') as f:
-            f.write(file_data)
-            
-        # Create asset record
-        if not existing_asset:
-            asset = Asset(
-                asset_id=md5hash,
-                asset_type=asset_type,
-                data_format=extension,
-                size=len(file_data),
-                md5=md5hash,
-                owner_id=user_id,
-                file_path=file_path
-            )
-            
-            db.session.add(asset)
-            db.session.commit()
-        
-        return md5hash
+        return ingest_bytes(file_data, asset_type, mime_extension(mime_type), user_id)
         
     except Exception as e:
-        print("Error storing asset data", str(e))
         current_app.logger.error(f"Error storing asset data: {str(e)}")
-        db.session.rollback()
         raise
 
 
+def mime_extension(mime_type):
+    """File extension for a mime type (image/jpeg -> jpg)"""
+    extension = mime_type.split('/')[-1]
+    if extension == 'jpeg':
+        extension = 'jpg'
+    return extension
+
+
 def check_asset_mime_type(mime_type):
     if mime_type=='audio/x-wav':
         return 'audio/wav'
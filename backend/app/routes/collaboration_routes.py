@@ -11,11 +11,18 @@ from app.models.projects import (
 from app.models.groups import Group
 from app.models.users import User
 from app.models.assignments import AssignmentSubmission, Assignment
+from app.models.project_content import CommitDiff
 from app.middlewares.auth import require_auth
 from app.utils.date_utils import to_iso_string
+from app.utils.db_utils import dialect_insert
+from app.utils.project_content import index_project_content, copy_project_content, read_project_json
+from app.utils.commit_stats import compute_commit_stats, apply_commit_stats
+from app.utils.project_diff import diff_projects, DIFF_VERSION
+from app.utils.pagination import parse_fields
 from datetime import datetime, timezone
 import os
 import shutil
+import zipfile
 from werkzeug.utils import secure_filename
 
 collaboration_bp = Blueprint('collaboration', __name__)
@@ -570,6 +577,15 @@ def copy_collaborative_project(user_info, collab_id):
         
         copy_collab.latest_commit_id = copy_project.id
         
+        # Same file as the original commit: reuse its index and stats
+        source_commit = latest_commit_project.commit_info
+        if source_commit and source_commit.sb3_size is not None and source_commit.minhash is not None:
+            commit.copy_stats_from(source_commit)
+        else:
+            apply_commit_stats(commit, compute_commit_stats(copy_project.sb3_file_path))
+        if not copy_project_content(latest_commit_project.id, [copy_project.id]):
+            index_project_content(copy_project.id, copy_project.sb3_file_path)
+        
         db.session.commit()
         
         return jsonify({
@@ -797,6 +813,9 @@ def commit_working_copy(user_info, collab_id):
         # Update latest commit
         collab_project.latest_commit_id = wc.project_id
         
+        # Index what the committed project contains and its stats
+        index_project_content(wc.project_id, wc_project.sb3_file_path, commit=commit)
+        
         # Delete WorkingCopy entry
         db.session.delete(wc)
         
@@ -854,7 +873,13 @@ def commit_working_copy(user_info, collab_id):
 @collaboration_bp.route('/<int:collab_id>/commits', methods=['GET'])
 @require_auth
 def get_commit_history(user_info, collab_id):
-    """Get all commits (requires READ permission)"""
+    """
+    Get all commits (requires READ permission)
+    
+    Query Parameters:
+        fields: Comma-separated commit keys to return (committed_by and
+            thumbnail_url are only looked up when requested)
+    """
     try:
         user = User.query.get(user_info['user_id'])
         collab_project = CollaborativeProject.query.get(collab_id)
@@ -879,6 +904,8 @@ def get_commit_history(user_info, collab_id):
         if not user_permission:
             return jsonify({'error': 'Access denied'}), 403
         
+        fields = parse_fields(request.args.get('fields'))
+        
         commits = db.session.query(Commit)\
             .filter_by(collaborative_project_id=collab_id)\
             .order_by(Commit.commit_number.desc())\
@@ -886,10 +913,11 @@ def get_commit_history(user_info, collab_id):
         
         commits_data = []
         for commit in commits:
-            commit_dict = commit.to_dict()
-            commit_project = Project.query.get(commit.project_id)
-            if commit_project:
-                commit_dict['thumbnail_url'] = commit_project.thumbnail_url
+            commit_dict = commit.to_dict(fields=fields)
+            if fields is None or 'thumbnail_url' in fields:
+                commit_project = Project.query.get(commit.project_id)
+                if commit_project:
+                    commit_dict['thumbnail_url'] = commit_project.thumbnail_url
             commits_data.append(commit_dict)
         
         return jsonify({
@@ -1188,6 +1216,101 @@ def get_commit(user_info, collab_id, commit_num):
         return jsonify({'error': str(e)}), 500
 
 
+@collaboration_bp.route('/<int:collab_id>/commits/<int:commit_a>/diff/<int:commit_b>', methods=['GET'])
+@require_auth
+def diff_commits(user_info, collab_id, commit_a, commit_b):
+    """
+    Structural diff between two commits (sprites, costumes, sounds, scripts, blocks)
+    
+    Diffs are cached per commit pair; commits are immutable, so the
+    response is also cacheable by the browser.
+    Query params:
+        summary_only: true to omit the per-sprite details
+    """
+    try:
+        user = User.query.get(user_info['user_id'])
+        collab_project = CollaborativeProject.query.get(collab_id)
+        
+        if not collab_project:
+            return jsonify({'error': 'Collaborative project not found'}), 404
+        
+        # Check permission with teacher/admin/organizer fallback
+        has_access = user.has_access_to_collaborative_project(collab_project)
+        if not has_access:
+            if user.role in ['admin', 'teacher']:
+                has_access = True
+            else:
+                submission = AssignmentSubmission.query.filter_by(
+                    collaborative_project_id=collab_id
+                ).first()
+                if submission and submission.assignment.is_organizer(user):
+                    has_access = True
+        
+        if not has_access:
+            return jsonify({'error': 'Access denied'}), 403
+        
+        commits = {
+            commit.commit_number: commit
+            for commit in Commit.query.filter(
+                Commit.collaborative_project_id == collab_id,
+                Commit.commit_number.in_([commit_a, commit_b])
+            )
+        }
+        if commit_a not in commits or commit_b not in commits:
+            return jsonify({'error': 'Commit not found'}), 404
+        
+        old_commit, new_commit = commits[commit_a], commits[commit_b]
+        cached = db.session.get(CommitDiff, (old_commit.project_id, new_commit.project_id))
+        
+        if cached and cached.version == DIFF_VERSION:
+            diff = cached.diff
+        else:
+            try:
+                diff = diff_projects(
+                    read_project_json(old_commit.project.sb3_file_path),
+                    read_project_json(new_commit.project.sb3_file_path)
+                )
+            except (OSError, KeyError, ValueError, TypeError, zipfile.BadZipFile) as e:
+                return jsonify({'error': 'Project file could not be read', 'details': str(e)}), 422
+            
+            statement = dialect_insert(CommitDiff.__table__).values(
+                from_project_id=old_commit.project_id,
+                to_project_id=new_commit.project_id,
+                version=DIFF_VERSION,
+                diff=diff,
+                created_at=datetime.now(timezone.utc)
+            )
+            db.session.execute(statement.on_conflict_do_update(
+                index_elements=['from_project_id', 'to_project_id'],
+                set_={'version': statement.excluded.version, 'diff': statement.excluded.diff}
+            ))
+            db.session.commit()
+        
+        result = {
+            'from': old_commit.to_dict(),
+            'to': new_commit.to_dict(),
+            'summary': diff['summary'],
+            'success': True
+        }
+        summary_only = request.args.get('summary_only', 'false').lower() == 'true'
+        if not summary_only:
+            result['targets'] = diff['targets']
+        
+        # Summary and full body are different representations of the same pair
+        response = jsonify(result)
+        response.set_etag(f"diff-{old_commit.project_id}-{new_commit.project_id}-v{DIFF_VERSION}"
+                          f"{'-summary' if summary_only else ''}")
+        response.headers['Cache-Control'] = 'private, max-age=31536000, immutable'
+        return response.make_conditional(request)
+        
+    except Exception as e:
+        current_app.logger.error(f"Error diffing commits: {str(e)}")
+        import traceback
+        current_app.logger.error(traceback.format_exc())
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+
 @collaboration_bp.route('/<int:collab_id>/commits/<int:commit_num>/download', methods=['GET'])
 @require_auth
 def download_commit(user_info, collab_id, commit_num):
@@ -12,6 +12,8 @@ from app.models.users import User
 from app.middlewares.auth import require_auth
 from app.middlewares.auth import check_auth
 from app.utils.date_utils import to_iso_string
+from app.utils.project_content import index_project_content
+from app.utils.pagination import parse_fields, pick_fields
 from datetime import datetime, timezone
 from app import db
 from flask import Blueprint, request, current_app, jsonify, send_file, g
@@ -109,6 +111,8 @@ def create_project(user_info):
         # Set latest commit
         collab_project.latest_commit_id = initial_project.id
         
+        index_project_content(initial_project.id, file_path, commit=commit)
+        
         db.session.commit()
         
         current_app.logger.info(
@@ -621,9 +625,16 @@ def get_owned_projects(user_info):
     Get projects owned by user (owner)
     ✅ Uses permission system
     ✅ Sorted by last edited time (last commit or working copy save)
+    
+    Query Parameters:
+        fields: Comma-separated keys to return (skips unused lookups)
     """
     try:
         user = User.query.get(user_info.get('user_id'))
+        fields = parse_fields(request.args.get('fields'))
+        
+        def wanted(field):
+            return fields is None or field in fields
         
         all_projects = user.get_all_collaborative_projects()
         
@@ -632,21 +643,22 @@ def get_owned_projects(user_info):
         for proj in all_projects:
             # Only include if user is owner
             if proj.created_by == user.id:
-                permission = proj.get_user_permission(user)
-                
                 project_data = {
                     'id': proj.id,
                     'name': proj.name,
                     'description': proj.description,
                     'created_by': proj.created_by,
-                    'creator_username': proj.creator.username if proj.creator else None,
                     'created_at': to_iso_string(proj.created_at),
                     'updated_at': to_iso_string(proj.updated_at),
                     'latest_commit_id': proj.latest_commit_id,
                     'is_collaborative': True,
-                    'permission': permission.value if permission else None,
                     'access_via': 'owner'
                 }
+                if wanted('creator_username'):
+                    project_data['creator_username'] = proj.creator.username if proj.creator else None
+                if wanted('permission'):
+                    permission = proj.get_user_permission(user)
+                    project_data['permission'] = permission.value if permission else None
                 
                 # Calculate last_edited_at from latest commit or working copy
                 last_edited_at = proj.created_at  # Default to creation time
@@ -659,7 +671,7 @@ def get_owned_projects(user_info):
                     
                     if latest_commit:
                         last_edited_at = max(last_edited_at, latest_commit.committed_at)
-                        latest_commit_project = Project.query.get(proj.latest_commit_id)
+                        latest_commit_project = Project.query.get(proj.latest_commit_id) if wanted('thumbnail_url') else None
                         if latest_commit_project:
                             project_data['thumbnail_url'] = latest_commit_project.thumbnail_url
                 
@@ -674,32 +686,36 @@ def get_owned_projects(user_info):
                 project_data['last_edited_at'] = to_iso_string(last_edited_at)
                 
                 # Get permissions (for display)
-                all_users_with_access = proj.get_all_users_with_access()
-                project_data['collaborator_count'] = len(all_users_with_access)
+                if wanted('collaborator_count'):
+                    all_users_with_access = proj.get_all_users_with_access()
+                    project_data['collaborator_count'] = len(all_users_with_access)
                 
                 # Check if project is frozen
-                project_data['is_frozen'] = proj.is_frozen()
+                if wanted('is_frozen'):
+                    project_data['is_frozen'] = proj.is_frozen()
                 
                 # Get assignment submissions for this project
-                submissions = AssignmentSubmission.query.filter_by(
-                    collaborative_project_id=proj.id,
-                    user_id=user.id
-                ).all()
-                project_data['assignment_submissions'] = [{
-                    'id': sub.id,
-                    'assignment_id': sub.assignment_id,
-                    'assignment_name': sub.assignment.name,
-                    'submitted_at': to_iso_string(sub.submitted_at),
-                    'organizers': [{
-                        'id': org.id,
-                        'username': org.username
-                    } for org in sub.assignment.organizers]
-                } for sub in submissions]
+                if wanted('assignment_submissions'):
+                    submissions = AssignmentSubmission.query.filter_by(
+                        collaborative_project_id=proj.id,
+                        user_id=user.id
+                    ).all()
+                    project_data['assignment_submissions'] = [{
+                        'id': sub.id,
+                        'assignment_id': sub.assignment_id,
+                        'assignment_name': sub.assignment.name,
+                        'submitted_at': to_iso_string(sub.submitted_at),
+                        'organizers': [{
+                            'id': org.id,
+                            'username': org.username
+                        } for org in sub.assignment.organizers]
+                    } for sub in submissions]
                 
                 owned_projects.append(project_data)
         
         # Sort by last_edited_at descending (most recent first)
         owned_projects.sort(key=lambda p: p['last_edited_at'], reverse=True)
+        owned_projects = [pick_fields(p, fields) for p in owned_projects]
         
         return jsonify({
             'projects': owned_projects,
@@ -0,0 +1,47 @@
+from flask import Blueprint, request, jsonify, current_app
+from app.models.users import User
+from app.middlewares.auth import require_auth
+from app.utils.search_index import search, DOC_TYPES
+import traceback
+
+search_bp = Blueprint('search', __name__)
+
+
+@search_bp.route('', methods=['GET'])
+@require_auth
+def search_all(user_info):
+    """
+    Full-text search over projects, commit messages and assignments
+    
+    Only documents the user may see are returned.
+    Query params:
+        q: Search text (every word must match, as prefix)
+        types: Comma-separated subset of project,commit,assignment
+        limit: Maximum number of results (default 20, max 100)
+    """
+    try:
+        user = User.query.get(user_info['user_id'])
+        if not user:
+            return jsonify({'error': 'User not found'}), 404
+        
+        query = request.args.get('q', '').strip()
+        types = [t.strip() for t in request.args.get('types', '').split(',') if t.strip()]
+        limit = max(1, min(request.args.get('limit', 20, type=int), 100))
+        
+        invalid = [t for t in types if t not in DOC_TYPES]
+        if invalid:
+            return jsonify({'error': f"Unknown types: {', '.join(invalid)}"}), 400
+        
+        results = search(user, query, types or None, limit) if query else []
+        
+        return jsonify({
+            'success': True,
+            'query': query,
+            'results': results,
+            'count': len(results)
+        }), 200
+        
+    except Exception as e:
+        current_app.logger.error(f"Error searching: {str(e)}")
+        current_app.logger.error(traceback.format_exc())
+        return jsonify({'error': 'Search failed', 'details': str(e)}), 500
@@ -1,8 +1,21 @@
 from flask import Blueprint, jsonify, request, current_app
-from app.models.users import User
-from app.models.projects import Project, Commit, WorkingCopy, CollaborativeProject
+from app.models.users import User, user_groups
+from app.models.projects import (
+    Project,
+    Commit,
+    WorkingCopy,
+    CollaborativeProject,
+    CollaborativeProjectPermission,
+    PermissionLevel
+)
+from app.models.project_content import ProjectContentItem
 from app.middlewares.auth import require_auth, require_teacher
 from app.utils.date_utils import to_iso_string
+from app.utils.db_utils import is_postgresql
+from app.utils.project_content import CONTENT_KINDS, content_filter
+from app.utils.pagination import encode_cursor, decode_cursor, escape_like, parse_fields, pick_fields
+from app.utils.commit_stats import stats_columns, stats_from_row
+from app.utils.json_stream import stream_json_response, iter_rows, iter_partitions
 from app import db
 import os
 
@@ -32,45 +45,109 @@ def _delete_project_files(project):
 @require_auth
 @require_teacher
 def get_teacher_students(user_info):
-    """Get all students assigned to the authenticated teacher"""
+    """
+    Get all students assigned to the authenticated teacher
+    
+    One grouped query computes the project counts of a whole page.
+    Query params:
+        search: Case-insensitive username filter
+        group_id: Only members of this group
+        limit: Page size (without it all students are returned as a stream)
+        cursor: nextCursor of the previous page (keyset pagination by username, id)
+    """
     try:
         teacher = User.query.get(user_info['user_id'])
         if not teacher:
             return jsonify({'error': 'Teacher not found'}), 404
         
+        search = request.args.get('search', '').strip()
+        group_id = request.args.get('group_id', type=int)
+        limit = request.args.get('limit', type=int)
+        cursor = request.args.get('cursor')
+        
+        # Normal projects: not a commit, not a working copy, not deleted
+        normal_counts = db.select(
+            Project.owner_id.label('user_id'),
+            db.func.count(Project.id).label('project_count')
+        ).where(
+            Project.deleted_at.is_(None),
+            ~db.exists().where(Commit.project_id == Project.id),
+            ~db.exists().where(WorkingCopy.project_id == Project.id)
+        ).group_by(Project.owner_id).subquery()
+        
+        collab_counts = db.select(
+            CollaborativeProject.created_by.label('user_id'),
+            db.func.count(CollaborativeProject.id).label('project_count')
+        ).where(
+            CollaborativeProject.deleted_at.is_(None)
+        ).group_by(CollaborativeProject.created_by).subquery()
+        
+        query = db.select(
+            User.id,
+            User.username,
+            (db.func.coalesce(normal_counts.c.project_count, 0)
+             + db.func.coalesce(collab_counts.c.project_count, 0)).label('project_count')
+        ).outerjoin(
+            normal_counts, normal_counts.c.user_id == User.id
+        ).outerjoin(
+            collab_counts, collab_counts.c.user_id == User.id
+        )
+        
         # Get students assigned to this teacher
-        if user_info.get('role') == 'admin':
-            students = User.query.all()
-        else:
-            students = User.query.filter(User.role.in_(["student", "user"])).all()
-
-        # Format student data
-        student_list = []
-        for student in students:
-            # ✅ Count both normal AND collaborative projects
-            normal_projects = db.session.query(Project)\
-                .outerjoin(Commit, Project.id == Commit.project_id)\
-                .outerjoin(WorkingCopy, Project.id == WorkingCopy.project_id)\
-                .filter(Project.owner_id == student.id)\
-                .filter(Commit.id == None)\
-                .filter(WorkingCopy.id == None)\
-                .filter(Project.deleted_at == None)\
-                .count()
-            
-            collab_projects = CollaborativeProject.query.filter_by(
-                created_by=student.id,
-                deleted_at=None
-            ).count()
-            
-            student_list.append({
-                'id': student.id,
-                'username': student.username,
-                'project_count': normal_projects + collab_projects
+        if user_info.get('role') != 'admin':
+            query = query.where(User.role.in_(["student", "user"]))
+        
+        if search:
+            query = query.where(User.username.ilike(f"%{escape_like(search)}%", escape='\\'))
+        
+        if group_id is not None:
+            query = query.where(User.id.in_(
+                db.select(user_groups.c.user_id).where(user_groups.c.group_id == group_id)
+            ))
+        
+        if cursor:
+            try:
+                last_username, last_id = decode_cursor(cursor, 2)
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
+            query = query.where(db.tuple_(User.username, User.id) > (last_username, last_id))
+        
+        query = query.order_by(User.username, User.id)
+        
+        if not limit:
+            # All students (every user for admins): streamed from a server-side cursor
+            def students():
+                for row in iter_rows(query):
+                    yield {
+                        'id': row.id,
+                        'username': row.username,
+                        'project_count': row.project_count
+                    }
+            
+            return stream_json_response('students', students(), tail=lambda count: {
+                'count': count,
+                'limit': None,
+                'hasMore': False,
+                'nextCursor': None
             })
         
+        limit = max(1, min(limit, 500))
+        rows = db.session.execute(query.limit(limit + 1)).all()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        
+        student_list = [{
+            'id': row.id,
+            'username': row.username,
+            'project_count': row.project_count
+        } for row in rows]
+        
         return jsonify({
             'students': student_list,
-            'count': len(student_list)
+            'count': len(student_list),
+            'limit': limit,
+            'hasMore': has_more,
+            'nextCursor': encode_cursor([rows[-1].username, rows[-1].id]) if has_more else None
         }), 200
         
     except Exception as e:
@@ -86,6 +163,14 @@ def get_student_projects(user_info, student_id):
     Get ALL projects for a specific student (normal + collaborative)
     ✅ Teachers see both active AND deleted projects
     ✅ Sorted by last edited time (last commit or working copy save)
+    
+    Sorting and paging happen in one UNION query; the rows of the page are
+    then loaded with their aggregates in one query per project type.
+    Query params:
+        include_deleted: Include soft-deleted projects (default true)
+        fields: Comma-separated keys to return (skips unused aggregates)
+        limit, offset: Optional page (response then has total/hasMore,
+            without it all projects are returned as a stream)
     """
     try:
         student = User.query.get(student_id)
@@ -98,185 +183,321 @@ def get_student_projects(user_info, student_id):
             return jsonify({'error': 'Access denied'}), 403
         
         include_deleted = request.args.get('include_deleted', 'true').lower() == 'true'
+        fields = parse_fields(request.args.get('fields'))
+        limit = request.args.get('limit', type=int)
+        offset = max(request.args.get('offset', 0, type=int), 0)
+        
+        def wanted(field):
+            return fields is None or field in fields
         
         # ============================================================
-        # GET NORMAL PROJECTS (owned by student)
+        # PAGE OF (TYPE, ID) SORTED BY LAST EDIT
         # ============================================================
         
-        normal_query = Project.query.filter_by(owner_id=student.id)
+        # Normal projects: owned by student, neither a commit nor a working copy
+        normal_keys = db.select(
+            db.literal('normal').label('project_type'),
+            Project.id.label('id'),
+            db.type_coerce(Project.updated_at, db.DateTime).label('last_edited_at')
+        ).where(
+            Project.owner_id == student.id,
+            ~db.exists().where(Commit.project_id == Project.id),
+            ~db.exists().where(WorkingCopy.project_id == Project.id)
+        )
         
-        # Exclude projects that are commits or working copies
-        normal_query = normal_query.outerjoin(Commit, Project.id == Commit.project_id)
-        normal_query = normal_query.outerjoin(WorkingCopy, Project.id == WorkingCopy.project_id)
-        normal_query = normal_query.filter(Commit.id == None, WorkingCopy.id == None)
+        # Collaborative projects: owned, or student is a collaborator with WRITE access
+        is_collaborator = db.exists().where(
+            CollaborativeProjectPermission.collaborative_project_id == CollaborativeProject.id,
+            CollaborativeProjectPermission.user_id == student.id,
+            CollaborativeProjectPermission.permission == PermissionLevel.WRITE
+        )
+        last_commit_at = db.select(db.func.max(Commit.committed_at)).where(
+            Commit.collaborative_project_id == CollaborativeProject.id
+        ).scalar_subquery()
+        last_working_copy_at = db.select(db.func.max(WorkingCopy.updated_at)).where(
+            WorkingCopy.collaborative_project_id == CollaborativeProject.id
+        ).scalar_subquery()
+        greatest = db.func.greatest if is_postgresql() else db.func.max
+        
+        collab_keys = db.select(
+            db.literal('collaborative').label('project_type'),
+            CollaborativeProject.id.label('id'),
+            db.type_coerce(greatest(
+                CollaborativeProject.created_at,
+                db.func.coalesce(last_commit_at, CollaborativeProject.created_at),
+                db.func.coalesce(last_working_copy_at, CollaborativeProject.created_at)
+            ), db.DateTime).label('last_edited_at')
+        ).where(
+            db.or_(CollaborativeProject.created_by == student.id, is_collaborator)
+        )
         
         if not include_deleted:
-            normal_query = normal_query.filter(Project.deleted_at == None)
-        
-        normal_projects = normal_query.all()
-
-        # ============================================================
-        # GET COLLABORATIVE PROJECTS (owned by student)
-        # ============================================================
-        
-        collab_query = CollaborativeProject.query.filter_by(created_by=student.id)
+            normal_keys = normal_keys.where(Project.deleted_at.is_(None))
+            collab_keys = collab_keys.where(CollaborativeProject.deleted_at.is_(None))
         
-        if not include_deleted:
-            collab_query = collab_query.filter(CollaborativeProject.deleted_at == None)
+        keys = db.union_all(normal_keys, collab_keys).subquery()
+        page_query = db.select(keys).order_by(
+            keys.c.last_edited_at.desc(), keys.c.project_type, keys.c.id.desc()
+        )
         
-        collab_projects_owned = collab_query.all()
+        total = None
+        if limit:
+            limit = max(1, min(limit, 200))
+            page_query = page_query.limit(limit).offset(offset)
+            total = db.session.execute(db.select(db.func.count()).select_from(keys)).scalar()
         
         # ============================================================
-        # GET COLLABORATIVE PROJECTS (where student is a collaborator with WRITE access)
+        # LOAD THE PAGE
         # ============================================================
         
-        from app.models.projects import CollaborativeProjectPermission, PermissionLevel
-        
-        collab_as_collaborator_query = db.session.query(CollaborativeProject).join(
-            CollaborativeProjectPermission,
-            CollaborativeProject.id == CollaborativeProjectPermission.collaborative_project_id
-        ).filter(
-            CollaborativeProjectPermission.user_id == student.id,
-            CollaborativeProjectPermission.permission == PermissionLevel.WRITE,
-            CollaborativeProject.created_by != student.id  # Don't duplicate owned projects
-        )
-        
-        if not include_deleted:
-            collab_as_collaborator_query = collab_as_collaborator_query.filter(
-                CollaborativeProject.deleted_at == None
-            )
-        
-        collab_projects_collaborator = collab_as_collaborator_query.all()
+        def load_projects(page):
+            """Serialized projects for rows of page_query (in the same order)"""
+            normal_ids = [row.id for row in page if row.project_type == 'normal']
+            collab_ids = [row.id for row in page if row.project_type == 'collaborative']
+            projects_by_key = {}
+            
+            # Add normal projects (student is owner)
+            if normal_ids:
+                for project in Project.query.filter(Project.id.in_(normal_ids)).all():
+                    projects_by_key[('normal', project.id)] = {
+                        'id': project.id,
+                        'name': project.name,
+                        'description': project.description,
+                        'thumbnail_url': project.thumbnail_url,
+                        'owner': {
+                            'id': student.id,
+                            'username': student.username
+                        },
+                        'created_at': project.created_at.isoformat(),
+                        'updated_at': project.updated_at.isoformat(),
+                        'is_collaborative': True,
+                        'is_working_copy': False,
+                        'is_commit': False,
+                        'project_type': 'normal',
+                        'is_deleted': project.is_deleted,
+                        'deleted_at': to_iso_string(project.deleted_at) if project.deleted_at else None,
+                        'deleted_by': project.deleted_by,
+                        'is_collaborator': False
+                    }
+            
+            # Add collaborative projects (owned or as collaborator) with their aggregates
+            if collab_ids:
+                owner = db.aliased(User)
+                latest_commit = db.aliased(Project)
+                columns = [
+                    CollaborativeProject,
+                    owner.username.label('owner_username'),
+                    latest_commit.thumbnail_path.label('latest_thumbnail_path'),
+                    last_commit_at.label('last_commit_at')
+                ]
+                
+                if wanted('commit_count'):
+                    columns.append(db.select(db.func.count(Commit.id)).where(
+                        Commit.collaborative_project_id == CollaborativeProject.id
+                    ).scalar_subquery().label('commit_count'))
+                
+                if wanted('latest_commit_stats'):
+                    latest_commit_info = db.aliased(Commit)
+                    columns += stats_columns(latest_commit_info)
+                
+                if wanted('write_admin_count'):
+                    # Owner (ADMIN) plus every other user with a direct WRITE/ADMIN permission
+                    columns.append((1 + db.select(
+                        db.func.count(db.distinct(CollaborativeProjectPermission.user_id))
+                    ).where(
+                        CollaborativeProjectPermission.collaborative_project_id == CollaborativeProject.id,
+                        CollaborativeProjectPermission.group_id.is_(None),
+                        CollaborativeProjectPermission.user_id != CollaborativeProject.created_by,
+                        CollaborativeProjectPermission.permission.in_([PermissionLevel.WRITE, PermissionLevel.ADMIN])
+                    ).scalar_subquery()).label('write_admin_count'))
+                
+                query = db.select(*columns)\
+                    .outerjoin(owner, owner.id == CollaborativeProject.created_by)\
+                    .outerjoin(latest_commit, latest_commit.id == CollaborativeProject.latest_commit_id)
+                if wanted('latest_commit_stats'):
+                    query = query.outerjoin(
+                        latest_commit_info, latest_commit_info.project_id == CollaborativeProject.latest_commit_id
+                    )
+                rows = db.session.execute(query.where(CollaborativeProject.id.in_(collab_ids))).all()
+                
+                for row in rows:
+                    collab = row.CollaborativeProject
+                    collab_dict = {
+                        'id': collab.id,
+                        'name': collab.name,
+                        'description': collab.description,
+                        'created_by': collab.created_by,
+                        'creator_username': row.owner_username,
+                        'created_at': collab.created_at.isoformat(),
+                        'updated_at': collab.updated_at.isoformat(),
+                        'latest_commit_id': collab.latest_commit_id,
+                        'is_deleted': collab.is_deleted,
+                        'project_type': 'collaborative',
+                        'deleted_at': to_iso_string(collab.deleted_at) if collab.deleted_at else None,
+                        'deleted_by': collab.deleted_by,
+                        'is_collaborator': collab.created_by != student.id
+                    }
+                    
+                    if collab_dict['is_collaborator']:
+                        collab_dict['owner_username'] = row.owner_username
+                    
+                    if 'write_admin_count' in row._fields:
+                        collab_dict['write_admin_count'] = row.write_admin_count
+                    
+                    if 'commit_count' in row._fields:
+                        collab_dict['commit_count'] = row.commit_count
+                    
+                    if 'sb3_size' in row._fields:
+                        collab_dict['latest_commit_stats'] = stats_from_row(row._mapping)
+                    
+                    if collab.latest_commit_id and row.last_commit_at and row.latest_thumbnail_path:
+                        collab_dict['thumbnail_url'] = f'/backend/api/projects/{collab.latest_commit_id}/thumbnail'
+                    
+                    projects_by_key[('collaborative', collab.id)] = collab_dict
+            
+            projects_data = []
+            for key in page:
+                project_dict = projects_by_key.get((key.project_type, key.id))
+                if project_dict is None:
+                    continue
+                project_dict['last_edited_at'] = to_iso_string(key.last_edited_at)
+                projects_data.append(pick_fields(project_dict, fields))
+            return projects_data
         
         # ============================================================
         # FORMAT RESPONSE
         # ============================================================
         
-        projects_data = []
-        
-        # Add normal projects
-        for project in normal_projects:
-            project_dict = project.to_dict()
-            project_dict['project_type'] = 'normal'
-            project_dict['is_deleted'] = project.is_deleted
-            project_dict['deleted_at'] = to_iso_string(project.deleted_at) if project.deleted_at else None
-            project_dict['deleted_by'] = project.deleted_by
-            project_dict['last_edited_at'] = to_iso_string(project.updated_at)
-            project_dict['is_collaborator'] = False  # Student is owner
-            projects_data.append(project_dict)
-        
-        # Add collaborative projects (owned by student)
-        for collab in collab_projects_owned:
-            collab_dict = collab.to_dict(include_commits=False)
-            collab_dict['project_type'] = 'collaborative'
-            collab_dict['is_deleted'] = collab.is_deleted
-            collab_dict['deleted_at'] = to_iso_string(collab.deleted_at) if collab.deleted_at else None
-            collab_dict['deleted_by'] = collab.deleted_by
-            collab_dict['is_collaborator'] = False  # Student is owner
-            
-            # Count users with write/admin access
-            all_users_with_access = collab.get_all_users_with_access()
-            write_admin_count = sum(1 for user_data in all_users_with_access 
-                                   if user_data['permission'] in [PermissionLevel.WRITE, PermissionLevel.ADMIN])
-            collab_dict['write_admin_count'] = write_admin_count
-            
-            # Add commit count
-            collab_dict['commit_count'] = len(collab.commits)
-            
-            # Calculate last_edited_at from latest commit or any working copy
-            last_edited_at = collab.created_at  # Default to creation time
-            
-            # Check latest commit time
-            if collab.latest_commit_id:
-                latest_commit = Commit.query.filter_by(
-                    collaborative_project_id=collab.id
-                ).order_by(Commit.committed_at.desc()).first()
-                
-                if latest_commit:
-                    last_edited_at = max(last_edited_at, latest_commit.committed_at)
-                    latest_commit_project = Project.query.get(collab.latest_commit_id)
-                    if latest_commit_project:
-                        collab_dict['thumbnail_url'] = latest_commit_project.thumbnail_url
-            
-            # Check all working copies times (not just student's)
-            working_copies = WorkingCopy.query.filter_by(
-                collaborative_project_id=collab.id
-            ).all()
-            
-            for wc in working_copies:
-                last_edited_at = max(last_edited_at, wc.updated_at)
-            
-            collab_dict['last_edited_at'] = to_iso_string(last_edited_at)
-            
-            projects_data.append(collab_dict)
-        
-        # Add collaborative projects (where student is a collaborator)
-        for collab in collab_projects_collaborator:
-            collab_dict = collab.to_dict(include_commits=False)
-            collab_dict['project_type'] = 'collaborative'
-            collab_dict['is_deleted'] = collab.is_deleted
-            collab_dict['deleted_at'] = to_iso_string(collab.deleted_at) if collab.deleted_at else None
-            collab_dict['deleted_by'] = collab.deleted_by
-            collab_dict['is_collaborator'] = True  # Student is collaborator, not owner
-            
-            # Get the owner's username for display
-            owner = User.query.get(collab.created_by)
-            if owner:
-                collab_dict['owner_username'] = owner.username
-            
-            # Count users with write/admin access
-            all_users_with_access = collab.get_all_users_with_access()
-            write_admin_count = sum(1 for user_data in all_users_with_access 
-                                   if user_data['permission'] in [PermissionLevel.WRITE, PermissionLevel.ADMIN])
-            collab_dict['write_admin_count'] = write_admin_count
-            
-            # Add commit count
-            collab_dict['commit_count'] = len(collab.commits)
-            
-            # Calculate last_edited_at from latest commit or any working copy
-            last_edited_at = collab.created_at  # Default to creation time
-            
-            # Check latest commit time
-            if collab.latest_commit_id:
-                latest_commit = Commit.query.filter_by(
-                    collaborative_project_id=collab.id
-                ).order_by(Commit.committed_at.desc()).first()
-                
-                if latest_commit:
-                    last_edited_at = max(last_edited_at, latest_commit.committed_at)
-                    latest_commit_project = Project.query.get(collab.latest_commit_id)
-                    if latest_commit_project:
-                        collab_dict['thumbnail_url'] = latest_commit_project.thumbnail_url
-            
-            # Check all working copies times (not just student's)
-            working_copies = WorkingCopy.query.filter_by(
-                collaborative_project_id=collab.id
-            ).all()
-            
-            for wc in working_copies:
-                last_edited_at = max(last_edited_at, wc.updated_at)
-            
-            collab_dict['last_edited_at'] = to_iso_string(last_edited_at)
+        student_data = {
+            'id': student.id,
+            'username': student.username
+        }
+        
+        if not limit:
+            # All projects: keys streamed from a server-side cursor, loaded batch by batch
+            def projects():
+                for batch in iter_partitions(page_query):
+                    yield from load_projects(batch)
             
-            projects_data.append(collab_dict)
+            return stream_json_response('projects', projects(), head={
+                'student': student_data,
+                'success': True
+            })
+        
+        page = db.session.execute(page_query).all()
+        response = {
+            'projects': load_projects(page),
+            'student': student_data,
+            'success': True,
+            'offset': offset,
+            'limit': limit,
+            'total': total,
+            'hasMore': offset + len(page) < total
+        }
         
-        # Sort projects by last_edited_at (newest first)
-        projects_data.sort(
-            key=lambda p: p.get('last_edited_at') or p.get('updated_at') or p.get('created_at'),
-            reverse=True
+        return jsonify(response), 200
+        
+    except Exception as e:
+        current_app.logger.error(f"Error getting student projects: {str(e)}")
+        import traceback
+        current_app.logger.error(traceback.format_exc())
+        return jsonify({'error': str(e)}), 500
+
+
+@teacher_bp.route('/content-search', methods=['GET'])
+@require_auth
+@require_teacher
+def search_project_content(user_info):
+    """
+    Find projects by what their latest commit contains
+    
+    Every given criterion must match (parameters may be repeated).
+    Query params:
+        opcode: Block opcode, e.g. control_create_clone_of
+        sprite, variable, list: Names (case-insensitive)
+        extension: Extension ID, e.g. pen
+        group_id: Only projects of members of this group
+        limit, offset: Page (default 50, max 200)
+    """
+    try:
+        criteria = [
+            (kind, name.strip())
+            for kind in CONTENT_KINDS
+            for name in request.args.getlist(kind)
+            if name.strip()
+        ]
+        if not criteria:
+            return jsonify({'error': f"At least one of {', '.join(CONTENT_KINDS)} is required"}), 400
+        
+        group_id = request.args.get('group_id', type=int)
+        limit = max(1, min(request.args.get('limit', 50, type=int), 200))
+        offset = max(request.args.get('offset', 0, type=int), 0)
+        
+        query = db.select(
+            CollaborativeProject.id,
+            CollaborativeProject.name,
+            CollaborativeProject.latest_commit_id,
+            User.id.label('owner_id'),
+            User.username.label('owner_username')
+        ).join(
+            User, User.id == CollaborativeProject.created_by
+        ).where(
+            CollaborativeProject.deleted_at.is_(None),
+            CollaborativeProject.latest_commit_id.isnot(None),
+            *[content_filter(CollaborativeProject.latest_commit_id, kind, name) for kind, name in criteria]
         )
         
-        return jsonify({
-            'projects': projects_data,
-            'student': {
-                'id': student.id,
-                'username': student.username
+        # Same visibility as the student overview
+        if user_info.get('role') != 'admin':
+            query = query.where(User.role.in_(["student", "user"]))
+        
+        if group_id is not None:
+            query = query.where(User.id.in_(
+                db.select(user_groups.c.user_id).where(user_groups.c.group_id == group_id)
+            ))
+        
+        total = db.session.execute(db.select(db.func.count()).select_from(query.subquery())).scalar()
+        rows = db.session.execute(
+            query.order_by(User.username, CollaborativeProject.name, CollaborativeProject.id)
+            .limit(limit).offset(offset)
+        ).all()
+        
+        # How often the requested blocks are used, for the page only
+        opcodes = [name for kind, name in criteria if kind == 'opcode']
+        opcode_counts = {}
+        if opcodes and rows:
+            for item in db.session.execute(
+                db.select(ProjectContentItem.project_id, ProjectContentItem.name, ProjectContentItem.count)
+                .where(
+                    ProjectContentItem.project_id.in_([row.latest_commit_id for row in rows]),
+                    ProjectContentItem.kind == 'opcode',
+                    ProjectContentItem.name.in_(opcodes)
+                )
+            ):
+                opcode_counts.setdefault(item.project_id, {})[item.name] = item.count
+        
+        projects = [{
+            'id': row.id,
+            'name': row.name,
+            'latest_commit_id': row.latest_commit_id,
+            'owner': {
+                'id': row.owner_id,
+                'username': row.owner_username
             },
-            'success': True
+            'opcode_counts': opcode_counts.get(row.latest_commit_id, {})
+        } for row in rows]
+        
+        return jsonify({
+            'success': True,
+            'projects': projects,
+            'offset': offset,
+            'limit': limit,
+            'total': total,
+            'hasMore': offset + len(projects) < total
         }), 200
         
     except Exception as e:
-        current_app.logger.error(f"Error getting student projects: {str(e)}")
+        current_app.logger.error(f"Error searching project content: {str(e)}")
         import traceback
         current_app.logger.error(traceback.format_exc())
         return jsonify({'error': str(e)}), 500
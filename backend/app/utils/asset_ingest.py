@@ -0,0 +1,235 @@
+"""
+Asset ingest
+Shared storage path for uploaded assets (editor assets and backpack).
+Assets are content-addressed by MD5, so ingesting is idempotent:
+
+1. the upload is streamed into a temp file while it is hashed
+2. the file is moved to its final name only if that name is still free
+   (hard link = atomic create-if-absent, so racing uploads never clobber)
+3. the row is registered with INSERT ... ON CONFLICT DO NOTHING (in a
+   savepoint on PostgreSQL: under REPEATABLE READ a row committed by a
+   concurrent upload raises a serialization failure instead, which is
+   rolled back to the savepoint and counted as a duplicate)
+
+Duplicate uploads take no row lock and leave the stored file untouched.
+"""
+from flask import current_app
+from app import db
+from app.models.asset import Asset
+from app.utils import metrics
+from app.utils.asset_optimizer import queue_optimization
+from app.utils.db_utils import dialect_insert, is_postgresql, is_serialization_failure
+from collections import namedtuple
+from sqlalchemy.exc import OperationalError
+from concurrent.futures import ThreadPoolExecutor
+from werkzeug.utils import secure_filename
+import hashlib
+import io
+import os
+import tempfile
+
+CHUNK_SIZE = 64 * 1024
+HASH_WORKERS = 8
+
+# Upload hashed into a temp file, not yet stored
+SpooledAsset = namedtuple('SpooledAsset', ['temp_path', 'md5', 'size'])
+
+
+def temp_folder():
+    """Temp directory on the same filesystem as the assets (rename stays atomic)"""
+    folder = os.path.join(current_app.config['UPLOAD_FOLDER'], 'tmp')
+    os.makedirs(folder, exist_ok=True)
+    return folder
+
+
+def spool_upload(stream, folder):
+    """
+    Copy a stream into a temp file in chunks while hashing it
+    (no app context or database access, safe in worker threads)
+
+    Args:
+        stream: Readable binary file object
+        folder: Temp directory (see temp_folder())
+
+    Returns: SpooledAsset
+    """
+    md5 = hashlib.md5()
+    size = 0
+    fd, temp_path = tempfile.mkstemp(dir=folder, suffix='.upload')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            while True:
+                chunk = stream.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                md5.update(chunk)
+                size += len(chunk)
+                f.write(chunk)
+    except BaseException:
+        discard(temp_path)
+        raise
+    return SpooledAsset(temp_path, md5.hexdigest(), size)
+
+
+def discard(temp_path):
+    """Remove a temp file (ignores files that are already gone)"""
+    try:
+        os.remove(temp_path)
+    except OSError:
+        pass
+
+
+def place_file(temp_path, final_path):
+    """
+    Move a temp file to its final path unless that path already exists
+
+    Returns: True if the file was placed, False if it existed already
+    """
+    try:
+        os.link(temp_path, final_path)
+        return True
+    except FileExistsError:
+        return False
+    except OSError:
+        # Filesystem without hard links: rename (last writer wins, same content)
+        if os.path.exists(final_path):
+            return False
+        os.replace(temp_path, final_path)
+        return True
+    finally:
+        discard(temp_path)
+
+
+def asset_path(asset_type, md5, data_format):
+    """Final storage path of an asset"""
+    folder = os.path.join(current_app.config['UPLOAD_FOLDER'], secure_filename(asset_type) or 'unknown')
+    os.makedirs(folder, exist_ok=True)
+    return os.path.join(folder, secure_filename(f"{md5}.{data_format}"))
+
+
+def existing_asset_ids(md5_list):
+    """Subset of the given MD5 hashes that are stored already"""
+    if not md5_list:
+        return set()
+    return set(db.session.execute(
+        db.select(Asset.asset_id).where(Asset.asset_id.in_(md5_list))
+    ).scalars().all())
+
+
+def _register_asset(values):
+    """
+    Insert an asset row unless the MD5 is registered already
+
+    Returns: True if the row was inserted, False if it existed (also when
+        a concurrent upload committed it after this transaction started)
+    """
+    statement = dialect_insert(Asset.__table__).values(**values).on_conflict_do_nothing()
+    if not is_postgresql():
+        return db.session.execute(statement).rowcount > 0
+
+    try:
+        with db.session.begin_nested():
+            return db.session.execute(statement).rowcount > 0
+    except OperationalError as e:
+        if not is_serialization_failure(e):
+            raise
+        return False
+
+
+def store_spooled(spooled, asset_type, data_format, owner_id, exists=None):
+    """
+    Store a spooled upload: place the file and register the row
+    The caller commits the session.
+
+    Args:
+        spooled: SpooledAsset from spool_upload()
+        exists: Known existence of the MD5 (skips the lookup)
+
+    Returns: (asset ID (the MD5 hash), True if this call registered it)
+    """
+    if exists is None:
+        exists = spooled.md5 in existing_asset_ids([spooled.md5])
+
+    if exists:
+        discard(spooled.temp_path)
+        metrics.increment('assets.deduplicated')
+        return spooled.md5, False
+
+    file_path = asset_path(asset_type, spooled.md5, data_format)
+    place_file(spooled.temp_path, file_path)
+
+    # Concurrent upload of the same content: the first row wins
+    created = _register_asset(dict(
+        asset_id=spooled.md5,
+        asset_type=asset_type,
+        data_format=data_format,
+        size=spooled.size,
+        md5=spooled.md5,
+        owner_id=owner_id,
+        file_path=file_path
+    ))
+    if not created:
+        metrics.increment('assets.deduplicated')
+        return spooled.md5, False
+
+    metrics.increment('assets.ingested')
+    queue_optimization(db.session, spooled.md5, file_path, data_format)
+    return spooled.md5, True
+
+
+def ingest_asset(stream, asset_type, data_format, owner_id):
+    """
+    Hash and store an asset from a stream (the caller commits the session)
+
+    Returns: Asset ID (the MD5 hash)
+    """
+    asset_id, _ = store_spooled(spool_upload(stream, temp_folder()), asset_type, data_format, owner_id)
+    return asset_id
+
+
+def ingest_bytes(data, asset_type, data_format, owner_id):
+    """ingest_asset() for data already in memory"""
+    return ingest_asset(io.BytesIO(data), asset_type, data_format, owner_id)
+
+
+def ingest_many(uploads, owner_id):
+    """
+    Hash many uploads in a thread pool and store them in one pass
+    (one existence query; the caller commits the session once)
+
+    Args:
+        uploads: List of (stream, asset_type, data_format)
+
+    Returns: List of (asset_id, created) in upload order
+    """
+    if not uploads:
+        return []
+
+    folder = temp_folder()
+    with ThreadPoolExecutor(max_workers=min(HASH_WORKERS, len(uploads))) as pool:
+        futures = [pool.submit(spool_upload, stream, folder) for stream, _, _ in uploads]
+    spooled_list = []
+    errors = []
+    for future in futures:
+        try:
+            spooled_list.append(future.result())
+        except Exception as e:
+            errors.append(e)
+    if errors:
+        for spooled in spooled_list:
+            discard(spooled.temp_path)
+        raise errors[0]
+
+    known = existing_asset_ids(list({spooled.md5 for spooled in spooled_list}))
+    results = []
+    try:
+        for spooled, (_, asset_type, data_format) in zip(spooled_list, uploads):
+            _, created = store_spooled(spooled, asset_type, data_format, owner_id,
+                                       exists=spooled.md5 in known)
+            known.add(spooled.md5)  # Same content twice in one batch
+            results.append((spooled.md5, created))
+    except Exception:
+        for spooled in spooled_list[len(results):]:
+            discard(spooled.temp_path)
+        raise
+    return results
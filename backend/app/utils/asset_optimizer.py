@@ -0,0 +1,309 @@
+"""
+Asset optimization
+Lossless size reductions of uploaded assets, stored as 'optimized'
+variants next to the original (which stays byte-exact, its md5 is the
+asset ID the editor references):
+
+- SVG: comments and whitespace between tags removed (text content kept)
+- PNG: image data recompressed at the highest zlib level, metadata
+  chunks (text, timestamps) dropped; pixels are unchanged
+
+Runs after the upload transaction commits, in a small thread pool, and
+only if ASSET_OPTIMIZATION is enabled.
+
+Compressible assets (SVG, JSON scripts) also get precompressed gzip and
+brotli variants. The first request queues them in the same pool and is
+served uncompressed, later requests get the stored copy.
+"""
+from flask import current_app
+from app import db
+from app.models.asset import AssetVariant
+from app.utils import metrics
+from app.utils.db_utils import dialect_insert, is_serialization_failure
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy import event
+import gzip
+import logging
+import os
+import re
+import struct
+import tempfile
+import threading
+import zlib
+
+try:
+    import brotli
+except ImportError:  # Optional dependency, gzip only without it
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+OPTIMIZED = 'optimized'
+
+_executor = None
+_executor_lock = threading.Lock()
+# Compressed variants queued in this process, (asset_id, variant)
+_pending = set()
+
+
+# ============================================================
+# OPTIMIZERS
+# ============================================================
+
+_SVG_COMMENT = re.compile(rb'<!--.*?-->', re.S)
+_SVG_BETWEEN_TAGS = re.compile(rb'>\s+<')
+# Whitespace inside these elements is rendered
+_SVG_PRESERVE = re.compile(rb'(<(text|style|script)\b.*?</\2>)', re.S | re.I)
+
+
+def minify_svg(data):
+    """Remove comments and insignificant whitespace from an SVG"""
+    if b'<![CDATA[' in data or b'xml:space' in data:
+        return data
+
+    parts = _SVG_PRESERVE.split(data)
+    # split() returns [outside, match, group 2, outside, ...]
+    result = []
+    for index in range(0, len(parts), 3):
+        outside = _SVG_BETWEEN_TAGS.sub(b'><', _SVG_COMMENT.sub(b'', parts[index]))
+        # Whitespace between a tag and a preserved element
+        if index > 0:
+            outside = re.sub(rb'^\s+<', b'<', outside)
+        if index + 1 < len(parts):
+            outside = re.sub(rb'>\s+$', b'>', outside)
+        result.append(outside)
+        if index + 1 < len(parts):
+            result.append(parts[index + 1])
+    return b''.join(result).strip()
+
+
+_PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+_PNG_DROP_CHUNKS = {b'tEXt', b'zTXt', b'iTXt', b'tIME'}
+
+
+def _png_chunk(chunk_type, payload):
+    return (struct.pack('>I', len(payload)) + chunk_type + payload
+            + struct.pack('>I', zlib.crc32(chunk_type + payload) & 0xffffffff))
+
+
+def recompress_png(data):
+    """Recompress the image data of a PNG (returns the input if not a valid PNG)"""
+    if not data.startswith(_PNG_SIGNATURE):
+        return data
+
+    chunks = []
+    idat = []
+    position = len(_PNG_SIGNATURE)
+    try:
+        while position < len(data):
+            length, = struct.unpack('>I', data[position:position + 4])
+            chunk_type = data[position + 4:position + 8]
+            payload = data[position + 8:position + 8 + length]
+            position += 12 + length
+            if chunk_type == b'IDAT':
+                if not idat:
+                    chunks.append((b'IDAT', None))  # Placeholder for the merged chunk
+                idat.append(payload)
+            elif chunk_type not in _PNG_DROP_CHUNKS:
+                chunks.append((chunk_type, payload))
+            if chunk_type == b'IEND':
+                break
+        image_data = zlib.decompress(b''.join(idat))
+    except (struct.error, zlib.error):
+        return data
+
+    if not idat:
+        return data
+    compressed = zlib.compress(image_data, 9)
+    return _PNG_SIGNATURE + b''.join(
+        _png_chunk(chunk_type, compressed if payload is None else payload)
+        for chunk_type, payload in chunks
+    )
+
+
+OPTIMIZERS = {
+    'svg': minify_svg,
+    'png': recompress_png,
+}
+
+
+# Content-Encoding -> (file suffix, compress function)
+ENCODINGS = {
+    'gzip': ('gz', lambda data: gzip.compress(data, compresslevel=9, mtime=0)),
+}
+if brotli is not None:
+    ENCODINGS['br'] = ('br', lambda data: brotli.compress(data, quality=11))
+
+# Mime types worth compressing (the others are already compressed formats)
+COMPRESSIBLE_TYPES = {'image/svg+xml', 'application/json'}
+MIN_COMPRESS_SIZE = 256
+
+
+# ============================================================
+# VARIANTS
+# ============================================================
+
+def variant_path(asset_id, variant, data_format):
+    """Storage path of an asset variant"""
+    folder = os.path.join(current_app.config['UPLOAD_FOLDER'], 'variants')
+    os.makedirs(folder, exist_ok=True)
+    return os.path.join(folder, f"{asset_id}.{variant}.{data_format}")
+
+
+def store_variant(asset_id, variant, data_format, data):
+    """Write a variant file and register it (the caller commits)"""
+    from app.utils.asset_ingest import place_file
+
+    file_path = variant_path(asset_id, variant, data_format)
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(file_path), suffix='.variant')
+    with os.fdopen(fd, 'wb') as f:
+        f.write(data)
+    place_file(temp_path, file_path)
+
+    db.session.execute(
+        dialect_insert(AssetVariant.__table__).values(
+            asset_id=asset_id, variant=variant, file_path=file_path, size=len(data)
+        ).on_conflict_do_nothing()
+    )
+
+
+def compressed_variant(asset_id, base, base_path, data_format, encoding):
+    """
+    Precompressed copy of an asset file for serving (read only, missing
+    copies are queued with queue_compression)
+
+    Args:
+        base: Variant the copy is made of ('original' or 'optimized')
+        base_path: File of that variant
+        encoding: Key of ENCODINGS
+
+    Returns: AssetVariant, or None if not built yet or compressing does not pay off
+    """
+    existing = db.session.get(AssetVariant, (asset_id, f'{base}+{encoding}'))
+    if existing is None:
+        queue_compression(asset_id, base, base_path, data_format, encoding)
+        return None
+    return existing if existing.size else None
+
+
+def build_compressed_variant(asset_id, base, base_path, data_format, encoding):
+    """Create a precompressed copy (see compressed_variant), the caller commits"""
+    variant = f'{base}+{encoding}'
+    if db.session.get(AssetVariant, (asset_id, variant)):
+        return
+
+    suffix, compress = ENCODINGS[encoding]
+    with open(base_path, 'rb') as f:
+        original = f.read()
+    compressed = compress(original)
+    if len(compressed) >= len(original):
+        # Remember that it does not pay off (size 0 = serve uncompressed)
+        compressed = b''
+
+    store_variant(asset_id, variant, f'{data_format}.{suffix}', compressed)
+    metrics.increment(f'asset_optimizer.compressed_{encoding}')
+
+
+def optimize_asset(asset_id, file_path, data_format):
+    """
+    Create the optimized variant of an asset (if the format is supported
+    and the result is smaller). The caller commits the session.
+
+    Returns: Saved bytes (0 if no variant was stored)
+    """
+    optimizer = OPTIMIZERS.get((data_format or '').lower())
+    if not optimizer:
+        return 0
+
+    with open(file_path, 'rb') as f:
+        original = f.read()
+    optimized = optimizer(original)
+    if len(optimized) >= len(original):
+        return 0
+
+    store_variant(asset_id, OPTIMIZED, data_format, optimized)
+    metrics.increment('asset_optimizer.optimized')
+    metrics.increment('asset_optimizer.saved_bytes', len(original) - len(optimized))
+    return len(original) - len(optimized)
+
+
+def _run_compression(app, key, args):
+    with app.app_context():
+        try:
+            build_compressed_variant(*args)
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            # Serialization failure: another process stored the same variant
+            if not is_serialization_failure(e):
+                logger.error(f"Compressing asset {key[0]} ({key[1]}) failed: {str(e)}")
+                metrics.increment('asset_optimizer.errors')
+        finally:
+            with _executor_lock:
+                _pending.discard(key)
+            db.session.remove()
+
+
+def _run(app, asset_id, file_path, data_format):
+    with app.app_context():
+        try:
+            optimize_asset(asset_id, file_path, data_format)
+            db.session.commit()
+        except Exception as e:
+            logger.error(f"Optimizing asset {asset_id} failed: {str(e)}")
+            db.session.rollback()
+        finally:
+            db.session.remove()
+
+
+# ============================================================
+# SCHEDULING
+# ============================================================
+
+def _get_executor(workers):
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='asset-optimizer')
+        return _executor
+
+
+def queue_optimization(session, asset_id, file_path, data_format):
+    """Optimize an asset once the session commits (no-op if disabled)"""
+    if not current_app.config.get('ASSET_OPTIMIZATION') or data_format.lower() not in OPTIMIZERS:
+        return
+    session.info.setdefault('optimize_assets', []).append((asset_id, file_path, data_format))
+
+
+def queue_compression(asset_id, base, base_path, data_format, encoding):
+    """Build a precompressed copy in the pool (once per process at a time)"""
+    key = (asset_id, f'{base}+{encoding}')
+    with _executor_lock:
+        if key in _pending:
+            return
+        _pending.add(key)
+    app = current_app._get_current_object()
+    executor = _get_executor(app.config.get('ASSET_OPTIMIZATION_WORKERS', 2))
+    executor.submit(_run_compression, app, key, (asset_id, base, base_path, data_format, encoding))
+
+
+def _after_commit(session):
+    queued = session.info.pop('optimize_assets', None)
+    if not queued:
+        return
+    app = current_app._get_current_object()
+    executor = _get_executor(app.config.get('ASSET_OPTIMIZATION_WORKERS', 2))
+    for asset_id, file_path, data_format in queued:
+        executor.submit(_run, app, asset_id, file_path, data_format)
+
+
+def _after_soft_rollback(session, previous_transaction):
+    session.info.pop('optimize_assets', None)
+
+
+def register_optimizer_listeners():
+    """Hand uploads to the optimizer after their transaction commits (idempotent)"""
+    for name, listener in (('after_commit', _after_commit),
+                           ('after_soft_rollback', _after_soft_rollback)):
+        if not event.contains(db.session, name, listener):
+            event.listen(db.session, name, listener)
@@ -1,67 +1,313 @@
 """
 Assignment scheduler utilities
 Handles automatic freezing of assignments based on due dates
+
+A background thread keeps a min-heap of the due dates of all auto-freeze
+assignments and sleeps until the earliest one. Only one process runs it:
+on PostgreSQL the leader holds a session-level advisory lock. Assignments
+that became due while no scheduler ran are frozen right after its first
+load of the schedule (they are already past due on the heap).
 """
 from app import db
 from app.models.assignments import Assignment
-from app.models.projects import CollaborativeProject
+from app.utils import metrics
+from app.utils.db_utils import is_postgresql
+from sqlalchemy import text
 from datetime import datetime, timezone
+import heapq
 import logging
+import threading
+import time
 
 logger = logging.getLogger(__name__)
 
+# Key of the PostgreSQL advisory lock held by the scheduler leader
+AUTO_FREEZE_LOCK_KEY = 52834001
+
+# Scheduler running in this process (None on followers that never started one)
+_scheduler = None
+
+
+def _as_utc(value):
+    """Treat naive datetimes from the database as UTC"""
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
 
-def check_and_freeze_overdue_assignments():
+
+def freeze_overdue_assignment(assignment_id, now=None):
     """
-    Check all assignments with auto_freeze_on_due=True and freeze submissions
-    that are past their due date
+    Freeze all submissions of one assignment if it is due
+
+    The assignment is re-checked in the database, so stale schedule entries
+    (due date moved, auto-freeze disabled, assignment deleted) are no-ops.
+
+    Args:
+        assignment_id: Assignment ID
+        now: Reference time (defaults to current UTC time)
+
+    Returns: Number of frozen projects
     """
-    try:
-        now = datetime.now(timezone.utc)
-        
-        # Find all assignments that should auto-freeze and have a due date
-        assignments = Assignment.query.filter(
+    now = now or datetime.now(timezone.utc)
+
+    assignment = Assignment.query.get(assignment_id)
+    if not assignment or assignment.is_deleted or not assignment.auto_freeze_on_due:
+        return 0
+
+    due_date = _as_utc(assignment.due_date)
+    if not due_date or now < due_date:
+        return 0
+
+    # Set-based, frozen_by records the submitting student
+    frozen_count = assignment.freeze_submissions()
+    if frozen_count:
+        logger.info(
+            f"Auto-frozen {frozen_count} projects for assignment {assignment.id} "
+            f"(due date: {due_date})"
+        )
+
+    assignment.auto_freeze_on_due = False  # Prevent re-checking
+    db.session.commit()
+
+    return frozen_count
+
+
+class AutoFreezeScheduler:
+    """Sleeps until the next assignment due date and freezes it"""
+
+    def __init__(self, app, resync_interval):
+        """
+        Args:
+            app: Flask app (the thread pushes its own app context)
+            resync_interval: Seconds between reloads of the due dates from the
+                database (picks up changes made by other processes) and
+                between leadership attempts of followers
+        """
+        self.app = app
+        self.resync_interval = resync_interval
+        self._heap = []        # (due timestamp, assignment id)
+        self._due = {}         # assignment id -> current due timestamp
+        self._condition = threading.Condition()
+        self._lock_connection = None
+        self._next_resync = 0.0
+        self._leader = False   # Only the leader keeps a schedule
+
+    # ============================================================
+    # SCHEDULE
+    # ============================================================
+
+    def schedule(self, assignment_id, due_date):
+        """
+        Add or move an assignment in the schedule
+
+        Args:
+            assignment_id: Assignment ID
+            due_date: Due datetime, or None to remove the assignment
+
+        Outdated heap entries are left in place and skipped when popped.
+        No-op on followers, the leader picks changes up with its next resync.
+        """
+        with self._condition:
+            if not self._leader:
+                return
+            if due_date is None:
+                self._due.pop(assignment_id, None)
+            else:
+                due_ts = _as_utc(due_date).timestamp()
+                if self._due.get(assignment_id) != due_ts:
+                    self._due[assignment_id] = due_ts
+                    heapq.heappush(self._heap, (due_ts, assignment_id))
+            self._condition.notify()
+
+    def _reload(self):
+        """Rebuild the heap from the database"""
+        rows = db.session.query(Assignment.id, Assignment.due_date).filter(
             Assignment.auto_freeze_on_due == True,
             Assignment.due_date.isnot(None),
             Assignment.deleted_at.is_(None)
         ).all()
-        
+        db.session.rollback()  # Don't keep a transaction open while sleeping
+
+        with self._condition:
+            self._due = {assignment_id: _as_utc(due_date).timestamp()
+                         for assignment_id, due_date in rows}
+            self._heap = [(due_ts, assignment_id) for assignment_id, due_ts in self._due.items()]
+            heapq.heapify(self._heap)
+
+    def _pop_due(self):
+        """Pop all assignments whose due date has passed"""
+        now_ts = time.time()
+        due_ids = []
+
+        with self._condition:
+            while self._heap and self._heap[0][0] <= now_ts:
+                due_ts, assignment_id = heapq.heappop(self._heap)
+                if self._due.get(assignment_id) == due_ts:
+                    del self._due[assignment_id]
+                    due_ids.append(assignment_id)
+
+        return due_ids
+
+    def _wait(self):
+        """Sleep until the next due date, the next resync or a schedule change"""
+        with self._condition:
+            timeout = self._next_resync - time.monotonic()
+            if self._leader and self._heap:
+                timeout = min(timeout, self._heap[0][0] - time.time())
+            if timeout > 0:
+                self._condition.wait(timeout)
+
+    # ============================================================
+    # LEADER ELECTION
+    # ============================================================
+
+    def _is_leader(self):
+        """
+        Acquire or confirm leadership
+
+        PostgreSQL: pg_try_advisory_lock on a dedicated connection, held as
+        long as that connection lives. Other databases (SQLite) are single
+        node deployments, so the process that started the scheduler leads.
+        """
+        if not is_postgresql():
+            return True
+
+        if self._lock_connection is not None:
+            try:
+                self._lock_connection.execute(text("SELECT 1"))
+                self._lock_connection.commit()
+                return True
+            except Exception as e:
+                # Connection (and with it the lock) is gone, try to take it again
+                logger.warning(f"Auto-freeze scheduler lost its lock connection: {str(e)}")
+                self._release_lock_connection()
+
+        connection = db.engine.connect()
+        try:
+            acquired = connection.execute(
+                text("SELECT pg_try_advisory_lock(:key)"),
+                {'key': AUTO_FREEZE_LOCK_KEY}
+            ).scalar()
+            connection.commit()
+        except Exception:
+            connection.close()
+            raise
+
+        if not acquired:
+            connection.close()
+            return False
+
+        logger.info("Auto-freeze scheduler acquired leadership")
+        self._lock_connection = connection
+        self._next_resync = 0.0  # Load the schedule right away
+        return True
+
+    def _set_leader(self, leader):
+        with self._condition:
+            if not leader:
+                self._heap = []
+                self._due = {}
+            self._leader = leader
+
+    def _release_lock_connection(self):
+        try:
+            self._lock_connection.invalidate()
+        except Exception:
+            pass
+        self._lock_connection = None
+
+    # ============================================================
+    # LOOP
+    # ============================================================
+
+    def run_once(self):
+        """
+        One scheduler iteration: confirm leadership, resync if needed and
+        freeze everything that is due
+
+        Returns: Number of frozen projects
+        """
+        if not self._is_leader():
+            # Followers only retry leadership, they never pop the schedule
+            self._set_leader(False)
+            self._next_resync = time.monotonic() + self.resync_interval
+            return 0
+        self._set_leader(True)
+
+        if time.monotonic() >= self._next_resync:
+            self._reload()
+            self._next_resync = time.monotonic() + self.resync_interval
+
         frozen_count = 0
-        
-        for assignment in assignments:
-            due_date = assignment.due_date
-            # Ensure due_date is timezone-aware
-            if due_date.tzinfo is None:
-                due_date = due_date.replace(tzinfo=timezone.utc)
-            
-            # Check if due date has passed
-            if now > due_date:
-                # Freeze all unfrozen submissions for this assignment
-                for submission in assignment.submissions:
-                    collab_project = submission.collaborative_project
-                    
-                    if collab_project and not collab_project.is_frozen():
-                        # Freeze the project
-                        collab_project.freeze_for_assignment(
-                            submission.user_id,
-                            assignment.id
-                        )
-                        frozen_count += 1
-                        logger.info(
-                            f"Auto-frozen project {collab_project.id} for assignment {assignment.id} "
-                            f"(due date: {due_date})"
-                        )
-                assignment.auto_freeze_on_due = False  # Prevent re-checking
-        
-        if frozen_count > 0:
-            db.session.commit()
-            logger.info(f"Auto-freeze check complete: {frozen_count} projects frozen")
-        
+        due_ids = self._pop_due()
+
+        for assignment_id in due_ids:
+            try:
+                frozen_count += freeze_overdue_assignment(assignment_id)
+            except Exception as e:
+                logger.error(f"Auto-freeze of assignment {assignment_id} failed: {str(e)}")
+                db.session.rollback()
+                metrics.increment('auto_freeze.errors')
+                # Retry with the next resync
+                self._next_resync = 0.0
+
+        if due_ids:
+            metrics.record_run('auto_freeze', assignments=len(due_ids), frozen=frozen_count)
+            logger.info(f"Auto-freeze: {frozen_count} projects frozen in {len(due_ids)} assignments")
+
         return frozen_count
-        
-    except Exception as e:
-        logger.error(f"Error in auto-freeze check: {str(e)}")
-        import traceback
-        traceback.print_exc()
-        db.session.rollback()
-        return 0
+
+    def _run(self):
+        while True:
+            with self.app.app_context():
+                try:
+                    self.run_once()
+                except Exception as e:
+                    logger.error(f"Error in auto-freeze scheduler: {str(e)}")
+                    metrics.increment('auto_freeze.errors')
+                    self._next_resync = time.monotonic() + self.resync_interval
+                finally:
+                    db.session.remove()
+            self._wait()
+
+    def start(self):
+        thread = threading.Thread(target=self._run, name='auto-freeze-scheduler', daemon=True)
+        thread.start()
+        return thread
+
+
+def start_auto_freeze_scheduler(app):
+    """
+    Start the auto-freeze scheduler in a daemon thread
+
+    Args:
+        app: Flask app
+
+    Returns: AutoFreezeScheduler, or None if disabled (AUTO_FREEZE_RESYNC_INTERVAL <= 0)
+    """
+    global _scheduler
+
+    interval = app.config['AUTO_FREEZE_RESYNC_INTERVAL']
+    if interval <= 0:
+        return None
+
+    _scheduler = AutoFreezeScheduler(app, interval)
+    _scheduler.start()
+    return _scheduler
+
+
+def schedule_auto_freeze(assignment):
+    """
+    Tell the local scheduler about a created or changed assignment
+
+    Wakes the scheduler immediately so a new due date is honoured to the
+    second. Changes made in a process without the leading scheduler are
+    picked up with the next resync.
+    """
+    if _scheduler is None:
+        return
+
+    if assignment.auto_freeze_on_due and not assignment.is_deleted:
+        _scheduler.schedule(assignment.id, assignment.due_date)
+    else:
+        _scheduler.schedule(assignment.id, None)
@@ -0,0 +1,160 @@
+"""
+Per-commit project statistics
+Size and complexity numbers (sb3 bytes, assets, sprites, blocks, scripts)
+computed once per commit and stored on the Commit row, so dashboards
+aggregate them in SQL. Existing commits are backfilled with a process pool.
+"""
+from app import db
+from app.models.projects import Project, Commit
+from app.utils import metrics
+from app.utils.similarity import project_signature
+from concurrent.futures import ProcessPoolExecutor
+import json
+import logging
+import multiprocessing
+import os
+import subprocess
+import sys
+import zipfile
+
+logger = logging.getLogger(__name__)
+
+STATS_COLUMNS = ('sb3_size', 'asset_count', 'asset_bytes', 'sprite_count', 'block_count', 'script_count')
+
+
+def project_json_stats(project_json):
+    """Sprite, block and script counts of a parsed project.json"""
+    sprite_count = block_count = script_count = 0
+
+    for target in project_json.get('targets') or []:
+        if not target.get('isStage'):
+            sprite_count += 1
+        for block in (target.get('blocks') or {}).values():
+            if isinstance(block, dict):
+                if block.get('shadow'):
+                    continue
+                block_count += 1
+                if block.get('topLevel'):
+                    script_count += 1
+            else:
+                # Top-level variable/list reporter stored as array
+                block_count += 1
+                script_count += 1
+
+    return {'sprite_count': sprite_count, 'block_count': block_count, 'script_count': script_count}
+
+
+def compute_commit_stats(sb3_path, project_json=None):
+    """
+    Statistics of an .sb3 file (runs in worker processes, no database access)
+
+    Args:
+        sb3_path: Path of the .sb3 file
+        project_json: Already parsed project.json (skips reading it again)
+
+    Returns: Dict with the STATS_COLUMNS and the MinHash signature
+             ('minhash'); values the file does not allow to compute are
+             None (sb3_size 0 and minhash b'' for a missing file)
+    """
+    stats = dict.fromkeys(STATS_COLUMNS)
+    stats['minhash'] = b''
+    if not sb3_path or not os.path.exists(sb3_path):
+        stats['sb3_size'] = 0
+        return stats
+
+    stats['sb3_size'] = os.path.getsize(sb3_path)
+    try:
+        with zipfile.ZipFile(sb3_path) as archive:
+            assets = [info for info in archive.infolist()
+                      if info.filename != 'project.json' and not info.is_dir()]
+            stats['asset_count'] = len(assets)
+            stats['asset_bytes'] = sum(info.file_size for info in assets)
+            if project_json is None:
+                with archive.open('project.json') as f:
+                    project_json = json.load(f)
+        stats.update(project_json_stats(project_json))
+        stats['minhash'] = project_signature(project_json)
+    except (OSError, KeyError, ValueError, TypeError, AttributeError, RecursionError,
+            zipfile.BadZipFile) as e:
+        logger.warning(f"Could not compute stats of {sb3_path}: {str(e)}")
+
+    return stats
+
+
+def stats_columns(commit_entity=Commit):
+    """Labeled stats columns for SELECTs that join a Commit"""
+    return [getattr(commit_entity, column).label(column) for column in STATS_COLUMNS]
+
+
+def stats_from_row(row):
+    """Stats dict of a row selected with stats_columns() (None if not computed)"""
+    if row['sb3_size'] is None:
+        return None
+    return {column: row[column] for column in STATS_COLUMNS}
+
+
+def apply_commit_stats(commit, stats):
+    """Store computed stats (and the MinHash signature) on a Commit"""
+    for column, value in stats.items():
+        setattr(commit, column, value)
+
+
+def backfill_commit_stats(workers=None, batch_size=200):
+    """
+    Compute stats and signatures of all commits that have none yet
+
+    The archives are parsed in a process pool (CPU bound JSON parsing),
+    results are written back with one bulk UPDATE per batch.
+
+    Returns: Number of updated commits
+    """
+    total = 0
+    # Fresh interpreters: forking a threaded web worker is not safe
+    context = multiprocessing.get_context('spawn')
+
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        while True:
+            rows = db.session.execute(
+                db.select(Commit.id, Project.sb3_file_path)
+                .join(Project, Project.id == Commit.project_id)
+                .where(db.or_(Commit.sb3_size.is_(None), Commit.minhash.is_(None)))
+                .order_by(Commit.id)
+                .limit(batch_size)
+            ).all()
+            if not rows:
+                break
+
+            results = pool.map(compute_commit_stats, [row.sb3_file_path for row in rows])
+            db.session.execute(db.update(Commit), [
+                {'id': row.id, **stats} for row, stats in zip(rows, results)
+            ])
+            db.session.commit()
+            total += len(rows)
+            metrics.increment('commit_stats.backfilled', len(rows))
+
+    return total
+
+
+def start_commit_stats_backfill(app):
+    """
+    Run the backfill in a separate interpreter (scripts/backfill_commit_stats.py)
+
+    Not in a thread of this process: the spawned pool workers re-import the
+    main module, and run.py starts the whole app (migrations, background
+    jobs, another backfill) when imported.
+
+    Returns: The Popen handle, or None if disabled
+    """
+    workers = app.config.get('COMMIT_STATS_BACKFILL_WORKERS', 2)
+    if workers <= 0:
+        return None
+
+    backend_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    try:
+        return subprocess.Popen(
+            [sys.executable, '-m', 'scripts.backfill_commit_stats', '--workers', str(workers)],
+            cwd=backend_root
+        )
+    except OSError as e:
+        logger.error(f"Commit stats backfill could not be started: {str(e)}")
+        return None
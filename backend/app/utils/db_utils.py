@@ -0,0 +1,42 @@
+"""
+Database helper utilities
+Dialect-aware building blocks for set-based statements (upserts etc.)
+"""
+from app import db
+
+
+def dialect_insert(table):
+    """
+    Return an INSERT construct for the active database dialect
+
+    PostgreSQL and SQLite both support INSERT ... ON CONFLICT, but SQLAlchemy
+    only exposes on_conflict_do_nothing/on_conflict_do_update on the
+    dialect-specific insert() constructs.
+
+    Args:
+        table: Table object (or model __table__)
+
+    Returns: Insert construct with ON CONFLICT support
+    """
+    if db.engine.dialect.name == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+
+    return insert(table)
+
+
+def is_postgresql():
+    """Check if the app is running against PostgreSQL"""
+    return db.engine.dialect.name == 'postgresql'
+
+
+def is_serialization_failure(error):
+    """
+    Check if a DBAPI error is a PostgreSQL serialization failure (SQLSTATE 40001)
+
+    Under REPEATABLE READ, INSERT ... ON CONFLICT raises it instead of doing
+    nothing when the conflicting row was committed after the transaction's
+    snapshot was taken.
+    """
+    return getattr(getattr(error, 'orig', None), 'pgcode', None) == '40001'
@@ -0,0 +1,82 @@
+"""
+JSON provider
+Serializes jsonify()/request.get_json() with orjson, which encodes
+dicts, lists and datetimes natively (several times faster than the
+stdlib encoder on large listings). Datetimes are written like
+to_iso_string() does: ISO 8601, naive values treated as UTC, 'Z' suffix.
+
+JSON_PROVIDER selects the implementation: 'orjson' (default, falls back
+to Flask's provider if orjson is not installed), 'default' or the import
+path of a flask.json.provider.JSONProvider subclass.
+"""
+from flask.json.provider import DefaultJSONProvider, JSONProvider
+from werkzeug.utils import import_string
+from decimal import Decimal
+import logging
+
+try:
+    import orjson
+except ImportError:  # Optional dependency, Flask's provider without it
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+# Keyword arguments orjson's output already satisfies (it is always compact)
+_COMPATIBLE_KWARGS = {'separators'}
+
+
+def _default(o):
+    """Types orjson does not encode natively (same as Flask's provider)"""
+    if isinstance(o, Decimal):
+        return str(o)
+    if hasattr(o, '__html__'):
+        return str(o.__html__())
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+
+class OrjsonProvider(JSONProvider):
+    """JSON provider backed by orjson"""
+
+    mimetype = 'application/json'
+
+    def __init__(self, app):
+        super().__init__(app)
+        self.option = orjson.OPT_NON_STR_KEYS | orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z
+        # stdlib semantics for anything orjson does not support (sort_keys, indent, cls, ...)
+        self._fallback = DefaultJSONProvider(app)
+
+    def dumps(self, obj, **kwargs):
+        if set(kwargs) - _COMPATIBLE_KWARGS:
+            return self._fallback.dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=_default, option=self.option).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return self._fallback.loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        option = self.option
+        if self._app.debug:
+            option |= orjson.OPT_INDENT_2
+        # Bytes straight into the response, no intermediate str
+        return self._app.response_class(
+            orjson.dumps(obj, default=_default, option=option) + b'\n',
+            mimetype=self.mimetype
+        )
+
+
+def init_json_provider(app):
+    """Install the JSON provider configured by JSON_PROVIDER"""
+    name = app.config.get('JSON_PROVIDER', 'orjson')
+
+    if name == 'default':
+        return
+    if name == 'orjson':
+        if orjson is None:
+            logger.warning("JSON_PROVIDER is orjson but orjson is not installed, using the default provider")
+            return
+        app.json = OrjsonProvider(app)
+    else:
+        app.json = import_string(name)(app)
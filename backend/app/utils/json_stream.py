@@ -0,0 +1,91 @@
+"""
+Streaming JSON responses
+For listings that can reach tens of thousands of rows (all users or
+groups for admins, unpaged project lists): rows are fetched from a
+server-side cursor in batches of YIELD_PER and written to the client as
+array elements while the query is still being read, so memory stays flat
+and the first bytes go out right away.
+
+Usage:
+
+    def students():
+        for row in iter_rows(query):
+            yield {'id': row.id, 'username': row.username}
+
+    return stream_json_response('students', students(),
+                                tail=lambda count: {'count': count})
+
+The response body is {"students": [...], "count": N} (head keys first,
+then the array, then the tail keys, which may depend on the row count).
+"""
+from flask import current_app, stream_with_context
+from app import db
+import traceback
+
+# Rows fetched per round trip (server-side cursor on PostgreSQL)
+YIELD_PER = 500
+
+# Array elements written per body chunk
+ELEMENTS_PER_CHUNK = 100
+
+
+def iter_rows(statement, yield_per=None):
+    """Execute a select and iterate its rows without buffering the result"""
+    return db.session.execute(statement, execution_options={'yield_per': yield_per or YIELD_PER})
+
+
+def iter_partitions(statement, yield_per=None):
+    """Execute a select and iterate its rows in lists of up to yield_per (YIELD_PER)"""
+    return iter_rows(statement, yield_per).partitions()
+
+
+def _members(data):
+    """'"a":1,"b":2' for {'a': 1, 'b': 2} (empty string for no keys)"""
+    if not data:
+        return ''
+    return current_app.json.dumps(data)[1:-1].strip()
+
+
+def stream_json_response(key, items, head=None, tail=None):
+    """
+    Response whose body is a JSON object with one array streamed element by element
+
+    Args:
+        key: Name of the array
+        items: Iterable of JSON-serializable elements, consumed while sending
+            (a generator, so queries run inside the response)
+        head: Optional dict of keys written before the array
+        tail: Optional callable(count) -> dict of keys written after the array
+
+    Returns: Streamed application/json response
+    """
+    dumps = current_app.json.dumps
+
+    def generate():
+        prefix = _members(head)
+        yield '{' + (prefix + ',' if prefix else '') + dumps(key) + ':['
+
+        count = 0
+        chunk = []
+        try:
+            for item in items:
+                chunk.append(dumps(item))
+                count += 1
+                if len(chunk) >= ELEMENTS_PER_CHUNK:
+                    yield (',' if count > len(chunk) else '') + ','.join(chunk)
+                    chunk = []
+            if chunk:
+                yield (',' if count > len(chunk) else '') + ','.join(chunk)
+        except Exception as e:
+            # Headers are sent already; a truncated body makes the client fail to parse
+            current_app.logger.error(f"Error streaming {key}: {str(e)}")
+            current_app.logger.error(traceback.format_exc())
+            raise
+
+        suffix = _members(tail(count)) if tail else ''
+        yield ']' + (',' + suffix if suffix else '') + '}'
+
+    return current_app.response_class(
+        stream_with_context(generate()),
+        mimetype='application/json'
+    )
@@ -0,0 +1,97 @@
+"""
+JWKS cache for local ID-token verification
+Keeps the provider's signing keys in memory and refreshes them periodically,
+so verifying an ID token at login needs no request to the provider.
+"""
+from authlib.integrations.flask_client import FlaskOAuth2App
+from app.utils import metrics
+import logging
+import threading
+import time
+import requests
+
+logger = logging.getLogger(__name__)
+
+
+class JWKSCache:
+    """Thread-safe, TTL-based cache of a JWK set"""
+
+    def __init__(self, jwks_uri=None, ttl=3600, min_refresh_interval=60, timeout=10):
+        """
+        Args:
+            jwks_uri: URL of the provider's JWK set
+            ttl: Seconds until the key set is refreshed
+            min_refresh_interval: Minimum seconds between forced refreshes
+                (an unknown kid triggers one, but must not hammer the provider)
+            timeout: HTTP timeout in seconds
+        """
+        self.jwks_uri = jwks_uri
+        self.ttl = ttl
+        self.min_refresh_interval = min_refresh_interval
+        self.timeout = timeout
+        self._jwks = None
+        self._fetched_at = 0.0
+        self._lock = threading.Lock()
+
+    def configure(self, jwks_uri, ttl=None, min_refresh_interval=None):
+        """Set the JWKS URI and timings (called from create_app)"""
+        with self._lock:
+            if jwks_uri != self.jwks_uri:
+                self._jwks = None
+                self._fetched_at = 0.0
+            self.jwks_uri = jwks_uri
+            if ttl is not None:
+                self.ttl = ttl
+            if min_refresh_interval is not None:
+                self.min_refresh_interval = min_refresh_interval
+
+    def get(self, force=False):
+        """
+        Get the cached JWK set, fetching it when missing or stale
+
+        Args:
+            force: Refresh now (e.g. the token's kid is unknown), unless the
+                last fetch was less than min_refresh_interval ago
+
+        Returns: JWK set dict ({'keys': [...]})
+        """
+        with self._lock:
+            age = time.monotonic() - self._fetched_at
+
+            if self._jwks is not None:
+                if not force and age < self.ttl:
+                    metrics.increment('jwks_cache.hits')
+                    return self._jwks
+                if force and age < self.min_refresh_interval:
+                    return self._jwks
+
+            try:
+                self._jwks = self._fetch()
+                self._fetched_at = time.monotonic()
+            except Exception as e:
+                if self._jwks is None:
+                    raise
+                # Keep serving the previous keys if the provider is unreachable
+                logger.warning(f"JWKS refresh failed, using cached keys: {str(e)}")
+                metrics.increment('jwks_cache.refresh_errors')
+
+            return self._jwks
+
+    def _fetch(self):
+        if not self.jwks_uri:
+            raise RuntimeError('OAUTH_JWKS_URI is not configured')
+
+        response = requests.get(self.jwks_uri, timeout=self.timeout)
+        response.raise_for_status()
+        metrics.increment('jwks_cache.fetches')
+        return response.json()
+
+
+jwks_cache = JWKSCache()
+
+
+class CachedJWKSOAuth2App(FlaskOAuth2App):
+    """OAuth client that verifies ID tokens against the shared JWKS cache"""
+
+    def fetch_jwk_set(self, force=False):
+        return jwks_cache.get(force=force)
@@ -0,0 +1,46 @@
+"""
+In-process metrics
+Counters and last-run summaries for background jobs, exposed via /api/metrics
+"""
+from collections import defaultdict
+from datetime import datetime, timezone
+import threading
+
+_lock = threading.Lock()
+_counters = defaultdict(int)
+_last_runs = {}
+
+
+def increment(name, value=1):
+    """Increment a named counter"""
+    with _lock:
+        _counters[name] += value
+
+
+def record_run(job, **counts):
+    """
+    Record one run of a background job
+
+    Args:
+        job: Job name (e.g. 'session_reaper')
+        **counts: Per-run numbers (e.g. deleted=12, batches=1)
+
+    Every count is also added to the cumulative counter '<job>.<name>'.
+    """
+    with _lock:
+        _counters[f'{job}.runs'] += 1
+        for name, value in counts.items():
+            _counters[f'{job}.{name}'] += value
+        _last_runs[job] = {
+            'finished_at': datetime.now(timezone.utc).isoformat(),
+            **counts
+        }
+
+
+def snapshot():
+    """Get a copy of all counters and last-run summaries"""
+    with _lock:
+        return {
+            'counters': dict(_counters),
+            'last_runs': {job: dict(run) for job, run in _last_runs.items()}
+        }
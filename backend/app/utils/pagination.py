@@ -0,0 +1,68 @@
+"""
+Listing helpers
+Opaque keyset cursors (the sort key of the last row of a page, encoded so
+clients just pass it back as ?cursor= for the next page), LIKE escaping
+for search terms and ?fields= selection.
+"""
+import base64
+import json
+
+
+def encode_cursor(values):
+    """
+    Encode the sort key of a row as an opaque cursor string
+
+    Args:
+        values: List of JSON-serializable values (e.g. [username, id])
+
+    Returns: URL-safe cursor string
+    """
+    raw = json.dumps(list(values), separators=(',', ':'), default=str).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor, length):
+    """
+    Decode a cursor created by encode_cursor
+
+    Args:
+        cursor: Cursor string from the client
+        length: Expected number of values
+
+    Returns: List of values
+
+    Raises: ValueError if the cursor is malformed
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except (ValueError, UnicodeError, TypeError):
+        raise ValueError('Invalid cursor')
+
+    if not isinstance(values, list) or len(values) != length:
+        raise ValueError('Invalid cursor')
+    return values
+
+
+def escape_like(term):
+    """Escape LIKE wildcards in a user supplied search term (use escape='\\\\')"""
+    return term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+def parse_fields(value):
+    """
+    Parse a ?fields=a,b,c selection
+
+    Returns: Set of field names, or None if all fields are wanted
+    """
+    if not value:
+        return None
+    fields = {field.strip() for field in value.split(',') if field.strip()}
+    return fields or None
+
+
+def pick_fields(data, fields):
+    """Reduce a serialized row to the selected fields (all if fields is None)"""
+    if fields is None:
+        return data
+    return {key: value for key, value in data.items() if key in fields}
@@ -0,0 +1,226 @@
+"""
+Project content index
+Extracts what a Scratch project contains (opcodes with counts, sprite
+names, extensions, variable and list names) from project.json when a
+commit is created, so teachers can query project contents in SQL instead
+of unzipping every .sb3.
+"""
+from app import db
+from app.models.project_content import ProjectContentIndex, ProjectContentItem
+from app.models.projects import Project, Commit
+from app.utils import metrics
+from app.utils.commit_stats import compute_commit_stats, apply_commit_stats
+from collections import Counter
+import json
+import logging
+import threading
+import time
+import zipfile
+
+logger = logging.getLogger(__name__)
+
+CONTENT_KINDS = ('opcode', 'sprite', 'extension', 'variable', 'list')
+
+_NAME_LENGTH = 255
+
+
+# ============================================================
+# EXTRACTION
+# ============================================================
+
+def read_project_json(sb3_path):
+    """Read and parse project.json from an .sb3 archive"""
+    with zipfile.ZipFile(sb3_path) as archive:
+        with archive.open('project.json') as f:
+            return json.load(f)
+
+
+def extract_content(project_json):
+    """
+    Count the contents of a Scratch 3 project
+
+    Args:
+        project_json: Parsed project.json
+
+    Returns: Counter of (kind, name) -> count
+    """
+    content = Counter()
+
+    for extension in project_json.get('extensions') or []:
+        content[('extension', extension)] += 1
+
+    for target in project_json.get('targets') or []:
+        if not target.get('isStage'):
+            content[('sprite', target.get('name') or '')] += 1
+
+        for variable in (target.get('variables') or {}).values():
+            if isinstance(variable, list) and variable:
+                content[('variable', str(variable[0]))] += 1
+
+        for list_ in (target.get('lists') or {}).values():
+            if isinstance(list_, list) and list_:
+                content[('list', str(list_[0]))] += 1
+
+        # Top-level reporters are stored as arrays, not blocks; menus are shadows
+        for block in (target.get('blocks') or {}).values():
+            if isinstance(block, dict) and block.get('opcode') and not block.get('shadow'):
+                content[('opcode', block['opcode'])] += 1
+
+    # Names longer than the column are truncated (and merged)
+    truncated = Counter()
+    for (kind, name), count in content.items():
+        truncated[(kind, name[:_NAME_LENGTH])] += count
+    return truncated
+
+
+# ============================================================
+# INDEXING
+# ============================================================
+
+def index_project_content(project_id, sb3_path, commit=None):
+    """
+    (Re)build the content index of one commit project
+
+    A missing or unreadable file is recorded on the index marker instead
+    of raising, so a broken upload never blocks a commit. The caller
+    commits the session.
+
+    Args:
+        project_id: Commit project ID
+        sb3_path: Path of its .sb3 file
+        commit: Commit row to store the commit stats on (same project.json read)
+
+    Returns: Number of indexed items
+    """
+    db.session.execute(db.delete(ProjectContentItem).where(ProjectContentItem.project_id == project_id))
+    db.session.execute(db.delete(ProjectContentIndex).where(ProjectContentIndex.project_id == project_id))
+
+    error = None
+    project_json = None
+    content = Counter()
+    try:
+        project_json = read_project_json(sb3_path)
+        content = extract_content(project_json)
+    except (OSError, KeyError, ValueError, TypeError, AttributeError, zipfile.BadZipFile) as e:
+        error = str(e)
+        logger.warning(f"Could not index content of project {project_id}: {error}")
+
+    if commit is not None:
+        apply_commit_stats(commit, compute_commit_stats(sb3_path, project_json))
+
+    if content:
+        db.session.execute(db.insert(ProjectContentItem), [
+            {'project_id': project_id, 'kind': kind, 'name': name, 'name_lower': name.lower(), 'count': count}
+            for (kind, name), count in content.items()
+        ])
+    db.session.add(ProjectContentIndex(project_id=project_id, error=error))
+    metrics.increment('project_content.indexed')
+    return len(content)
+
+
+def get_content_index(project_id):
+    """Index marker of a project (None if it has not been indexed yet)"""
+    return db.session.get(ProjectContentIndex, project_id)
+
+
+def copy_project_content(source_project_id, target_project_ids):
+    """
+    Give copies of a commit the content index of the original
+    (INSERT ... SELECT, no file is read). The caller commits the session.
+
+    Returns: False if the original is not indexed (nothing copied)
+    """
+    source_indexed = get_content_index(source_project_id)
+    if not source_indexed:
+        return False
+
+    for target_project_id in target_project_ids:
+        db.session.execute(db.insert(ProjectContentItem).from_select(
+            ['project_id', 'kind', 'name', 'name_lower', 'count'],
+            db.select(
+                db.literal(target_project_id), ProjectContentItem.kind,
+                ProjectContentItem.name, ProjectContentItem.name_lower, ProjectContentItem.count
+            ).where(ProjectContentItem.project_id == source_project_id)
+        ))
+
+    if target_project_ids:
+        db.session.execute(db.insert(ProjectContentIndex), [
+            {'project_id': target_project_id, 'error': source_indexed.error}
+            for target_project_id in target_project_ids
+        ])
+    return True
+
+
+def index_missing_project_content(batch_size=50):
+    """
+    Index commits created before the content index existed
+
+    A commit that fails unexpectedly is marked with the error and skipped,
+    so it cannot stop the backfill or be retried forever.
+
+    Returns: Number of commits processed in this batch
+    """
+    rows = db.session.execute(
+        db.select(Project.id, Project.sb3_file_path)
+        .join(Commit, Commit.project_id == Project.id)
+        .outerjoin(ProjectContentIndex, ProjectContentIndex.project_id == Project.id)
+        .where(ProjectContentIndex.project_id.is_(None))
+        .order_by(Project.id.desc())
+        .limit(batch_size)
+    ).all()
+
+    for row in rows:
+        try:
+            with db.session.begin_nested():
+                index_project_content(row.id, row.sb3_file_path)
+        except Exception as e:
+            logger.error(f"Could not index content of project {row.id}, skipping: {str(e)}")
+            metrics.increment('project_content.errors')
+            db.session.add(ProjectContentIndex(project_id=row.id, error=str(e)))
+    db.session.commit()
+    return len(rows)
+
+
+def start_content_backfill(app, pause=1.0):
+    """Index all existing commits in a background thread (exits when done)"""
+
+    def run():
+        total = 0
+        while True:
+            with app.app_context():
+                try:
+                    count = index_missing_project_content()
+                except Exception as e:
+                    logger.error(f"Project content backfill failed: {str(e)}")
+                    db.session.rollback()
+                    count = 0
+                finally:
+                    db.session.remove()
+            total += count
+            if not count:
+                break
+            time.sleep(pause)
+        if total:
+            logger.info(f"Project content backfill indexed {total} commits")
+
+    thread = threading.Thread(target=run, name='project-content-backfill', daemon=True)
+    thread.start()
+    return thread
+
+
+# ============================================================
+# QUERIES
+# ============================================================
+
+def content_filter(project_id_column, kind, name):
+    """EXISTS clause: project contains an item (names case-insensitive except opcodes/extensions)"""
+    condition = [
+        ProjectContentItem.project_id == project_id_column,
+        ProjectContentItem.kind == kind
+    ]
+    if kind in ('opcode', 'extension'):
+        condition.append(ProjectContentItem.name == name)
+    else:
+        # Lowercased at index time, so (kind, name_lower) is an index lookup
+        condition.append(ProjectContentItem.name_lower == name.lower())
+    return db.exists().where(*condition)
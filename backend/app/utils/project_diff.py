@@ -0,0 +1,174 @@
+"""
+Structural project diff
+Compares two project.json documents: sprites, costumes and sounds added,
+removed or changed, and scripts/blocks changed per sprite. Block IDs are
+stable across saves of the same project, so blocks are matched by ID.
+"""
+from collections import Counter
+
+# Bump when the diff format changes (cached diffs are recomputed)
+DIFF_VERSION = 1
+
+_BLOCK_KEYS = ('opcode', 'inputs', 'fields', 'next', 'parent', 'mutation')
+
+
+def _blocks(target):
+    """Real blocks of a target (top-level reporters are arrays, not dicts)"""
+    return {
+        block_id: block
+        for block_id, block in (target.get('blocks') or {}).items()
+        if isinstance(block, dict)
+    }
+
+
+def _script_roots(blocks):
+    """Map block ID -> ID of the top-level block of its script"""
+    roots = {}
+
+    for block_id in blocks:
+        path = []
+        current = block_id
+        while current not in roots:
+            path.append(current)
+            parent = blocks[current].get('parent')
+            if not parent or parent not in blocks or parent in path:
+                root = current
+                break
+            current = parent
+        else:
+            root = roots[current]
+        for visited in path:
+            roots[visited] = root
+    return roots
+
+
+def _named_assets(target, key):
+    return {asset.get('name'): asset.get('assetId') for asset in target.get(key) or []}
+
+
+def _diff_assets(old_target, new_target, key):
+    old_assets = _named_assets(old_target, key)
+    new_assets = _named_assets(new_target, key)
+    return {
+        'added': sorted(name for name in new_assets if name not in old_assets),
+        'removed': sorted(name for name in old_assets if name not in new_assets),
+        'changed': sorted(
+            name for name in new_assets
+            if name in old_assets and new_assets[name] != old_assets[name]
+        )
+    }
+
+
+def _diff_blocks(old_target, new_target):
+    old_blocks = _blocks(old_target)
+    new_blocks = _blocks(new_target)
+    old_roots = _script_roots(old_blocks)
+    new_roots = _script_roots(new_blocks)
+
+    added = [block_id for block_id in new_blocks if block_id not in old_blocks]
+    removed = [block_id for block_id in old_blocks if block_id not in new_blocks]
+    changed = [
+        block_id for block_id in new_blocks
+        if block_id in old_blocks and any(
+            new_blocks[block_id].get(k) != old_blocks[block_id].get(k) for k in _BLOCK_KEYS
+        )
+    ]
+
+    old_scripts = {block_id for block_id, block in old_blocks.items() if block.get('topLevel')}
+    new_scripts = {block_id for block_id, block in new_blocks.items() if block.get('topLevel')}
+    touched = {new_roots.get(block_id) for block_id in added + changed}
+    touched |= {old_roots.get(block_id) for block_id in removed}
+
+    return {
+        'scripts': {
+            'added': len(new_scripts - old_scripts),
+            'removed': len(old_scripts - new_scripts),
+            'changed': len(touched & old_scripts & new_scripts)
+        },
+        'blocks': {
+            'added': dict(Counter(new_blocks[block_id].get('opcode') for block_id in added)),
+            'removed': dict(Counter(old_blocks[block_id].get('opcode') for block_id in removed)),
+            'changed': len(changed)
+        }
+    }
+
+
+def _empty_target():
+    return {'blocks': {}, 'costumes': [], 'sounds': []}
+
+
+def diff_projects(old_json, new_json):
+    """
+    Structural diff of two parsed project.json documents
+
+    Targets are matched by name (the stage by isStage), so a renamed
+    sprite shows up as removed + added.
+
+    Returns: {'summary': {...counts...}, 'targets': [per-target changes]}
+    """
+    def targets_by_key(project_json):
+        return {
+            ('stage' if target.get('isStage') else 'sprite', target.get('name')): target
+            for target in project_json.get('targets') or []
+        }
+
+    old_targets = targets_by_key(old_json)
+    new_targets = targets_by_key(new_json)
+
+    summary = Counter()
+    targets = []
+
+    for key in list(old_targets) + [k for k in new_targets if k not in old_targets]:
+        kind, name = key
+        old_target = old_targets.get(key)
+        new_target = new_targets.get(key)
+
+        status = 'changed'
+        if old_target is None:
+            status = 'added'
+        elif new_target is None:
+            status = 'removed'
+
+        costumes = _diff_assets(old_target or _empty_target(), new_target or _empty_target(), 'costumes')
+        sounds = _diff_assets(old_target or _empty_target(), new_target or _empty_target(), 'sounds')
+        code = _diff_blocks(old_target or _empty_target(), new_target or _empty_target())
+
+        has_changes = (
+            status != 'changed'
+            or any(costumes.values()) or any(sounds.values())
+            or any(code['scripts'].values()) or any(code['blocks'].values())
+        )
+        if not has_changes:
+            continue
+
+        if kind == 'sprite':
+            summary[f'sprites_{status}'] += 1
+
+        for asset_kind, asset_diff in (('costumes', costumes), ('sounds', sounds)):
+            for change in ('added', 'removed', 'changed'):
+                summary[f'{asset_kind}_{change}'] += len(asset_diff[change])
+
+        for change in ('added', 'removed', 'changed'):
+            summary[f'scripts_{change}'] += code['scripts'][change]
+        summary['blocks_added'] += sum(code['blocks']['added'].values())
+        summary['blocks_removed'] += sum(code['blocks']['removed'].values())
+        summary['blocks_changed'] += code['blocks']['changed']
+
+        targets.append({
+            'name': name,
+            'is_stage': kind == 'stage',
+            'status': status,
+            'costumes': costumes,
+            'sounds': sounds,
+            **code
+        })
+
+    summary_keys = [
+        f'{kind}_{change}'
+        for kind in ('sprites', 'costumes', 'sounds', 'scripts', 'blocks')
+        for change in ('added', 'removed', 'changed')
+    ]
+    return {
+        'summary': {key: summary.get(key, 0) for key in summary_keys},
+        'targets': targets
+    }
@@ -0,0 +1,310 @@
+"""
+Full-text search
+Keeps search_documents in sync with collaborative projects, commits and
+assignments (mapper events, so every ORM write updates the index in the
+same transaction) and runs permission-filtered searches as one query.
+
+PostgreSQL: tsvector column filled by a trigger, GIN index
+SQLite: external-content FTS5 table kept in sync by triggers
+"""
+from app import db
+from app.models.search import SearchDocument
+from app.models.projects import CollaborativeProject, CollaborativeProjectPermission, Commit
+from app.models.assignments import Assignment, AssignmentUser, AssignmentGroup, assignment_organizers
+from app.models.users import user_groups
+from app.utils.db_utils import dialect_insert, is_postgresql
+from datetime import datetime, timezone
+from sqlalchemy import event, inspect
+import re
+
+DOC_TYPES = ('project', 'commit', 'assignment')
+
+# Language independent ("simple"): project names are German and English
+_TS_CONFIG = 'simple'
+
+_POSTGRES_SETUP = [
+    "ALTER TABLE search_documents ADD COLUMN IF NOT EXISTS search_vector tsvector",
+    "CREATE INDEX IF NOT EXISTS ix_search_documents_vector ON search_documents USING GIN (search_vector)",
+    "DROP TRIGGER IF EXISTS search_documents_vector_update ON search_documents",
+    "CREATE TRIGGER search_documents_vector_update BEFORE INSERT OR UPDATE ON search_documents "
+    f"FOR EACH ROW EXECUTE PROCEDURE tsvector_update_trigger(search_vector, 'pg_catalog.{_TS_CONFIG}', title, body)",
+    f"UPDATE search_documents SET search_vector = to_tsvector('{_TS_CONFIG}', coalesce(title, '') || ' ' || coalesce(body, ''))",
+]
+
+_SQLITE_SETUP = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS search_documents_fts USING fts5("
+    "title, body, content='search_documents', content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER IF NOT EXISTS search_documents_ai AFTER INSERT ON search_documents BEGIN "
+    "INSERT INTO search_documents_fts(rowid, title, body) VALUES (new.id, new.title, new.body); END",
+    "CREATE TRIGGER IF NOT EXISTS search_documents_ad AFTER DELETE ON search_documents BEGIN "
+    "INSERT INTO search_documents_fts(search_documents_fts, rowid, title, body) "
+    "VALUES ('delete', old.id, old.title, old.body); END",
+    "CREATE TRIGGER IF NOT EXISTS search_documents_au AFTER UPDATE ON search_documents BEGIN "
+    "INSERT INTO search_documents_fts(search_documents_fts, rowid, title, body) "
+    "VALUES ('delete', old.id, old.title, old.body); "
+    "INSERT INTO search_documents_fts(rowid, title, body) VALUES (new.id, new.title, new.body); END",
+    "INSERT INTO search_documents_fts(search_documents_fts) VALUES ('rebuild')",
+]
+
+_index_ready = False
+
+
+# ============================================================
+# INDEX MAINTENANCE
+# ============================================================
+
+def _source_select(doc_type, ids=None):
+    """SELECT producing search_documents rows for one document type"""
+    if doc_type == 'project':
+        source = CollaborativeProject
+        query = db.select(
+            db.literal('project'), CollaborativeProject.id, CollaborativeProject.id,
+            db.null(), CollaborativeProject.name, CollaborativeProject.description
+        )
+    elif doc_type == 'commit':
+        source = Commit
+        query = db.select(
+            db.literal('commit'), Commit.id, Commit.collaborative_project_id,
+            db.null(), db.null(), Commit.commit_message
+        )
+    else:
+        source = Assignment
+        query = db.select(
+            db.literal('assignment'), Assignment.id, db.null(),
+            Assignment.id, Assignment.name, Assignment.description
+        )
+
+    query = query.add_columns(db.literal(datetime.now(timezone.utc), db.DateTime))
+    # SQLite needs a WHERE to parse INSERT ... SELECT ... ON CONFLICT
+    return query.where(source.id.in_(ids) if ids is not None else db.true())
+
+
+def index_documents(doc_type, ids=None, connection=None):
+    """
+    Insert or refresh the search documents of some (or all) rows
+
+    Args:
+        doc_type: 'project', 'commit' or 'assignment'
+        ids: Source row IDs (None = all rows)
+        connection: Connection to use (inside flush events), default session
+    """
+    table = SearchDocument.__table__
+    statement = dialect_insert(table).from_select(
+        ['doc_type', 'doc_id', 'collaborative_project_id', 'assignment_id', 'title', 'body', 'updated_at'],
+        _source_select(doc_type, ids)
+    )
+    statement = statement.on_conflict_do_update(
+        index_elements=['doc_type', 'doc_id'],
+        set_={
+            'collaborative_project_id': statement.excluded.collaborative_project_id,
+            'assignment_id': statement.excluded.assignment_id,
+            'title': statement.excluded.title,
+            'body': statement.excluded.body,
+            'updated_at': statement.excluded.updated_at
+        }
+    )
+    (connection or db.session).execute(statement)
+
+
+def remove_documents(doc_type, ids, connection=None):
+    """Remove the search documents of deleted rows"""
+    (connection or db.session).execute(
+        db.delete(SearchDocument).where(
+            SearchDocument.doc_type == doc_type,
+            SearchDocument.doc_id.in_(ids)
+        )
+    )
+
+
+def ensure_search_index():
+    """
+    Create the dialect specific full-text index if it is missing
+
+    Fills search_documents from the source tables when it is empty
+    (first start or after a reset). Safe to call repeatedly.
+    """
+    global _index_ready
+
+    if is_postgresql():
+        missing = not db.session.execute(db.text(
+            "SELECT 1 FROM pg_trigger WHERE tgname = 'search_documents_vector_update'"
+        )).first()
+        setup = _POSTGRES_SETUP
+    else:
+        missing = not db.session.execute(db.text(
+            "SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = 'search_documents_ai'"
+        )).first()
+        setup = _SQLITE_SETUP
+
+    if missing:
+        for statement in setup:
+            db.session.execute(db.text(statement))
+
+    if not db.session.execute(db.select(SearchDocument.id).limit(1)).first():
+        for doc_type in DOC_TYPES:
+            index_documents(doc_type)
+
+    db.session.commit()
+    _index_ready = True
+
+
+def _ensure_once():
+    if not _index_ready:
+        ensure_search_index()
+
+
+# ============================================================
+# INCREMENTAL UPDATES
+# ============================================================
+
+# Source model -> (document type, columns that end up in the document)
+_INDEXED_MODELS = {
+    CollaborativeProject: ('project', ('name', 'description')),
+    Commit: ('commit', ('commit_message', 'collaborative_project_id')),
+    Assignment: ('assignment', ('name', 'description')),
+}
+
+
+def _after_insert(mapper, connection, target):
+    doc_type, _ = _INDEXED_MODELS[mapper.class_]
+    index_documents(doc_type, [target.id], connection)
+
+
+def _after_update(mapper, connection, target):
+    doc_type, columns = _INDEXED_MODELS[mapper.class_]
+    state = inspect(target)
+    if any(state.attrs[column].history.has_changes() for column in columns):
+        index_documents(doc_type, [target.id], connection)
+
+
+def _after_delete(mapper, connection, target):
+    doc_type, _ = _INDEXED_MODELS[mapper.class_]
+    remove_documents(doc_type, [target.id], connection)
+
+
+def register_search_listeners():
+    """Keep search documents in sync with ORM writes (idempotent)"""
+    for model in _INDEXED_MODELS:
+        for name, listener in (('after_insert', _after_insert),
+                               ('after_update', _after_update),
+                               ('after_delete', _after_delete)):
+            if not event.contains(model, name, listener):
+                event.listen(model, name, listener)
+
+
+# ============================================================
+# SEARCH
+# ============================================================
+
+def _terms(query):
+    """Words of a user query (everything else is dropped, no query syntax)"""
+    return re.findall(r'\w+', query.lower())[:10]
+
+
+def search(user, query, doc_types=None, limit=20):
+    """
+    Search the documents the user may see
+
+    Project and commit documents are visible to their project's owner and
+    to users/groups with a permission (teachers and admins see all);
+    assignments to organizers and assigned users (admins see all).
+    Every word must match, as a prefix.
+
+    Args:
+        user: User object
+        query: Search text
+        doc_types: Optional subset of DOC_TYPES
+        limit: Maximum number of results
+
+    Returns: List of result dicts, best match first
+    """
+    terms = _terms(query)
+    if not terms:
+        return []
+
+    _ensure_once()
+
+    doc_types = [t for t in (doc_types or DOC_TYPES) if t in DOC_TYPES]
+    is_admin = user.role == 'admin'
+    sees_all_projects = user.role in ['teacher', 'admin']
+
+    user_group_ids = db.select(user_groups.c.group_id).where(user_groups.c.user_id == user.id)
+
+    project_visible = db.and_(
+        CollaborativeProject.id.isnot(None),
+        CollaborativeProject.deleted_at.is_(None),
+        db.true() if sees_all_projects else db.or_(
+            CollaborativeProject.created_by == user.id,
+            db.exists().where(
+                CollaborativeProjectPermission.collaborative_project_id == CollaborativeProject.id,
+                db.or_(
+                    CollaborativeProjectPermission.user_id == user.id,
+                    CollaborativeProjectPermission.group_id.in_(user_group_ids)
+                )
+            )
+        )
+    )
+
+    assignment_visible = db.and_(
+        Assignment.id.isnot(None),
+        Assignment.deleted_at.is_(None),
+        db.true() if is_admin else db.or_(
+            db.exists().where(
+                assignment_organizers.c.assignment_id == Assignment.id,
+                assignment_organizers.c.user_id == user.id
+            ),
+            db.exists().where(
+                AssignmentUser.assignment_id == Assignment.id,
+                AssignmentUser.user_id == user.id
+            ),
+            db.exists().where(
+                AssignmentGroup.assignment_id == Assignment.id,
+                AssignmentGroup.group_id.in_(user_group_ids)
+            )
+        )
+    )
+
+    statement = db.select(
+        SearchDocument.doc_type,
+        SearchDocument.doc_id,
+        SearchDocument.title,
+        SearchDocument.body,
+        SearchDocument.collaborative_project_id,
+        SearchDocument.assignment_id,
+        CollaborativeProject.name.label('project_name')
+    ).outerjoin(
+        CollaborativeProject, CollaborativeProject.id == SearchDocument.collaborative_project_id
+    ).outerjoin(
+        Assignment, Assignment.id == SearchDocument.assignment_id
+    ).where(
+        SearchDocument.doc_type.in_(doc_types),
+        db.or_(
+            db.and_(SearchDocument.doc_type.in_(['project', 'commit']), project_visible),
+            db.and_(SearchDocument.doc_type == 'assignment', assignment_visible)
+        )
+    )
+
+    if is_postgresql():
+        ts_query = db.func.to_tsquery(_TS_CONFIG, ' & '.join(f"{term}:*" for term in terms))
+        vector = db.literal_column('search_documents.search_vector')
+        statement = statement.where(vector.op('@@')(ts_query)).order_by(
+            db.func.ts_rank(vector, ts_query).desc(), SearchDocument.id.desc()
+        )
+    else:
+        fts = db.table('search_documents_fts', db.column('rowid'), db.column('rank'))
+        statement = statement.join(fts, fts.c.rowid == SearchDocument.id).where(
+            db.literal_column('search_documents_fts').op('MATCH')(
+                ' '.join(f'"{term}"*' for term in terms)
+            )
+        ).order_by(fts.c.rank, SearchDocument.id.desc())
+
+    rows = db.session.execute(statement.limit(limit)).all()
+
+    return [{
+        'type': row.doc_type,
+        'id': row.doc_id,
+        'title': row.title if row.doc_type != 'commit' else row.project_name,
+        'text': (row.body or '')[:200],
+        'collaborative_project_id': row.collaborative_project_id,
+        'assignment_id': row.assignment_id
+    } for row in rows]
@@ -0,0 +1,104 @@
+"""
+Expired session reaper
+Deletes OAuth sessions that are past expires_at (plus a grace window for refresh)
+"""
+from app import db
+from app.models.oauth_session import OAuthSession
+from app.utils import metrics
+from flask import current_app
+from datetime import datetime, timezone
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+def reap_expired_sessions(grace=None, batch_size=None, max_batches=None):
+    """
+    Delete expired sessions in bounded batches
+
+    Sessions stay refreshable for the grace window after expires_at
+    (require_auth renews them with the refresh token), so only sessions
+    older than expires_at + grace are removed.
+
+    Args:
+        grace: timedelta, defaults to SESSION_REAPER_GRACE
+        batch_size: Rows deleted per transaction, defaults to SESSION_REAPER_BATCH_SIZE
+        max_batches: Upper bound of batches per run, defaults to SESSION_REAPER_MAX_BATCHES
+
+    Returns: Number of deleted sessions
+    """
+    config = current_app.config
+    grace = grace if grace is not None else config['SESSION_REAPER_GRACE']
+    batch_size = batch_size or config['SESSION_REAPER_BATCH_SIZE']
+    max_batches = max_batches or config['SESSION_REAPER_MAX_BATCHES']
+
+    cutoff = datetime.now(timezone.utc) - grace
+    started = time.monotonic()
+    deleted = 0
+    batches = 0
+
+    try:
+        while batches < max_batches:
+            # Uses the expires_at index
+            session_ids = [row[0] for row in db.session.query(OAuthSession.id)
+                           .filter(OAuthSession.expires_at < cutoff)
+                           .limit(batch_size)
+                           .all()]
+
+            if not session_ids:
+                break
+
+            deleted += db.session.query(OAuthSession)\
+                .filter(OAuthSession.id.in_(session_ids))\
+                .delete(synchronize_session=False)
+            db.session.commit()
+            batches += 1
+
+            if len(session_ids) < batch_size:
+                break
+
+    except Exception as e:
+        logger.error(f"Error reaping expired sessions: {str(e)}")
+        db.session.rollback()
+        metrics.increment('session_reaper.errors')
+
+    metrics.record_run(
+        'session_reaper',
+        deleted=deleted,
+        batches=batches,
+        duration_ms=int((time.monotonic() - started) * 1000)
+    )
+
+    if deleted:
+        logger.info(f"Session reaper deleted {deleted} expired sessions in {batches} batches")
+
+    return deleted
+
+
+def start_session_reaper(app):
+    """
+    Start the reaper in a daemon thread
+
+    Args:
+        app: Flask app (the thread pushes its own app context)
+
+    Returns: Thread object, or None if disabled (SESSION_REAPER_INTERVAL <= 0)
+    """
+    interval = app.config['SESSION_REAPER_INTERVAL']
+    if interval <= 0:
+        return None
+
+    def run():
+        while True:
+            with app.app_context():
+                try:
+                    reap_expired_sessions()
+                finally:
+                    db.session.remove()
+            time.sleep(interval)
+
+    thread = threading.Thread(target=run, name='session-reaper', daemon=True)
+    thread.start()
+    return thread
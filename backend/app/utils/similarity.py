@@ -0,0 +1,240 @@
+"""
+Project similarity (MinHash / LSH)
+Every commit gets a MinHash signature of its scripts, shingled into
+opcode sequences. Comparing two projects is then comparing two small
+signatures instead of parsing two archives, and LSH banding finds the
+similar pairs of an assignment without comparing every pair.
+
+NumPy computes the signatures vectorized if it is installed; the pure
+Python fallback produces identical signatures.
+"""
+from app import db
+import random
+import struct
+import zlib
+
+try:
+    import numpy as np
+except ImportError:  # Optional dependency
+    np = None
+
+NUM_PERM = 128
+BANDS = 32
+ROWS_PER_BAND = NUM_PERM // BANDS
+SHINGLE_SIZE = 3
+
+# Hash functions h(x) = (a * x + b) mod p over 32-bit shingle hashes.
+# a, b < 2^31 keep a * x + b below 2^64 (no uint64 overflow in NumPy).
+_PRIME = (1 << 31) - 1
+_rng = random.Random(20240601)
+_PERMUTATIONS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERM)]
+
+# Signature of a project without scripts (never reported as similar)
+EMPTY_SIGNATURE = struct.pack(f'<{NUM_PERM}I', *([_PRIME] * NUM_PERM))
+
+
+# ============================================================
+# SIGNATURES
+# ============================================================
+
+def _script_opcodes(blocks, block_id, seen):
+    """
+    Opcodes of a script in execution order (nested stacks inline)
+
+    Walks an explicit stack instead of recursing, so arbitrarily deep
+    nesting cannot exhaust the interpreter stack.
+    """
+    opcodes = []
+    pending = [block_id]
+    while pending:
+        block_id = pending.pop()
+        if not block_id or block_id in seen:
+            continue
+        block = blocks.get(block_id)
+        if not isinstance(block, dict):
+            continue
+        seen.add(block_id)
+        if not block.get('shadow'):
+            opcodes.append(block.get('opcode') or '')
+        # The next block comes after all nested stacks, so it is pushed first
+        pending.append(block.get('next'))
+        # Inputs are [shadow type, block ID or literal, ...]
+        nested = [value[1] for value in (block.get('inputs') or {}).values()
+                  if isinstance(value, list) and len(value) > 1 and isinstance(value[1], str)]
+        pending.extend(reversed(nested))
+    return opcodes
+
+
+def project_shingles(project_json):
+    """
+    Set of 32-bit hashes of opcode n-grams over all scripts
+
+    Scripts shorter than SHINGLE_SIZE form one shingle, so a lone
+    "when flag clicked" still counts.
+    """
+    shingles = set()
+
+    for target in project_json.get('targets') or []:
+        blocks = target.get('blocks') or {}
+        for block_id, block in blocks.items():
+            if not isinstance(block, dict) or not block.get('topLevel'):
+                continue
+            opcodes = _script_opcodes(blocks, block_id, set())
+            if not opcodes:
+                continue
+            windows = max(len(opcodes) - SHINGLE_SIZE + 1, 1)
+            for start in range(windows):
+                shingle = ' '.join(opcodes[start:start + SHINGLE_SIZE])
+                shingles.add(zlib.crc32(shingle.encode('utf-8')))
+
+    return shingles
+
+
+def minhash_signature(shingles):
+    """MinHash signature of a shingle set, packed as NUM_PERM little-endian uint32"""
+    if not shingles:
+        return EMPTY_SIGNATURE
+
+    if np is not None:
+        values = np.fromiter(shingles, dtype=np.uint64, count=len(shingles))
+        a = np.array([p[0] for p in _PERMUTATIONS], dtype=np.uint64)[:, None]
+        b = np.array([p[1] for p in _PERMUTATIONS], dtype=np.uint64)[:, None]
+        signature = ((a * values[None, :] + b) % np.uint64(_PRIME)).min(axis=1)
+        return signature.astype('<u4').tobytes()
+
+    values = list(shingles)
+    return struct.pack(f'<{NUM_PERM}I', *(
+        min((a * x + b) % _PRIME for x in values) for a, b in _PERMUTATIONS
+    ))
+
+
+def project_signature(project_json):
+    """MinHash signature of a parsed project.json"""
+    return minhash_signature(project_shingles(project_json))
+
+
+def estimate_similarity(signature_a, signature_b):
+    """Estimated Jaccard similarity of the shingle sets of two signatures"""
+    values_a = struct.unpack(f'<{NUM_PERM}I', signature_a)
+    values_b = struct.unpack(f'<{NUM_PERM}I', signature_b)
+    return sum(1 for x, y in zip(values_a, values_b) if x == y) / NUM_PERM
+
+
+def _is_usable(signature):
+    # b'' marks an unreadable project
+    return bool(signature) and len(signature) == NUM_PERM * 4 and signature != EMPTY_SIGNATURE
+
+
+# ============================================================
+# LSH
+# ============================================================
+
+def similar_pairs(signatures, threshold=0.5):
+    """
+    Pairs of similar items via LSH banding
+
+    Items sharing at least one band of ROWS_PER_BAND values become
+    candidates; candidates are checked with the full signature.
+
+    Args:
+        signatures: Dict key -> signature bytes
+        threshold: Minimum estimated similarity
+
+    Returns: List of (key_a, key_b, similarity), most similar first
+    """
+    band_size = ROWS_PER_BAND * 4
+    candidates = set()
+
+    for band in range(BANDS):
+        buckets = {}
+        for key, signature in signatures.items():
+            if not _is_usable(signature):
+                continue
+            bucket = signature[band * band_size:(band + 1) * band_size]
+            buckets.setdefault(bucket, []).append(key)
+        for keys in buckets.values():
+            for i in range(len(keys)):
+                for j in range(i + 1, len(keys)):
+                    candidates.add((keys[i], keys[j]))
+
+    pairs = []
+    for key_a, key_b in candidates:
+        similarity = estimate_similarity(signatures[key_a], signatures[key_b])
+        if similarity >= threshold:
+            pairs.append((key_a, key_b, similarity))
+
+    pairs.sort(key=lambda pair: -pair[2])
+    return pairs
+
+
+def assignment_similarity(assignment, threshold=0.5, limit=50):
+    """
+    Most similar submission pairs of an assignment, and each submission's
+    similarity to the starter project (if starter projects were handed out)
+
+    Submissions are compared by their submitted commit (or the latest
+    commit if none was recorded).
+
+    Returns: Dict with 'pairs' and 'submissions'
+    """
+    from app.models.assignments import AssignmentSubmission, AssignmentStarterProject
+    from app.models.projects import CollaborativeProject, Commit
+    from app.models.users import User
+
+    commit_project_id = db.func.coalesce(
+        AssignmentSubmission.submitted_commit_id, CollaborativeProject.latest_commit_id
+    )
+    rows = db.session.execute(
+        db.select(
+            AssignmentSubmission.id.label('submission_id'),
+            User.id.label('user_id'),
+            User.username,
+            CollaborativeProject.id.label('collaborative_project_id'),
+            Commit.project_id.label('commit_id'),
+            Commit.minhash
+        )
+        .join(User, User.id == AssignmentSubmission.user_id)
+        .join(CollaborativeProject, CollaborativeProject.id == AssignmentSubmission.collaborative_project_id)
+        .outerjoin(Commit, Commit.project_id == commit_project_id)
+        .where(AssignmentSubmission.assignment_id == assignment.id)
+    ).all()
+
+    starter_signatures = db.session.execute(
+        db.select(Commit.minhash).where(Commit.project_id.in_(
+            db.select(AssignmentStarterProject.template_commit_id)
+            .where(AssignmentStarterProject.assignment_id == assignment.id)
+            .distinct()
+        ))
+    ).scalars().all()
+    starter_signatures = [s for s in starter_signatures if _is_usable(s)]
+
+    by_id = {row.submission_id: row for row in rows}
+
+    def describe(row):
+        return {
+            'submission_id': row.submission_id,
+            'user': {'id': row.user_id, 'username': row.username},
+            'collaborative_project_id': row.collaborative_project_id,
+            'commit_id': row.commit_id
+        }
+
+    pairs = similar_pairs({row.submission_id: row.minhash for row in rows}, threshold)[:limit]
+
+    submissions = []
+    for row in rows:
+        entry = describe(row)
+        entry['indexed'] = row.minhash is not None
+        entry['starter_similarity'] = max(
+            (estimate_similarity(row.minhash, starter) for starter in starter_signatures),
+            default=None
+        ) if _is_usable(row.minhash) else None
+        submissions.append(entry)
+
+    return {
+        'pairs': [{
+            'a': describe(by_id[key_a]),
+            'b': describe(by_id[key_b]),
+            'similarity': round(similarity, 3)
+        } for key_a, key_b, similarity in pairs],
+        'submissions': submissions
+    }
@@ -0,0 +1,253 @@
+"""
+Assignment starter projects
+Hands out a template commit to every assigned user as their own
+CollaborativeProject, in a background job with progress reporting.
+
+Rows are written with bulk INSERTs per batch and the .sb3/thumbnail files
+are hard links to the template's files (the filesystem reference-counts
+them; saving a project always replaces its file, never writes in place).
+"""
+from flask import current_app
+from app import db
+from app.models.assignments import Assignment, AssignmentStarterProject
+from app.models.projects import CollaborativeProject, Project, Commit
+from app.utils import metrics
+from app.utils.commit_stats import compute_commit_stats
+from app.utils.project_content import (
+    get_content_index,
+    index_project_content,
+    copy_project_content
+)
+from app.utils.search_index import index_documents
+from werkzeug.utils import secure_filename
+from datetime import datetime, timezone
+import logging
+import os
+import shutil
+import threading
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 100
+
+# Finished jobs stay queryable for JOB_TTL seconds, at most MAX_FINISHED_JOBS of them
+JOB_TTL = 3600
+MAX_FINISHED_JOBS = 1000
+
+_jobs = {}
+_finished = {}  # job_id -> time.monotonic() of completion, oldest first
+_jobs_lock = threading.Lock()
+
+
+def link_or_copy(source, destination):
+    """Hard link source to destination, copy if linking is not possible"""
+    try:
+        os.link(source, destination)
+    except OSError:
+        shutil.copy2(source, destination)
+
+
+def get_job(job_id):
+    """Get a copy of a job's progress (None if unknown to this process)"""
+    with _jobs_lock:
+        job = _jobs.get(job_id)
+        return dict(job) if job else None
+
+
+def _update_job(job_id, **values):
+    with _jobs_lock:
+        _jobs[job_id].update(values)
+
+
+def _finish_job(job_id, **values):
+    with _jobs_lock:
+        _jobs[job_id].update(values, finished_at=datetime.now(timezone.utc).isoformat())
+        _finished[job_id] = time.monotonic()
+        _prune_jobs()
+
+
+def _prune_jobs():
+    """Forget expired finished jobs and the oldest beyond MAX_FINISHED_JOBS (caller holds the lock)"""
+    expired_before = time.monotonic() - JOB_TTL
+    for job_id, finished_at in list(_finished.items()):
+        if finished_at >= expired_before and len(_finished) <= MAX_FINISHED_JOBS:
+            break
+        del _finished[job_id]
+        _jobs.pop(job_id, None)
+
+
+def _pending_user_ids(assignment_id):
+    """Assigned users (direct + via groups) without a starter project yet"""
+    assigned = Assignment.assigned_users_subquery([assignment_id])
+    has_starter = db.exists().where(
+        AssignmentStarterProject.assignment_id == assignment_id,
+        AssignmentStarterProject.user_id == assigned.c.user_id
+    )
+    return db.session.execute(
+        db.select(assigned.c.user_id).where(~has_starter).order_by(assigned.c.user_id)
+    ).scalars().all()
+
+
+def create_starter_projects(assignment_id, template_commit_id, name, created_by, job_id=None):
+    """
+    Create a starter project for every assigned user that has none yet
+
+    Per batch of users: CollaborativeProjects, commit Projects, Commits and
+    AssignmentStarterProject rows are inserted with one statement each,
+    files are hard linked, and the batch is committed.
+
+    Args:
+        assignment_id: Assignment ID
+        template_commit_id: Project ID of the template commit
+        name: Name of the created projects
+        created_by: User ID of the organizer (for logging)
+        job_id: Optional job to report progress to
+
+    Returns: Number of created projects
+    """
+    template = db.session.get(Project, template_commit_id)
+    if not template or not template.sb3_file_path or not os.path.exists(template.sb3_file_path):
+        raise ValueError("Template commit file not found")
+
+    upload_folder = os.path.join(current_app.config['UPLOAD_FOLDER'], 'projects')
+    thumbnail_folder = os.path.join(current_app.config['UPLOAD_FOLDER'], 'thumbnails')
+    os.makedirs(upload_folder, exist_ok=True)
+    os.makedirs(thumbnail_folder, exist_ok=True)
+    has_thumbnail = bool(template.thumbnail_path and os.path.exists(template.thumbnail_path))
+
+    # Index the template once, the starter projects get a copy of its index
+    if not get_content_index(template.id):
+        index_project_content(template.id, template.sb3_file_path)
+        db.session.commit()
+
+    # Every starter commit has the template's content, stats are computed once
+    template_stats = compute_commit_stats(template.sb3_file_path)
+
+    user_ids = _pending_user_ids(assignment_id)
+    if job_id:
+        _update_job(job_id, total=len(user_ids), status='running')
+
+    description = f"Starter project for assignment #{assignment_id}"
+    commit_message = "Starter project"
+    created = 0
+
+    for start in range(0, len(user_ids), BATCH_SIZE):
+        batch = user_ids[start:start + BATCH_SIZE]
+        now = datetime.now(timezone.utc)
+        linked_files = []
+
+        try:
+            collab_ids = db.session.execute(
+                db.insert(CollaborativeProject).returning(
+                    CollaborativeProject.id, sort_by_parameter_order=True
+                ),
+                [{'name': name, 'description': description, 'created_by': user_id,
+                  'created_at': now, 'updated_at': now} for user_id in batch]
+            ).scalars().all()
+
+            project_ids = db.session.execute(
+                db.insert(Project).returning(Project.id, sort_by_parameter_order=True),
+                [{'name': f"{name} - Commit 1"[:100], 'description': description, 'owner_id': user_id,
+                  'created_at': now, 'updated_at': now} for user_id in batch]
+            ).scalars().all()
+
+            # Shared file content: one hard link per project
+            file_updates = []
+            for project_id, user_id in zip(project_ids, batch):
+                sb3_path = os.path.join(upload_folder, secure_filename(f"{project_id}_{user_id}.sb3"))
+                link_or_copy(template.sb3_file_path, sb3_path)
+                linked_files.append(sb3_path)
+                update = {'id': project_id, 'sb3_file_path': sb3_path}
+
+                if has_thumbnail:
+                    thumbnail_path = os.path.join(thumbnail_folder, secure_filename(f"thumb_{project_id}.png"))
+                    link_or_copy(template.thumbnail_path, thumbnail_path)
+                    linked_files.append(thumbnail_path)
+                    update['thumbnail_path'] = thumbnail_path
+
+                file_updates.append(update)
+
+            db.session.execute(db.update(Project), file_updates)
+
+            commit_ids = db.session.execute(db.insert(Commit).returning(Commit.id), [
+                {'project_id': project_id, 'collaborative_project_id': collab_id,
+                 'commit_number': 1, 'commit_message': commit_message,
+                 'committed_by': user_id, 'committed_at': now, **template_stats}
+                for collab_id, project_id, user_id in zip(collab_ids, project_ids, batch)
+            ]).scalars().all()
+
+            db.session.execute(db.update(CollaborativeProject), [
+                {'id': collab_id, 'latest_commit_id': project_id}
+                for collab_id, project_id in zip(collab_ids, project_ids)
+            ])
+
+            db.session.execute(db.insert(AssignmentStarterProject), [
+                {'assignment_id': assignment_id, 'user_id': user_id,
+                 'collaborative_project_id': collab_id,
+                 'template_commit_id': template_commit_id, 'created_at': now}
+                for collab_id, user_id in zip(collab_ids, batch)
+            ])
+
+            copy_project_content(template.id, project_ids)
+
+            # Bulk INSERTs bypass the ORM events that maintain the search index
+            index_documents('project', collab_ids)
+            index_documents('commit', commit_ids)
+
+            db.session.commit()
+
+        except Exception:
+            db.session.rollback()
+            for path in linked_files:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            raise
+
+        created += len(batch)
+        if job_id:
+            _update_job(job_id, created=created)
+
+    logger.info(
+        f"Created {created} starter projects for assignment {assignment_id} "
+        f"from commit {template_commit_id} (by {created_by})"
+    )
+    metrics.increment('starter_projects.created', created)
+    return created
+
+
+def start_starter_project_job(app, assignment_id, template_commit_id, name, created_by):
+    """
+    Run create_starter_projects in a background thread
+
+    Returns: Job ID for get_job()
+    """
+    job_id = uuid.uuid4().hex
+    with _jobs_lock:
+        _jobs[job_id] = {
+            'id': job_id,
+            'assignment_id': assignment_id,
+            'status': 'pending',
+            'total': None,
+            'created': 0,
+            'error': None,
+            'started_at': datetime.now(timezone.utc).isoformat(),
+            'finished_at': None
+        }
+
+    def run():
+        with app.app_context():
+            try:
+                create_starter_projects(assignment_id, template_commit_id, name, created_by, job_id)
+                _finish_job(job_id, status='completed')
+            except Exception as e:
+                logger.error(f"Starter project job {job_id} failed: {str(e)}")
+                _finish_job(job_id, status='failed', error=str(e))
+            finally:
+                db.session.remove()
+
+    threading.Thread(target=run, name=f'starter-projects-{assignment_id}', daemon=True).start()
+    return job_id
@@ -0,0 +1,246 @@
+"""
+Streaming ZIP archives
+Builds an uncompressed (stored) ZIP on the fly from files on disk and
+in-memory blobs. The byte layout is fully determined before streaming
+starts, so the archive has a Content-Length and any byte range of it can
+be produced without writing temp files or buffering the archive.
+
+CRC-32s are not needed up front: each entry's CRC follows its data in a
+data descriptor (flag bit 3) and is computed while the data is streamed,
+so a full download reads every file once. CRCs of files that were not
+streamed completely (Range requests) come from a per-process cache keyed
+by (path, mtime, size), and only files missing from it are read.
+"""
+from collections import OrderedDict
+from datetime import datetime
+import hashlib
+import os
+import struct
+import threading
+import zlib
+
+CHUNK_SIZE = 64 * 1024
+
+# Files whose CRC-32 is remembered across archives (least recently used dropped)
+CRC_CACHE_SIZE = 10000
+
+# Stored entries, sizes in the local header, CRC in a data descriptor, UTF-8 names
+_VERSION = 20
+_FLAGS = 0x0800 | 0x0008
+_ZIP32_LIMIT = 0xFFFFFFFF
+
+_LOCAL_HEADER = struct.Struct('<4s5H3L2H')
+_DATA_DESCRIPTOR = struct.Struct('<4s3L')
+_CENTRAL_HEADER = struct.Struct('<4s6H3L5H2L')
+_END_OF_CENTRAL_DIR = struct.Struct('<4s4H2LH')
+
+_crc_cache = OrderedDict()  # (path, mtime_ns, size) -> CRC-32
+_crc_cache_lock = threading.Lock()
+
+
+def _cached_crc(key):
+    with _crc_cache_lock:
+        crc = _crc_cache.get(key)
+        if crc is not None:
+            _crc_cache.move_to_end(key)
+        return crc
+
+
+def _cache_crc(key, crc):
+    with _crc_cache_lock:
+        _crc_cache[key] = crc
+        _crc_cache.move_to_end(key)
+        while len(_crc_cache) > CRC_CACHE_SIZE:
+            _crc_cache.popitem(last=False)
+
+
+class ZipTooLargeError(ValueError):
+    """Archive would need ZIP64 (an entry or the archive above 4 GiB)"""
+
+
+def _dos_datetime(value):
+    """DOS (time, date) for a datetime; ZIP cannot store dates before 1980"""
+    if value is None or value.year < 1980:
+        value = datetime(1980, 1, 1)
+    dos_time = (value.hour << 11) | (value.minute << 5) | (value.second // 2)
+    dos_date = ((value.year - 1980) << 9) | (value.month << 5) | value.day
+    return dos_time, dos_date
+
+
+class _Entry:
+    def __init__(self, name, size, modified, path=None, data=None, mtime_ns=None):
+        self.name = name.encode('utf-8')
+        self.size = size
+        self.path = path
+        self.data = data
+        self.dos_time, self.dos_date = _dos_datetime(modified)
+        self.offset = 0
+        self._crc = zlib.crc32(data) if data is not None else None
+        self._cache_key = (path, mtime_ns, size) if path is not None else None
+
+    @property
+    def crc(self):
+        """CRC-32 of the content (cached, or read from disk if never streamed in full)"""
+        if self._crc is None:
+            self._crc = _cached_crc(self._cache_key)
+        if self._crc is None:
+            crc = 0
+            with open(self.path, 'rb') as f:
+                for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+                    crc = zlib.crc32(chunk, crc)
+            self._crc = crc
+            _cache_crc(self._cache_key, crc)
+        return self._crc
+
+    @property
+    def header_size(self):
+        return _LOCAL_HEADER.size + len(self.name)
+
+    def local_header(self):
+        # CRC 0: it follows the data in the data descriptor
+        return _LOCAL_HEADER.pack(
+            b'PK\x03\x04', _VERSION, _FLAGS, 0, self.dos_time, self.dos_date,
+            0, self.size, self.size, len(self.name), 0
+        ) + self.name
+
+    def data_descriptor(self):
+        return _DATA_DESCRIPTOR.pack(b'PK\x07\x08', self.crc, self.size, self.size)
+
+    def central_header(self):
+        return _CENTRAL_HEADER.pack(
+            b'PK\x01\x02', _VERSION, _VERSION, _FLAGS, 0, self.dos_time, self.dos_date,
+            self.crc, self.size, self.size, len(self.name), 0, 0, 0, 0, 0, self.offset
+        ) + self.name
+
+    def read(self, start, length):
+        """Yield length bytes of the content starting at start"""
+        if self.data is not None:
+            yield self.data[start:start + length]
+            return
+
+        # Streamed from the first to the last byte: the CRC comes for free
+        complete = start == 0 and length == self.size and self._crc is None
+        crc = 0
+        with open(self.path, 'rb') as f:
+            f.seek(start)
+            while length > 0:
+                chunk = f.read(min(CHUNK_SIZE, length))
+                if not chunk:
+                    raise IOError(f"{self.path} is shorter than expected")
+                length -= len(chunk)
+                if complete:
+                    crc = zlib.crc32(chunk, crc)
+                yield chunk
+        if complete:
+            self._crc = crc
+            _cache_crc(self._cache_key, crc)
+
+
+class ZipStream:
+    """
+    Deterministic stored ZIP archive
+
+    Usage:
+        archive = ZipStream()
+        archive.add_file('a.sb3', '/path/a.sb3', modified=dt)
+        archive.add_bytes('manifest.csv', data, modified=dt)
+        archive.size                 # Content-Length
+        archive.iter_bytes(0, None)  # whole archive, or any byte range
+    """
+
+    def __init__(self):
+        self._entries = []
+        self._names = set()
+
+    def _unique_name(self, name):
+        base, ext = os.path.splitext(name)
+        candidate, counter = name, 1
+        while candidate in self._names:
+            counter += 1
+            candidate = f"{base}_{counter}{ext}"
+        self._names.add(candidate)
+        return candidate
+
+    def add_file(self, name, path, modified=None):
+        """Add a file from disk (its size is taken now)"""
+        name = self._unique_name(name)
+        stat = os.stat(path)
+        self._entries.append(_Entry(name, stat.st_size, modified, path=path, mtime_ns=stat.st_mtime_ns))
+        return name
+
+    def add_bytes(self, name, data, modified=None):
+        """Add an in-memory blob"""
+        name = self._unique_name(name)
+        self._entries.append(_Entry(name, len(data), modified, data=data))
+        return name
+
+    def _layout(self):
+        """Assign offsets; returns (central directory offset, central directory size)"""
+        offset = 0
+        for entry in self._entries:
+            if entry.size > _ZIP32_LIMIT:
+                raise ZipTooLargeError(f"{entry.name.decode('utf-8')} is too large for a ZIP archive")
+            entry.offset = offset
+            offset += entry.header_size + entry.size + _DATA_DESCRIPTOR.size
+
+        central_size = sum(_CENTRAL_HEADER.size + len(entry.name) for entry in self._entries)
+        if offset + central_size > _ZIP32_LIMIT or len(self._entries) > 0xFFFF:
+            raise ZipTooLargeError("Archive is too large for a ZIP archive")
+        return offset, central_size
+
+    @property
+    def size(self):
+        central_offset, central_size = self._layout()
+        return central_offset + central_size + _END_OF_CENTRAL_DIR.size
+
+    @property
+    def etag(self):
+        """Validator for If-Range: changes whenever names, sizes or dates change"""
+        digest = hashlib.sha1()
+        for entry in self._entries:
+            digest.update(entry.name)
+            digest.update(struct.pack('<QHH', entry.size, entry.dos_time, entry.dos_date))
+            digest.update(entry.data if entry.data is not None else entry.path.encode('utf-8'))
+        return digest.hexdigest()
+
+    def _segments(self):
+        """(length, producer) pairs covering the archive in order"""
+        central_offset, central_size = self._layout()
+
+        for entry in self._entries:
+            yield entry.header_size, lambda start, length, e=entry: [e.local_header()[start:start + length]]
+            yield entry.size, entry.read
+            yield _DATA_DESCRIPTOR.size, lambda start, length, e=entry: [e.data_descriptor()[start:start + length]]
+
+        def central_directory(start, length):
+            data = b''.join(entry.central_header() for entry in self._entries)
+            data += _END_OF_CENTRAL_DIR.pack(
+                b'PK\x05\x06', 0, 0, len(self._entries), len(self._entries),
+                central_size, central_offset, 0
+            )
+            return [data[start:start + length]]
+
+        yield central_size + _END_OF_CENTRAL_DIR.size, central_directory
+
+    def iter_bytes(self, start=0, stop=None):
+        """
+        Yield the archive bytes in [start, stop)
+
+        Entries completely before start are skipped without reading them
+        (their CRC is only looked up if a descriptor or the central directory
+        is requested).
+        """
+        stop = self.size if stop is None else stop
+        position = 0
+
+        for length, producer in self._segments():
+            segment_end = position + length
+            if segment_end > start and position < stop:
+                skip = max(start - position, 0)
+                count = min(segment_end, stop) - position - skip
+                for chunk in producer(skip, count):
+                    if chunk:
+                        yield chunk
+            position = segment_end
+            if position >= stop:
+                break
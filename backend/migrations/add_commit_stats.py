@@ -0,0 +1,125 @@
+"""
+Migration: Add stats columns to commits table
+Date: 2026-10-19
+Description: 
+    - Adds sb3_size, asset_count, asset_bytes, sprite_count, block_count and
+      script_count columns to commits table (NULL until computed)
+    - Adds minhash column (MinHash signature for similarity search)
+    - Existing commits are filled by the commit stats backfill job
+"""
+
+import os
+import sys
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import create_app, db
+from sqlalchemy import text, inspect
+
+STATS_COLUMNS = [
+    ('sb3_size', 'BIGINT'),
+    ('asset_count', 'INTEGER'),
+    ('asset_bytes', 'BIGINT'),
+    ('sprite_count', 'INTEGER'),
+    ('block_count', 'INTEGER'),
+    ('script_count', 'INTEGER'),
+    ('minhash', None),  # Binary type depends on the database
+]
+
+
+def run_migration():
+    """Add stats and signature columns to commits table"""
+    
+    app = create_app(os.environ.get("DEBUG", "False"))
+    
+    with app.app_context():
+        inspector = inspect(db.engine)
+        existing_tables = inspector.get_table_names()
+        
+        print("\n" + "="*80)
+        print("🚀 ADD COMMIT STATS MIGRATION")
+        print("="*80 + "\n")
+        
+        connection = db.engine.connect()
+        trans = connection.begin()
+        
+        try:
+            if 'commits' not in existing_tables:
+                print("❌ Error: commits table does not exist.")
+                return False
+            
+            existing_columns = [col['name'] for col in inspector.get_columns('commits')]
+            
+            binary_type = 'BYTEA' if db.engine.dialect.name == 'postgresql' else 'BLOB'
+            
+            for column, column_type in STATS_COLUMNS:
+                column_type = column_type or binary_type
+                if column not in existing_columns:
+                    print(f"📋 Adding {column} column to commits table...")
+                    connection.execute(text(f"ALTER TABLE commits ADD COLUMN {column} {column_type}"))
+                    print("   ✅ Column added successfully")
+                else:
+                    print(f"   ℹ️  {column} column already exists, skipping...")
+            
+            trans.commit()
+            print("\n" + "="*80)
+            print("✅ MIGRATION COMPLETED SUCCESSFULLY")
+            print("="*80 + "\n")
+            return True
+            
+        except Exception as e:
+            trans.rollback()
+            print(f"\n❌ Migration failed: {str(e)}")
+            print("   Rolling back changes...")
+            return False
+        finally:
+            connection.close()
+
+
+def rollback_migration():
+    """Rollback the commit stats columns"""
+    
+    app = create_app(os.environ.get("DEBUG", "False"))
+    
+    with app.app_context():
+        print("\n" + "="*80)
+        print("🔄 ROLLING BACK COMMIT STATS MIGRATION")
+        print("="*80 + "\n")
+        
+        connection = db.engine.connect()
+        trans = connection.begin()
+        
+        try:
+            for column, _ in STATS_COLUMNS:
+                print(f"📋 Removing {column} column from commits table...")
+                connection.execute(text(f"ALTER TABLE commits DROP COLUMN IF EXISTS {column}"))
+            print("   ✅ Columns removed successfully")
+            
+            trans.commit()
+            print("\n" + "="*80)
+            print("✅ ROLLBACK COMPLETED SUCCESSFULLY")
+            print("="*80 + "\n")
+            return True
+            
+        except Exception as e:
+            trans.rollback()
+            print(f"\n❌ Rollback failed: {str(e)}")
+            return False
+        finally:
+            connection.close()
+
+
+if __name__ == '__main__':
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Manage commit stats migration')
+    parser.add_argument('--rollback', action='store_true', help='Rollback the migration')
+    args = parser.parse_args()
+    
+    if args.rollback:
+        success = rollback_migration()
+    else:
+        success = run_migration()
+    
+    sys.exit(0 if success else 1)
@@ -0,0 +1,131 @@
+"""
+Migration: Add name_lower column to project_content_items table
+Date: 2026-10-19
+Description:
+    - Adds name_lower (the item name lowercased with Python's str.lower(),
+      like the content search does) for case-insensitive name lookups
+    - Fills it for existing rows, one UPDATE per distinct name
+    - Adds index idx_content_kind_name_lower on (kind, name_lower)
+"""
+
+import os
+import sys
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import create_app, db
+from sqlalchemy import text, inspect
+
+
+def run_migration():
+    """Add, fill and index the name_lower column of project_content_items"""
+
+    app = create_app(os.environ.get("DEBUG", "False"))
+
+    with app.app_context():
+        inspector = inspect(db.engine)
+        existing_tables = inspector.get_table_names()
+
+        print("\n" + "="*80)
+        print("🚀 ADD CONTENT NAME_LOWER MIGRATION")
+        print("="*80 + "\n")
+
+        connection = db.engine.connect()
+        trans = connection.begin()
+
+        try:
+            if 'project_content_items' not in existing_tables:
+                print("❌ Error: project_content_items table does not exist.")
+                return False
+
+            existing_columns = [col['name'] for col in inspector.get_columns('project_content_items')]
+
+            if 'name_lower' not in existing_columns:
+                print("📋 Adding name_lower column to project_content_items table...")
+                connection.execute(text("ALTER TABLE project_content_items ADD COLUMN name_lower VARCHAR(255)"))
+                print("   ✅ Column added successfully")
+            else:
+                print("   ℹ️  name_lower column already exists, skipping...")
+
+            # SQL lower() differs between databases for non-ASCII names, so lowercase in Python
+            names = connection.execute(text(
+                "SELECT DISTINCT name FROM project_content_items WHERE name_lower IS NULL"
+            )).scalars().all()
+            if names:
+                print(f"📋 Filling name_lower for {len(names)} distinct names...")
+                connection.execute(
+                    text("UPDATE project_content_items SET name_lower = :name_lower "
+                         "WHERE name = :name AND name_lower IS NULL"),
+                    [{'name': name, 'name_lower': name.lower()} for name in names]
+                )
+                print("   ✅ Column filled successfully")
+
+            print("📋 Creating index idx_content_kind_name_lower...")
+            connection.execute(text(
+                "CREATE INDEX IF NOT EXISTS idx_content_kind_name_lower "
+                "ON project_content_items (kind, name_lower)"
+            ))
+            print("   ✅ Index created successfully")
+
+            trans.commit()
+            print("\n" + "="*80)
+            print("✅ MIGRATION COMPLETED SUCCESSFULLY")
+            print("="*80 + "\n")
+            return True
+
+        except Exception as e:
+            trans.rollback()
+            print(f"\n❌ Migration failed: {str(e)}")
+            print("   Rolling back changes...")
+            return False
+        finally:
+            connection.close()
+
+
+def rollback_migration():
+    """Rollback the name_lower column"""
+
+    app = create_app(os.environ.get("DEBUG", "False"))
+
+    with app.app_context():
+        print("\n" + "="*80)
+        print("🔄 ROLLING BACK CONTENT NAME_LOWER MIGRATION")
+        print("="*80 + "\n")
+
+        connection = db.engine.connect()
+        trans = connection.begin()
+
+        try:
+            print("📋 Removing name_lower column from project_content_items table...")
+            connection.execute(text("DROP INDEX IF EXISTS idx_content_kind_name_lower"))
+            connection.execute(text("ALTER TABLE project_content_items DROP COLUMN IF EXISTS name_lower"))
+            print("   ✅ Column removed successfully")
+
+            trans.commit()
+            print("\n" + "="*80)
+            print("✅ ROLLBACK COMPLETED SUCCESSFULLY")
+            print("="*80 + "\n")
+            return True
+
+        except Exception as e:
+            trans.rollback()
+            print(f"\n❌ Rollback failed: {str(e)}")
+            return False
+        finally:
+            connection.close()
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Manage content name_lower migration')
+    parser.add_argument('--rollback', action='store_true', help='Rollback the migration')
+    args = parser.parse_args()
+
+    if args.rollback:
+        success = rollback_migration()
+    else:
+        success = run_migration()
+
+    sys.exit(0 if success else 1)
@@ -0,0 +1,113 @@
+"""
+Migration: Add performance indexes
+Date: 2026-10-19
+Description:
+    - Adds indexes that new installations get from the models via db.create_all()
+    - Safe to run repeatedly (CREATE INDEX IF NOT EXISTS)
+"""
+
+import os
+import sys
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import create_app, db
+from sqlalchemy import text, inspect
+
+
+# (index name, table, columns)
+INDEXES = [
+    ('ix_oauth_sessions_expires_at', 'oauth_sessions', 'expires_at'),
+    ('ix_users_username_id', 'users', 'username, id'),
+    ('ix_backpack_owner_updated_id', 'backpack_items', 'owner_id, updated_at, id'),
+]
+
+
+def run_migration():
+    """Create missing performance indexes"""
+
+    app = create_app(os.environ.get("DEBUG", "False"))
+
+    with app.app_context():
+        inspector = inspect(db.engine)
+        existing_tables = inspector.get_table_names()
+
+        print("\n" + "="*80)
+        print("🚀 PERFORMANCE INDEXES MIGRATION")
+        print("="*80 + "\n")
+
+        connection = db.engine.connect()
+        trans = connection.begin()
+
+        try:
+            for index_name, table, columns in INDEXES:
+                if table not in existing_tables:
+                    print(f"   ℹ️  Table {table} does not exist, skipping {index_name}...")
+                    continue
+
+                connection.execute(text(
+                    f"CREATE INDEX IF NOT EXISTS {index_name} ON {table} ({columns})"
+                ))
+                print(f"   ✅ {index_name}")
+
+            trans.commit()
+            print("\n" + "="*80)
+            print("✅ MIGRATION COMPLETED SUCCESSFULLY")
+            print("="*80 + "\n")
+            return True
+
+        except Exception as e:
+            trans.rollback()
+            print(f"\n❌ Migration failed: {str(e)}")
+            print("   Rolling back changes...")
+            return False
+        finally:
+            connection.close()
+
+
+def rollback_migration():
+    """Drop the performance indexes"""
+
+    app = create_app(os.environ.get("DEBUG", "False"))
+
+    with app.app_context():
+        print("\n" + "="*80)
+        print("🔄 ROLLING BACK PERFORMANCE INDEXES MIGRATION")
+        print("="*80 + "\n")
+
+        connection = db.engine.connect()
+        trans = connection.begin()
+
+        try:
+            for index_name, table, columns in INDEXES:
+                connection.execute(text(f"DROP INDEX IF EXISTS {index_name}"))
+                print(f"   ✅ Dropped {index_name}")
+
+            trans.commit()
+            print("\n" + "="*80)
+            print("✅ ROLLBACK COMPLETED SUCCESSFULLY")
+            print("="*80 + "\n")
+            return True
+
+        except Exception as e:
+            trans.rollback()
+            print(f"\n❌ Rollback failed: {str(e)}")
+            return False
+        finally:
+            connection.close()
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Manage performance indexes migration')
+    parser.add_argument('--rollback', action='store_true', help='Rollback the migration')
+    args = parser.parse_args()
+
+    if args.rollback:
+        success = rollback_migration()
+    else:
+        success = run_migration()
+
+    sys.exit(0 if success else 1)
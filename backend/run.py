@@ -14,6 +14,9 @@ migrate_postgres_to_new_postgres()
 
 # Import assignment migrations
 from migrations.add_assignments_tables import run_migration as run_assignments_migration
+from migrations.add_performance_indexes import run_migration as run_indexes_migration
+from migrations.add_commit_stats import run_migration as run_commit_stats_migration
+from migrations.add_content_name_lower import run_migration as run_content_name_lower_migration
 
 app = create_app(os.environ["DEBUG"])
 
@@ -197,5 +200,45 @@ try:
 except Exception as e:
     print(f"⚠️  Assignment migration skipped or already applied: {e}")
 
+# Run performance index migration
+try:
+    run_indexes_migration()
+except Exception as e:
+    print(f"⚠️  Index migration skipped: {e}")
+
+# Run commit stats migration
+try:
+    run_commit_stats_migration()
+except Exception as e:
+    print(f"⚠️  Commit stats migration skipped: {e}")
+
+# Run project content name_lower migration
+try:
+    run_content_name_lower_migration()
+except Exception as e:
+    print(f"⚠️  Content name_lower migration skipped: {e}")
+
+# Create the full-text search index (fills it on first start)
+try:
+    from app.utils.search_index import ensure_search_index
+    with app.app_context():
+        ensure_search_index()
+except Exception as e:
+    print(f"⚠️  Search index setup skipped: {e}")
+
+# Start background jobs
+from app.utils.session_reaper import start_session_reaper
+start_session_reaper(app)
+
+from app.utils.assignment_scheduler import start_auto_freeze_scheduler
+start_auto_freeze_scheduler(app)
+
+from app.utils.project_content import start_content_backfill
+start_content_backfill(app)
+
+# Separate process (scripts/backfill_commit_stats.py), its pool must not re-import this module
+from app.utils.commit_stats import start_commit_stats_backfill
+start_commit_stats_backfill(app)
+
 if __name__ == '__main__':
     app.run(host='0.0.0.0', port=5006 , debug=True)
\ No newline at end of file
@@ -0,0 +1,37 @@
+"""
+Backfill stats and MinHash signatures of existing commits
+
+    python -m scripts.backfill_commit_stats [--workers N]
+
+Runs in its own interpreter: the process pool's spawned workers re-import
+the main module, which is this side-effect free script (and not run.py,
+whose import runs migrations and starts the background jobs).
+"""
+import argparse
+import os
+
+if __name__ == '__main__':
+    import dotenv
+    dotenv.load_dotenv(os.path.join(os.path.dirname(__file__), '..', '.env'))
+
+
+def main():
+    from app import create_app, db
+    from app.utils.commit_stats import backfill_commit_stats
+
+    parser = argparse.ArgumentParser(description='Backfill commit stats')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Worker processes (default COMMIT_STATS_BACKFILL_WORKERS)')
+    args = parser.parse_args()
+
+    app = create_app(os.environ.get('DEBUG', False))
+    workers = args.workers or app.config.get('COMMIT_STATS_BACKFILL_WORKERS', 2)
+
+    with app.app_context():
+        total = backfill_commit_stats(workers=max(workers, 1))
+        db.session.remove()
+    print(f"Commit stats backfill updated {total} commits")
+
+
+if __name__ == '__main__':
+    main()
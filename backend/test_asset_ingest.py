@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Basic test for the shared asset ingest.
+Tests deduplication of uploads from the asset and backpack endpoints
+and the batch endpoints.
+"""
+
+import sys
+import os
+import io
+import base64
+import hashlib
+import shutil
+import sqlite3
+import tempfile
+from datetime import datetime, timezone, timedelta
+sys.path.insert(0, '.')
+
+# Set environment variables
+os.environ.setdefault('SECRET_KEY', 'test-key')
+os.environ.setdefault('FRONTEND_URL', 'http://localhost:3000')
+
+def test_asset_ingest():
+    """Test streaming ingest, deduplication and racing inserts"""
+    from app.models.users import User
+    from app.models.oauth_session import OAuthSession
+    from app.models.asset import Asset
+    from app.utils import asset_ingest
+    from app.utils.asset_ingest import spool_upload, store_spooled, temp_folder
+    from app.utils.db_utils import is_postgresql
+    from sqlalchemy import event
+    from app import create_app, db
+
+    print("Testing asset ingest...")
+
+    test_db_fd, test_db_path = tempfile.mkstemp(suffix='.db')
+    upload_folder = tempfile.mkdtemp()
+
+    try:
+        os.environ['DATABASE_URI'] = f'sqlite:///{test_db_path}'
+
+        app = create_app(debug=True)
+        app.config['UPLOAD_FOLDER'] = upload_folder
+
+        with app.app_context():
+            db.create_all()
+
+            user = User(id='ingest-user', username='user', role='student')
+            db.session.add(user)
+            db.session.add(OAuthSession(
+                id='ingest-session', user_id=user.id, access_token='token',
+                expires_at=datetime.now(timezone.utc) + timedelta(hours=1)
+            ))
+            db.session.commit()
+
+            client = app.test_client()
+            headers = {'X-Session-ID': 'ingest-session'}
+            costume = b'<svg xmlns="http://www.w3.org/2000/svg"/>' * 100
+            md5 = hashlib.md5(costume).hexdigest()
+
+            # Test 1: Upload and duplicate upload
+            print("\n[Test 1] Asset endpoint...")
+            for _ in range(2):
+                response = client.post('/api/assets/', headers=headers, data={
+                    'asset': (io.BytesIO(costume), 'cat.svg'), 'type': 'costume', 'format': 'svg'
+                })
+                assert response.get_json() == {'status': 'ok', 'assetId': md5}
+            asset = Asset.query.filter_by(asset_id=md5).one()
+            assert asset.size == len(costume)
+            with open(asset.file_path, 'rb') as f:
+                assert f.read() == costume
+            mtime = os.stat(asset.file_path).st_mtime_ns
+            assert os.listdir(temp_folder()) == []
+            print("✓ Stored once, temp files cleaned up")
+
+            # Test 2: Backpack stores through the same path (file not rewritten)
+            print("\n[Test 2] Backpack...")
+            response = client.post('/api/backpack', headers=headers, json={
+                'type': 'costume', 'mime': 'image/svg+xml', 'name': 'Katze',
+                'body': base64.b64encode(costume).decode(),
+                'thumbnail': 'data:image/jpeg;base64,' + base64.b64encode(b'jpeg').decode()
+            })
+            assert response.status_code == 200
+            assert response.get_json()['body'].startswith(md5)
+            assert Asset.query.count() == 2
+            assert os.stat(asset.file_path).st_mtime_ns == mtime
+            print("✓ Backpack deduplicates against editor assets")
+
+            response = client.post('/api/backpack', headers=headers, data={
+                'type': 'sprite', 'mime': 'application/zip', 'name': 'Hund',
+                'body': (io.BytesIO(b'PK' + b'\x00' * 2000), 'sprite.zip'),
+                'thumbnail': (io.BytesIO(b'jpeg'), 'thumb.jpg')
+            })
+            assert response.status_code == 200
+            item = response.get_json()
+            assert item['body'] == hashlib.md5(b'PK' + b'\x00' * 2000).hexdigest()
+            assert Asset.query.count() == 3
+            assert client.post('/api/backpack', headers=headers, data={
+                'type': 'sprite', 'mime': 'application/zip', 'name': 'Hund', 'body': 'text'
+            }).status_code == 400
+            print("✓ Multipart backpack upload streamed into the same storage")
+
+            # Test 3: Two racing uploads that both missed the existence check
+            print("\n[Test 3] Racing uploads...")
+            sound = b'RIFF' + b'\x01' * 500
+            for _ in range(2):
+                spooled = spool_upload(io.BytesIO(sound), temp_folder())
+                store_spooled(spooled, 'sound', 'wav', user.id, exists=False)
+            db.session.commit()
+            assert Asset.query.filter_by(md5=hashlib.md5(sound).hexdigest()).count() == 1
+            assert len(os.listdir(os.path.join(upload_folder, 'sound'))) == 1
+            print("✓ Second insert and file placement are no-ops")
+
+            # Test 4: Batch existence check and multi-asset upload
+            print("\n[Test 4] Batch endpoints...")
+            new_sounds = [b'RIFF' + bytes([i]) * 300 for i in range(5)]
+            new_ids = [hashlib.md5(data).hexdigest() + '.wav' for data in new_sounds]
+            data = client.post('/api/assets/missing', headers=headers,
+                               json={'assetIds': [md5 + '.svg'] + new_ids}).get_json()
+            assert data['missing'] == new_ids
+
+            response = client.post('/api/assets/batch', headers=headers, data={
+                'asset': [(io.BytesIO(d), f'sound{i}.wav') for i, d in enumerate(new_sounds + [new_sounds[0], costume])],
+                'type': 'sound'
+            })
+            assets = response.get_json()['assets']
+            assert [a['assetId'] for a in assets[:5]] == [i.split('.')[0] for i in new_ids]
+            assert [a['created'] for a in assets] == [True] * 5 + [False, False]
+            assert client.post('/api/assets/missing', headers=headers,
+                               json={'assetIds': new_ids}).get_json()['missing'] == []
+            assert Asset.query.filter_by(asset_type='sound').count() == 6
+            assert Asset.query.filter_by(asset_id=new_ids[0].split('.')[0]).one().data_format == 'wav'
+            assert os.listdir(temp_folder()) == []
+            assert client.post('/api/assets/missing', headers=headers, json={'assetIds': 'x'}).status_code == 400
+            print("✓ Missing assets reported, batch stored in one request")
+
+            # Test 5: Insert racing a concurrent commit under REPEATABLE READ (SQLSTATE 40001)
+            print("\n[Test 5] Serialization failure...")
+            raced = {hashlib.md5(b'race' * 100).hexdigest(), hashlib.md5(b'batch-race' * 100).hexdigest()}
+
+            class SerializationFailure(sqlite3.OperationalError):
+                pgcode = '40001'
+
+            def fail_raced_insert(conn, cursor, statement, parameters, context, executemany):
+                if statement.startswith('INSERT INTO assets') and raced & set(parameters):
+                    raise SerializationFailure('could not serialize access due to concurrent update')
+
+            asset_ingest.is_postgresql = lambda: True  # Savepoint path
+            event.listen(db.engine, 'before_cursor_execute', fail_raced_insert)
+            try:
+                response = client.post('/api/assets/', headers=headers, data={
+                    'asset': (io.BytesIO(b'race' * 100), 'race.svg'), 'type': 'costume', 'format': 'svg'
+                })
+                assert response.status_code == 200
+                assert response.get_json()['assetId'] == hashlib.md5(b'race' * 100).hexdigest()
+
+                batch = [b'batch-ok-1' * 100, b'batch-race' * 100, b'batch-ok-2' * 100]
+                response = client.post('/api/assets/batch', headers=headers, data={
+                    'asset': [(io.BytesIO(d), f'b{i}.wav') for i, d in enumerate(batch)], 'type': 'sound'
+                })
+                assert response.status_code == 200
+                assert [a['created'] for a in response.get_json()['assets']] == [True, False, True]
+            finally:
+                event.remove(db.engine, 'before_cursor_execute', fail_raced_insert)
+                asset_ingest.is_postgresql = is_postgresql
+            stored = {asset.asset_id for asset in Asset.query.all()}
+            assert hashlib.md5(batch[0]).hexdigest() in stored and hashlib.md5(batch[2]).hexdigest() in stored
+            assert os.listdir(temp_folder()) == []
+            print("✓ Lost race counted as duplicate, rest of the batch stored")
+
+            db.drop_all()
+
+    finally:
+        os.close(test_db_fd)
+        os.unlink(test_db_path)
+        shutil.rmtree(upload_folder, ignore_errors=True)
+
+if __name__ == '__main__':
+    try:
+        test_asset_ingest()
+    except AssertionError as e:
+        print(f"\n✗ Test failed: {e}")
+        sys.exit(1)
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Basic test for asset optimization.
+Tests lossless SVG/PNG optimization and serving of the optimized and
+precompressed variants.
+"""
+
+import sys
+import os
+import io
+import gzip
+import time
+import shutil
+import struct
+import tempfile
+import zlib
+from datetime import datetime, timezone, timedelta
+sys.path.insert(0, '.')
+
+# Set environment variables
+os.environ.setdefault('SECRET_KEY', 'test-key')
+os.environ.setdefault('FRONTEND_URL', 'http://localhost:3000')
+
+SVG = (
+    b'<?xml version="1.0" encoding="UTF-8"?>\n'
+    b'<!-- Generator: Paint -->\n'
+    b'<svg xmlns="http://www.w3.org/2000/svg" width="10" height="10">\n'
+    + b'    <rect width="5" height="5" fill="#00f"/>\n' * 20
+    + b'    <text x="1" y="5">Hallo   Welt</text>\n'
+    b'</svg>\n'
+)
+
+def _chunk(chunk_type, payload):
+    return struct.pack('>I', len(payload)) + chunk_type + payload + \
+        struct.pack('>I', zlib.crc32(chunk_type + payload) & 0xffffffff)
+
+def _wait_for_variant(db, AssetVariant, asset_id, name):
+    """Poll for a variant built in the background pool"""
+    for _ in range(50):
+        db.session.expire_all()
+        variant = db.session.get(AssetVariant, (asset_id, name))
+        if variant:
+            return variant
+        time.sleep(0.1)
+    return None
+
+def _png(width=32, height=32):
+    """Uncompressed RGB PNG with a text chunk"""
+    raw = b''.join(b'\x00' + bytes([x % 256, 0, 0]) * width for x in range(height))
+    return (b'\x89PNG\r\n\x1a\n'
+            + _chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0))
+            + _chunk(b'tEXt', b'Software\x00Paint')
+            + _chunk(b'IDAT', zlib.compress(raw, 0))
+            + _chunk(b'IEND', b'')), raw
+
+def _idat(png):
+    data, position = b'', 8
+    while position < len(png):
+        length, = struct.unpack('>I', png[position:position + 4])
+        if png[position + 4:position + 8] == b'IDAT':
+            data += png[position + 8:position + 8 + length]
+        position += 12 + length
+    return zlib.decompress(data)
+
+def test_asset_variants():
+    """Test optimizers and the optimized variant after upload"""
+    from app.models.users import User
+    from app.models.oauth_session import OAuthSession
+    from app.models.asset import Asset, AssetVariant
+    from app.utils import asset_optimizer
+    from app.utils.asset_optimizer import minify_svg, recompress_png
+    from app import create_app, db
+
+    print("Testing asset optimization...")
+
+    # Test 1: Optimizers
+    print("\n[Test 1] Optimizers...")
+    minified = minify_svg(SVG)
+    assert b'Generator' not in minified and b'>\n' not in minified
+    assert b'<text x="1" y="5">Hallo   Welt</text>' in minified
+    assert minify_svg(b'<svg><![CDATA[ a ]]>\n</svg>') == b'<svg><![CDATA[ a ]]>\n</svg>'
+
+    png, raw = _png()
+    recompressed = recompress_png(png)
+    assert len(recompressed) < len(png)
+    assert _idat(recompressed) == raw
+    assert b'tEXt' not in recompressed and b'IHDR' in recompressed
+    assert recompress_png(b'not a png') == b'not a png'
+    print("✓ SVG minified, PNG recompressed with identical pixels")
+
+    test_db_fd, test_db_path = tempfile.mkstemp(suffix='.db')
+    upload_folder = tempfile.mkdtemp()
+
+    try:
+        os.environ['DATABASE_URI'] = f'sqlite:///{test_db_path}'
+
+        app = create_app(debug=True)
+        app.config['UPLOAD_FOLDER'] = upload_folder
+        app.config['ASSET_OPTIMIZATION'] = True
+
+        with app.app_context():
+            db.create_all()
+
+            user = User(id='variant-user', username='user', role='student')
+            db.session.add(user)
+            db.session.add(OAuthSession(
+                id='variant-session', user_id=user.id, access_token='token',
+                expires_at=datetime.now(timezone.utc) + timedelta(hours=1)
+            ))
+            db.session.commit()
+
+            client = app.test_client()
+            headers = {'X-Session-ID': 'variant-session'}
+
+            # Test 2: Variant created after upload, original kept
+            print("\n[Test 2] Upload...")
+            asset_id = client.post('/api/assets/', headers=headers, data={
+                'asset': (io.BytesIO(SVG), 'cat.svg'), 'type': 'costume', 'format': 'svg'
+            }).get_json()['assetId']
+
+            variant = _wait_for_variant(db, AssetVariant, asset_id, 'optimized')
+            assert variant is not None and variant.size == len(minified)
+
+            assert client.get(f'/api/assets/{asset_id}').data == minified
+            assert client.get(f'/api/assets/{asset_id}.svg').data == minified
+            assert client.get(f'/api/assets/{asset_id}?original=true').data == SVG
+            with open(Asset.query.filter_by(asset_id=asset_id).one().file_path, 'rb') as f:
+                assert f.read() == SVG
+            print("✓ Optimized variant served, original byte-exact")
+
+            # Test 3: Precompressed variants by Accept-Encoding
+            print("\n[Test 3] Precompressed variants...")
+            # First request queues the variant and is served uncompressed
+            response = client.get(f'/api/assets/{asset_id}', headers={'Accept-Encoding': 'gzip, deflate'})
+            assert 'Content-Encoding' not in response.headers and response.data == minified
+            assert 'Accept-Encoding' in response.headers['Vary']
+            assert _wait_for_variant(db, AssetVariant, asset_id, 'optimized+gzip') is not None
+
+            response = client.get(f'/api/assets/{asset_id}', headers={'Accept-Encoding': 'gzip, deflate'})
+            assert response.headers['Content-Encoding'] == 'gzip'
+            assert gzip.decompress(response.data) == minified
+
+            client.get(f'/api/assets/{asset_id}?original=true', headers={'Accept-Encoding': 'gzip'})
+            _wait_for_variant(db, AssetVariant, asset_id, 'original+gzip')
+            response = client.get(f'/api/assets/{asset_id}?original=true', headers={'Accept-Encoding': 'gzip'})
+            assert gzip.decompress(response.data) == SVG
+
+            response = client.get(f'/api/assets/{asset_id}')
+            assert 'Content-Encoding' not in response.headers and 'Accept-Encoding' in response.headers['Vary']
+
+            png_id = client.post('/api/assets/', headers=headers, data={
+                'asset': (io.BytesIO(png), 'cat.png'), 'type': 'costume', 'format': 'png'
+            }).get_json()['assetId']
+            response = client.get(f'/api/assets/{png_id}?original=true', headers={'Accept-Encoding': 'gzip'})
+            assert 'Content-Encoding' not in response.headers and response.data == png
+            print("✓ gzip served with Vary, already compressed formats untouched")
+
+            # Test 4: Failing compression falls back to the plain file
+            print("\n[Test 4] Compression failure...")
+            svg_id = client.post('/api/assets/', headers=headers, data={
+                'asset': (io.BytesIO(SVG.replace(b'Hallo', b'Tschau')), 'dog.svg'), 'type': 'costume', 'format': 'svg'
+            }).get_json()['assetId']
+            suffix, compress = asset_optimizer.ENCODINGS['gzip']
+
+            def broken(data):
+                raise OSError('disk full')
+
+            asset_optimizer.ENCODINGS['gzip'] = (suffix, broken)
+            try:
+                for _ in range(2):
+                    response = client.get(f'/api/assets/{svg_id}?original=true', headers={'Accept-Encoding': 'gzip'})
+                    assert response.status_code == 200 and 'Content-Encoding' not in response.headers
+                for _ in range(50):
+                    if not asset_optimizer._pending:
+                        break
+                    time.sleep(0.1)
+            finally:
+                asset_optimizer.ENCODINGS['gzip'] = (suffix, compress)
+            db.session.expire_all()
+            assert db.session.get(AssetVariant, (svg_id, 'original+gzip')) is None
+            print("✓ Asset served uncompressed, failure only logged")
+
+            db.drop_all()
+
+    finally:
+        os.close(test_db_fd)
+        os.unlink(test_db_path)
+        shutil.rmtree(upload_folder, ignore_errors=True)
+
+if __name__ == '__main__':
+    try:
+        test_asset_variants()
+    except AssertionError as e:
+        print(f"\n✗ Test failed: {e}")
+        sys.exit(1)
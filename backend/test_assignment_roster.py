@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Basic test for assignment statistics and the grading roster.
+Tests that group-assigned students show up before they submit.
+"""
+
+import sys
+import os
+import tempfile
+from datetime import datetime, timezone, timedelta
+sys.path.insert(0, '.')
+
+# Set environment variables
+os.environ.setdefault('SECRET_KEY', 'test-key')
+os.environ.setdefault('FRONTEND_URL', 'http://localhost:3000')
+
+def test_assignment_roster():
+    """Test statistics and roster rows for direct and group assignments"""
+    from app.models.users import User
+    from app.models.groups import Group
+    from app.models.projects import CollaborativeProject
+    from app.models.assignments import Assignment, AssignmentSubmission
+    from app import create_app, db
+
+    print("Testing assignment roster...")
+
+    test_db_fd, test_db_path = tempfile.mkstemp(suffix='.db')
+
+    try:
+        os.environ['DATABASE_URI'] = f'sqlite:///{test_db_path}'
+
+        app = create_app(debug=True)
+
+        with app.app_context():
+            db.create_all()
+
+            students = [User(id=f'roster-{name}', username=name) for name in ('dora', 'anna', 'carl', 'bert')]
+            group = Group(name='5a', external_id='roster-5a')
+            db.session.add_all(students + [group])
+            db.session.flush()
+            group.members.extend(students[:3])
+
+            assignment = Assignment(name='Roster')
+            db.session.add(assignment)
+            db.session.flush()
+            assignment.assign_to_group(group)
+            assignment.assign_to_user(students[0])  # Assigned both ways
+            assignment.assign_to_user(students[3])
+
+            now = datetime.now(timezone.utc)
+            for student, minutes in ((students[1], 10), (students[3], 5)):
+                project = CollaborativeProject(name=f'{student.username} project', created_by=student.id)
+                db.session.add(project)
+                db.session.flush()
+                db.session.add(AssignmentSubmission(
+                    assignment_id=assignment.id,
+                    user_id=student.id,
+                    collaborative_project_id=project.id,
+                    submitted_at=now - timedelta(minutes=minutes)
+                ))
+            db.session.commit()
+            assignment.freeze_submissions(frozen_by=students[3].id)
+            db.session.commit()
+
+            # Test 1: Statistics count every assigned user once
+            print("\n[Test 1] Statistics...")
+            statistics = Assignment.get_statistics([assignment.id])[assignment.id]
+            assert statistics['total_assigned'] == 4
+            assert statistics['total_submitted'] == 2
+            assert statistics['submission_rate'] == 50
+            print("✓ 4 assigned, 2 submitted")
+
+            # Test 2: Roster sorted by username, including not submitted rows
+            print("\n[Test 2] Roster by username...")
+            rows, total = assignment.get_roster()
+            assert total == 4
+            assert [row['username'] for row in rows] == ['anna', 'bert', 'carl', 'dora']
+            assert [row['submission_id'] is not None for row in rows] == [True, True, False, False]
+            assert [bool(row['is_frozen']) for row in rows] == [True, True, False, False]
+            print("✓ Not yet submitted students included")
+
+            # Test 3: Sorted by submission time with pagination
+            print("\n[Test 3] Roster by submitted_at...")
+            rows, total = assignment.get_roster(sort='submitted_at', descending=True, limit=3)
+            assert total == 4
+            assert [row['username'] for row in rows] == ['bert', 'anna', 'carl']
+            rows, _ = assignment.get_roster(sort='submitted_at', limit=2, offset=2)
+            assert [row['username'] for row in rows] == ['carl', 'dora']
+            print("✓ Submitted rows first, pages are stable")
+
+            # Test 4: Batched lookups match the per-assignment computations
+            print("\n[Test 4] Batched statistics...")
+            empty_group = Group(name='5b', external_id='roster-5b')
+            db.session.add(empty_group)
+            unsubmitted = Assignment(name='No submissions')
+            only_empty_group = Assignment(name='Empty group')
+            unassigned = Assignment(name='Unassigned')
+            db.session.add_all([unsubmitted, only_empty_group, unassigned])
+            db.session.flush()
+            unsubmitted.assign_to_group(group)
+            only_empty_group.assign_to_group(empty_group)
+            assignment.add_organizer(students[3])
+            unassigned.add_organizer(students[3])
+            db.session.commit()
+
+            assignments = [assignment, unsubmitted, only_empty_group, unassigned]
+            ids = [a.id for a in assignments]
+            statistics = Assignment.get_statistics(ids)
+            for a in assignments:
+                total_assigned = len(a.get_all_assigned_users())
+                total_submitted = len(a.submissions)
+                assert statistics[a.id] == {
+                    'total_assigned': total_assigned,
+                    'total_submitted': total_submitted,
+                    'submission_rate': (total_submitted / total_assigned * 100) if total_assigned > 0 else 0
+                }, a.name
+            assert [statistics[a.id]['total_assigned'] for a in assignments] == [4, 3, 0, 0]
+
+            for student in students:
+                submissions = Assignment.get_user_submissions(ids, student.id)
+                assert {a.id: a.get_submission(student) for a in assignments if a.get_submission(student)} == submissions
+                assert Assignment.get_organized_ids(ids, student.id) == {a.id for a in assignments if a.is_organizer(student)}
+            assert Assignment.get_organized_ids(ids, students[3].id) == {assignment.id, unassigned.id}
+
+            member_counts = Group.get_member_counts([group.id, empty_group.id])
+            for g in (group, empty_group):
+                assert member_counts.get(g.id, 0) == g.get_members_count()
+            for a in assignments:
+                assert a.to_dict(include_assignments=True, member_counts=member_counts) == \
+                    a.to_dict(include_assignments=True)
+            assert Assignment.get_statistics([]) == {} and Group.get_member_counts([]) == {}
+            print("✓ Same numbers, including no submissions and empty groups")
+
+            db.drop_all()
+
+    finally:
+        os.close(test_db_fd)
+        os.unlink(test_db_path)
+
+if __name__ == '__main__':
+    try:
+        test_assignment_roster()
+    except AssertionError as e:
+        print(f"\n✗ Test failed: {e}")
+        sys.exit(1)
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Basic test for the auto-freeze scheduler.
+Tests that due assignments are frozen from the due-date heap and that
+bulk freeze/unfreeze works on whole assignments.
+"""
+
+import sys
+import os
+import tempfile
+import time
+from datetime import datetime, timezone, timedelta
+sys.path.insert(0, '.')
+
+# Set environment variables
+os.environ.setdefault('SECRET_KEY', 'test-key')
+os.environ.setdefault('FRONTEND_URL', 'http://localhost:3000')
+
+def _create_submission(db, assignment, user_id):
+    """Create a user with a submitted collaborative project"""
+    from app.models.users import User
+    from app.models.projects import CollaborativeProject
+    from app.models.assignments import AssignmentSubmission
+
+    user = User(id=user_id, username=user_id)
+    project = CollaborativeProject(name=f'{user_id} project', created_by=user_id)
+    db.session.add_all([user, project])
+    db.session.flush()
+    db.session.add(AssignmentSubmission(
+        assignment_id=assignment.id,
+        user_id=user_id,
+        collaborative_project_id=project.id
+    ))
+    return project
+
+def test_auto_freeze_scheduler():
+    """Test that the scheduler freezes exactly the assignments that are due"""
+    from app.models.assignments import Assignment
+    from app.utils.assignment_scheduler import AutoFreezeScheduler
+    from app import create_app, db
+
+    print("Testing auto-freeze scheduler...")
+
+    test_db_fd, test_db_path = tempfile.mkstemp(suffix='.db')
+
+    try:
+        os.environ['DATABASE_URI'] = f'sqlite:///{test_db_path}'
+
+        app = create_app(debug=True)
+
+        with app.app_context():
+            db.create_all()
+
+            now = datetime.now(timezone.utc)
+            overdue = Assignment(name='Overdue', due_date=now - timedelta(minutes=5), auto_freeze_on_due=True)
+            upcoming = Assignment(name='Upcoming', due_date=now + timedelta(days=1), auto_freeze_on_due=True)
+            db.session.add_all([overdue, upcoming])
+            db.session.flush()
+            overdue_project = _create_submission(db, overdue, 'freeze-student-1')
+            upcoming_project = _create_submission(db, upcoming, 'freeze-student-2')
+            db.session.commit()
+
+            scheduler = AutoFreezeScheduler(app, resync_interval=300)
+
+            # Test 1: First run loads the heap and freezes the overdue assignment
+            print("\n[Test 1] Initial run...")
+            assert scheduler.run_once() == 1
+            assert overdue_project.is_frozen()
+            assert not upcoming_project.is_frozen()
+            assert Assignment.query.get(overdue.id).auto_freeze_on_due is False
+            assert [entry[1] for entry in scheduler._heap] == [upcoming.id]
+            print("✓ Overdue assignment frozen, upcoming one scheduled")
+
+            # Test 2: Moving the due date into the past wakes the scheduler
+            print("\n[Test 2] Rescheduled due date...")
+            upcoming.due_date = now - timedelta(seconds=1)
+            db.session.commit()
+            scheduler.schedule(upcoming.id, upcoming.due_date)
+            assert scheduler.run_once() == 1
+            assert upcoming_project.is_frozen()
+            assert scheduler._due == {}
+            print("✓ Rescheduled assignment frozen, stale heap entry ignored")
+
+            # Test 3: Disabled auto-freeze is re-checked in the database
+            print("\n[Test 3] Disabled auto-freeze...")
+            disabled = Assignment(name='Disabled', due_date=now - timedelta(minutes=1), auto_freeze_on_due=False)
+            db.session.add(disabled)
+            db.session.flush()
+            disabled_project = _create_submission(db, disabled, 'freeze-student-3')
+            db.session.commit()
+            scheduler.schedule(disabled.id, disabled.due_date)
+            assert scheduler.run_once() == 0
+            assert not disabled_project.is_frozen()
+            print("✓ Stale schedule entries are no-ops")
+
+            # Test 4: A follower ignores past-due entries and sleeps until its next attempt
+            print("\n[Test 4] Follower...")
+            follower = AutoFreezeScheduler(app, resync_interval=0.3)
+            follower._is_leader = lambda: False
+            follower.schedule(overdue.id, now - timedelta(minutes=5))
+            assert follower.run_once() == 0
+            follower.schedule(overdue.id, now - timedelta(minutes=5))
+            assert follower._heap == [] and follower._due == {}
+            started = time.monotonic()
+            follower._wait()
+            assert time.monotonic() - started >= 0.25
+            print("✓ No schedule on followers, no busy loop")
+
+            db.drop_all()
+
+    finally:
+        os.close(test_db_fd)
+        os.unlink(test_db_path)
+
+def test_bulk_freeze_unfreeze():
+    """Test set-based freezing and unfreezing of an assignment's submissions"""
+    from app.models.assignments import Assignment
+    from app.models.projects import CollaborativeProjectPermission, PermissionLevel
+    from app import create_app, db
+
+    print("Testing bulk freeze/unfreeze...")
+
+    test_db_fd, test_db_path = tempfile.mkstemp(suffix='.db')
+
+    try:
+        os.environ['DATABASE_URI'] = f'sqlite:///{test_db_path}'
+
+        app = create_app(debug=True)
+
+        with app.app_context():
+            db.create_all()
+
+            assignment = Assignment(name='Bulk')
+            other = Assignment(name='Other')
+            db.session.add_all([assignment, other])
+            db.session.flush()
+            projects = [_create_submission(db, assignment, f'bulk-student-{i}') for i in range(5)]
+            db.session.add(CollaborativeProjectPermission(
+                collaborative_project_id=projects[0].id,
+                user_id='bulk-student-1',
+                permission=PermissionLevel.WRITE
+            ))
+            db.session.commit()
+
+            # Test 1: Missing owner rows are inserted and everything is frozen
+            print("\n[Test 1] Freeze all...")
+            assert assignment.freeze_submissions(frozen_by='bulk-student-0') == 5
+            db.session.commit()
+            assert all(project.is_frozen() for project in projects)
+            assert CollaborativeProjectPermission.query.filter_by(is_frozen=True).count() == 6
+            assert assignment.freeze_submissions(frozen_by='bulk-student-0') == 0
+            print("✓ 5 projects frozen, second run is a no-op")
+
+            # Test 2: Auto-freeze records the submitting student
+            print("\n[Test 2] Unfreeze and auto-freeze...")
+            assert assignment.unfreeze_submissions() == (5, 6)
+            db.session.commit()
+            assert not any(project.is_frozen() for project in projects)
+            assignment.freeze_submissions()
+            db.session.commit()
+            owner_perm = CollaborativeProjectPermission.query.filter_by(
+                collaborative_project_id=projects[3].id, user_id='bulk-student-3'
+            ).first()
+            assert owner_perm.frozen_by == 'bulk-student-3'
+            assert owner_perm.frozen_reason == assignment.freeze_reason
+            print("✓ frozen_by is the submitting student")
+
+            # Test 3: own_only leaves permissions frozen for other assignments
+            print("\n[Test 3] Unfreeze own permissions only...")
+            CollaborativeProjectPermission.query.filter_by(
+                collaborative_project_id=projects[4].id
+            ).first().frozen_reason = other.freeze_reason
+            db.session.commit()
+            assert assignment.unfreeze_submissions(own_only=True) == (4, 5)
+            db.session.commit()
+            assert projects[4].is_frozen()
+            print("✓ Foreign freezes kept")
+
+            db.drop_all()
+
+    finally:
+        os.close(test_db_fd)
+        os.unlink(test_db_path)
+
+if __name__ == '__main__':
+    try:
+        test_auto_freeze_scheduler()
+        test_bulk_freeze_unfreeze()
+    except AssertionError as e:
+        print(f"\n✗ Test failed: {e}")
+        sys.exit(1)
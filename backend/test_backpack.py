@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Basic test for the backpack listing.
+Tests cursor pagination and the maintained item counter.
+"""
+
+import sys
+import os
+import tempfile
+from datetime import datetime, timezone, timedelta
+sys.path.insert(0, '.')
+
+# Set environment variables
+os.environ.setdefault('SECRET_KEY', 'test-key')
+os.environ.setdefault('FRONTEND_URL', 'http://localhost:3000')
+
+def test_backpack_listing():
+    """Test keyset pages, legacy offset paging and the item counter"""
+    from app.models.users import User
+    from app.models.oauth_session import OAuthSession
+    from app.models.backpack import BackpackItem, BackpackCounter
+    from app import create_app, db
+
+    print("Testing backpack listing...")
+
+    test_db_fd, test_db_path = tempfile.mkstemp(suffix='.db')
+
+    try:
+        os.environ['DATABASE_URI'] = f'sqlite:///{test_db_path}'
+
+        app = create_app(debug=True)
+
+        with app.app_context():
+            db.create_all()
+
+            user = User(id='backpack-user', username='user', role='student')
+            other = User(id='backpack-other', username='other', role='student')
+            db.session.add_all([user, other])
+            db.session.add(OAuthSession(
+                id='backpack-session', user_id=user.id, access_token='token',
+                expires_at=datetime.now(timezone.utc) + timedelta(hours=1)
+            ))
+            # Two items share a timestamp: the id breaks the tie
+            start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+            for i in range(7):
+                db.session.add(BackpackItem(
+                    id=f'item-{i}', type='costume', name=f'Kostüm {i}', mime='image/png',
+                    body='b', thumbnail='t', owner_id=user.id,
+                    updated_at=start + timedelta(minutes=min(i, 5))
+                ))
+            db.session.add(BackpackItem(type='sound', name='x', mime='audio/wav', body='b',
+                                        thumbnail='t', owner_id=other.id))
+            db.session.commit()
+
+            client = app.test_client()
+            headers = {'X-Session-ID': 'backpack-session'}
+
+            # Test 1: Cursor pages
+            print("\n[Test 1] Cursor pagination...")
+            seen = []
+            url = '/api/backpack?limit=3'
+            while True:
+                data = client.get(url, headers=headers).get_json()
+                seen += [item['id'] for item in data['items']]
+                if not data['hasMore']:
+                    assert data['nextCursor'] is None
+                    break
+                url = f"/api/backpack?limit=3&cursor={data['nextCursor']}"
+            assert seen == ['item-6', 'item-5', 'item-4', 'item-3', 'item-2', 'item-1', 'item-0']
+            assert 'total' not in data
+            assert client.get('/api/backpack?cursor=bogus', headers=headers).status_code == 400
+            print("✓ Pages are complete and ordered")
+
+            # Test 2: Legacy offset paging
+            data = client.get('/api/backpack?limit=5&offset=5', headers=headers).get_json()
+            assert [item['id'] for item in data['items']] == ['item-1', 'item-0']
+            assert data['hasMore'] is False and data['offset'] == 5
+            print("✓ Offset paging still works")
+
+            # Test 3: Counter
+            print("\n[Test 3] Item counter...")
+            data = client.get('/api/backpack?include_total=true', headers=headers).get_json()
+            assert data['total'] == 7
+            assert db.session.get(BackpackCounter, user.id).item_count == 7
+            client.delete('/api/backpack/item-3', headers=headers)
+            db.session.add(BackpackItem(type='sound', name='y', mime='audio/wav', body='b',
+                                        thumbnail='t', owner_id=user.id))
+            db.session.add(BackpackItem(type='sound', name='z', mime='audio/wav', body='b',
+                                        thumbnail='t', owner_id=user.id))
+            db.session.commit()
+            data = client.get('/api/backpack?include_total=true', headers=headers).get_json()
+            assert data['total'] == 8
+            print("✓ Counter maintained on insert and delete")
+
+            # Test 4: Item inserted between the first count and the counter creation
+            print("\n[Test 4] Counter creation race...")
+            db.session.execute(db.delete(BackpackCounter))
+            db.session.commit()
+            counted = db.session.execute(
+                db.select(db.func.count(BackpackItem.id)).where(BackpackItem.owner_id == user.id)
+            ).scalar()
+            db.session.add(BackpackItem(type='sound', name='w', mime='audio/wav', body='b',
+                                        thumbnail='t', owner_id=user.id))
+            db.session.commit()
+            assert counted == 8
+            assert db.session.execute(
+                db.select(BackpackCounter.item_count).where(BackpackCounter.owner_id == user.id)
+            ).scalar() == 9
+            assert BackpackCounter.get_count(user.id) == 9
+            assert BackpackCounter.get_count(other.id) == 1
+            print("✓ A change without counter row creates it with a fresh count")
+
+            # Test 5: Reading the count leaves the caller's session alone
+            db.session.execute(db.delete(BackpackCounter))
+            db.session.commit()
+            with db.session.no_autoflush:
+                db.session.add(BackpackItem(type='sound', name='v', mime='audio/wav', body='b',
+                                            thumbnail='t', owner_id=user.id))
+                assert BackpackCounter.get_count(user.id) == 9
+            db.session.rollback()
+            assert client.get('/api/backpack?include_total=true', headers=headers).get_json()['total'] == 9
+            print("✓ get_count does not commit the session")
+
+            db.drop_all()
+
+    finally:
+        os.close(test_db_fd)
+        os.unlink(test_db_path)
+
+if __name__ == '__main__':
+    try:
+        test_backpack_listing()
+    except AssertionError as e:
+        print(f"\n✗ Test failed: {e}")
+        sys.exit(1)
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Basic test for the structural commit diff.
+Tests the diff of two project.json files and the cached endpoint.
+"""
+
+import sys
+import os
+import json
+import shutil
+import tempfile
+import zipfile
+from datetime import datetime, timezone, timedelta
+sys.path.insert(0, '.')
+
+# Set environment variables
+os.environ.setdefault('SECRET_KEY', 'test-key')
+os.environ.setdefault('FRONTEND_URL', 'http://localhost:3000')
+
+OLD_PROJECT = {
+    'targets': [
+        {'isStage': True, 'name': 'Stage', 'blocks': {}, 'costumes': [{'name': 'bg', 'assetId': 'a1'}], 'sounds': []},
+        {
+            'isStage': False, 'name': 'Katze',
+            'costumes': [{'name': 'c1', 'assetId': 'b1'}, {'name': 'c2', 'assetId': 'b2'}],
+            'sounds': [{'name': 'Miau', 'assetId': 's1'}],
+            'blocks': {
+                'hat': {'opcode': 'event_whenflagclicked', 'next': 'move', 'parent': None, 'topLevel': True},
+                'move': {'opcode': 'motion_movesteps', 'next': None, 'parent': 'hat',
+                         'inputs': {'STEPS': [1, [4, '10']]}},
+                'hat2': {'opcode': 'event_whenkeypressed', 'next': None, 'parent': None, 'topLevel': True},
+            }
+        },
+        {'isStage': False, 'name': 'Hund', 'blocks': {}, 'costumes': [], 'sounds': []},
+    ]
+}
+
+NEW_PROJECT = {
+    'targets': [
+        {'isStage': True, 'name': 'Stage', 'blocks': {}, 'costumes': [{'name': 'bg', 'assetId': 'a1'}], 'sounds': []},
+        {
+            'isStage': False, 'name': 'Katze',
+            'costumes': [{'name': 'c1', 'assetId': 'b9'}, {'name': 'c3', 'assetId': 'b3'}],
+            'sounds': [{'name': 'Miau', 'assetId': 's1'}],
+            'blocks': {
+                'hat': {'opcode': 'event_whenflagclicked', 'next': 'move', 'parent': None, 'topLevel': True},
+                'move': {'opcode': 'motion_movesteps', 'next': 'turn', 'parent': 'hat',
+                         'inputs': {'STEPS': [1, [4, '20']]}},
+                'turn': {'opcode': 'motion_turnright', 'next': None, 'parent': 'move'},
+                'hat2': {'opcode': 'event_whenkeypressed', 'next': None, 'parent': None, 'topLevel': True},
+            }
+        },
+        {'isStage': False, 'name': 'Vogel', 'blocks': {
+            'fly': {'opcode': 'event_whenflagclicked', 'next': None, 'parent': None, 'topLevel': True}
+        }, 'costumes': [], 'sounds': []},
+    ]
+}
+
+def _write_sb3(path, project_json):
+    with zipfile.ZipFile(path, 'w') as archive:
+        archive.writestr('project.json', json.dumps(project_json))
+
+def test_commit_diff():
+    """Test diff contents, the endpoint and its cache"""
+    from app.models.users import User
+    from app.models.oauth_session import OAuthSession
+    from app.models.projects import Project, CollaborativeProject, Commit
+    from app.models.project_content import CommitDiff
+    from app.utils.project_diff import diff_projects
+    from app import create_app, db
+
+    print("Testing commit diff...")
+
+    test_db_fd, test_db_path = tempfile.mkstemp(suffix='.db')
+    upload_folder = tempfile.mkdtemp()
+
+    try:
+        os.environ['DATABASE_URI'] = f'sqlite:///{test_db_path}'
+
+        # Test 1: Pure diff
+        print("\n[Test 1] Structural diff...")
+        diff = diff_projects(OLD_PROJECT, NEW_PROJECT)
+        assert diff['summary'] == {
+            'sprites_added': 1, 'sprites_removed': 1, 'sprites_changed': 1,
+            'costumes_added': 1, 'costumes_removed': 1, 'costumes_changed': 1,
+            'sounds_added': 0, 'sounds_removed': 0, 'sounds_changed': 0,
+            'scripts_added': 1, 'scripts_removed': 0, 'scripts_changed': 1,
+            'blocks_added': 2, 'blocks_removed': 0, 'blocks_changed': 1,
+        }, diff['summary']
+        katze = next(t for t in diff['targets'] if t['name'] == 'Katze')
+        assert katze['blocks']['added'] == {'motion_turnright': 1}
+        assert 'Stage' not in [t['name'] for t in diff['targets']]
+        print("✓ Sprites, costumes, scripts and blocks compared")
+
+        app = create_app(debug=True)
+
+        with app.app_context():
+            db.create_all()
+
+            owner = User(id='diff-owner', username='owner', role='student')
+            collab = CollaborativeProject(name='Zoo', created_by=owner.id)
+            db.session.add_all([owner, collab])
+            db.session.add(OAuthSession(
+                id='diff-session', user_id=owner.id, access_token='token',
+                expires_at=datetime.now(timezone.utc) + timedelta(hours=1)
+            ))
+            db.session.flush()
+            for number, project_json in ((1, OLD_PROJECT), (2, NEW_PROJECT)):
+                path = os.path.join(upload_folder, f'{number}.sb3')
+                _write_sb3(path, project_json)
+                project = Project(name=f'Zoo - Commit {number}', owner_id=owner.id, sb3_file_path=path)
+                db.session.add(project)
+                db.session.flush()
+                db.session.add(Commit(project_id=project.id, collaborative_project_id=collab.id,
+                                      commit_number=number, committed_by=owner.id))
+            db.session.commit()
+
+            # Test 2: Endpoint caches the diff per commit pair
+            print("\n[Test 2] Endpoint and cache...")
+            client = app.test_client()
+            headers = {'X-Session-ID': 'diff-session'}
+            url = f'/api/collaboration/{collab.id}/commits/1/diff/2'
+            response = client.get(url, headers=headers)
+            assert response.status_code == 200
+            assert response.get_json()['summary'] == diff['summary']
+            assert CommitDiff.query.count() == 1
+
+            os.unlink(os.path.join(upload_folder, '1.sb3'))  # Served from the cache now
+            response = client.get(url + '?summary_only=true', headers=headers)
+            assert response.status_code == 200 and 'targets' not in response.get_json()
+            summary_etag = response.headers['ETag']
+            assert client.get(url + '?summary_only=true',
+                              headers={**headers, 'If-None-Match': summary_etag}).status_code == 304
+            full = client.get(url, headers={**headers, 'If-None-Match': summary_etag})
+            assert full.status_code == 200 and 'targets' in full.get_json()
+            assert full.headers['ETag'] != summary_etag
+            assert client.get(url, headers={**headers, 'If-None-Match': full.headers['ETag']}).status_code == 304
+            assert client.get(f'/api/collaboration/{collab.id}/commits/1/diff/9', headers=headers).status_code == 404
+            print("✓ Cached diff served without the files")
+
+            db.drop_all()
+
+    finally:
+        os.close(test_db_fd)
+        os.unlink(test_db_path)
+        shutil.rmtree(upload_folder)
+
+if __name__ == '__main__':
+    try:
+        test_commit_diff()
+    except AssertionError as e:
+        print(f"\n✗ Test failed: {e}")
+        sys.exit(1)
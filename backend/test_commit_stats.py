@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Basic test for per-commit stats.
+Tests computation at commit time, to_dict/roster output and the backfill.
+"""
+
+import sys
+import os
+import json
+import shutil
+import tempfile
+import zipfile
+sys.path.insert(0, '.')
+
+# Set environment variables
+os.environ.setdefault('SECRET_KEY', 'test-key')
+os.environ.setdefault('FRONTEND_URL', 'http://localhost:3000')
+
+def _write_sb3(path):
+    project_json = {
+        'targets': [
+            {'isStage': True, 'name': 'Stage', 'blocks': {}},
+            {
+                'isStage': False, 'name': 'Katze',
+                'blocks': {
+                    'hat': {'opcode': 'event_whenflagclicked', 'topLevel': True, 'next': 'move'},
+                    'move': {'opcode': 'motion_movesteps', 'parent': 'hat'},
+                    'steps': {'opcode': 'math_number', 'shadow': True, 'parent': 'move'},
+                    'reporter': [12, 'Punkte', 'v1', 10, 10]
+                }
+            },
+            {'isStage': False, 'name': 'Hund', 'blocks': {}}
+        ]
+    }
+    with zipfile.ZipFile(path, 'w') as archive:
+        archive.writestr('project.json', json.dumps(project_json))
+        archive.writestr('cat.svg', '<svg/>' * 10)
+        archive.writestr('meow.wav', b'\x00' * 100)
+
+def test_commit_stats():
+    """Test stats on new commits, in listings and from the backfill"""
+    from app.models.users import User
+    from app.models.projects import Project, CollaborativeProject, Commit
+    from app.models.assignments import Assignment, AssignmentSubmission
+    from app.utils.commit_stats import compute_commit_stats, backfill_commit_stats, STATS_COLUMNS
+    from app.utils.project_content import index_project_content
+    from app import create_app, db
+
+    print("Testing commit stats...")
+
+    test_db_fd, test_db_path = tempfile.mkstemp(suffix='.db')
+    upload_folder = tempfile.mkdtemp()
+
+    try:
+        os.environ['DATABASE_URI'] = f'sqlite:///{test_db_path}'
+
+        app = create_app(debug=True)
+
+        with app.app_context():
+            db.create_all()
+
+            sb3_path = os.path.join(upload_folder, 'game.sb3')
+            _write_sb3(sb3_path)
+
+            # Test 1: Computation
+            print("\n[Test 1] Computing stats...")
+            stats = compute_commit_stats(sb3_path)
+            assert len(stats.pop('minhash')) == 512
+            assert stats == {
+                'sb3_size': os.path.getsize(sb3_path), 'asset_count': 2, 'asset_bytes': 160,
+                'sprite_count': 2, 'block_count': 3, 'script_count': 2
+            }, stats
+            assert compute_commit_stats(os.path.join(upload_folder, 'missing.sb3'))['sb3_size'] == 0
+            nested_path = os.path.join(upload_folder, 'nested.sb3')
+            with zipfile.ZipFile(nested_path, 'w') as archive:
+                archive.writestr('project.json', '{"targets": ' + '[' * 100000 + ']' * 100000 + '}')
+            nested = compute_commit_stats(nested_path)
+            assert nested['sb3_size'] > 0 and nested['block_count'] is None and nested['minhash'] == b''
+            source = Commit(**compute_commit_stats(sb3_path))
+            copied = Commit()
+            copied.copy_stats_from(source)
+            for column in STATS_COLUMNS + ('minhash',):
+                assert getattr(copied, column) == getattr(source, column), column
+            assert copied.stats_dict() == source.stats_dict() == {c: getattr(source, c) for c in STATS_COLUMNS}
+            print("✓ Sizes, sprites, blocks and scripts counted")
+
+            # Test 2: Stored at commit time and exposed in to_dict and the roster
+            print("\n[Test 2] Commit time...")
+            student = User(id='stats-student', username='student', role='student')
+            collab = CollaborativeProject(name='Spiel', created_by=student.id)
+            db.session.add_all([student, collab])
+            db.session.flush()
+
+            commits = []
+            for number in (1, 2):
+                project = Project(name=f'Spiel - Commit {number}', owner_id=student.id, sb3_file_path=sb3_path)
+                db.session.add(project)
+                db.session.flush()
+                commit = Commit(project_id=project.id, collaborative_project_id=collab.id,
+                                commit_number=number, committed_by=student.id)
+                db.session.add(commit)
+                commits.append(commit)
+            index_project_content(commits[0].project_id, sb3_path, commit=commits[0])
+            db.session.commit()
+
+            assert commits[0].to_dict()['stats'] == stats
+            assert commits[1].to_dict()['stats'] is None
+
+            assignment = Assignment(name='Spiel bauen')
+            db.session.add(assignment)
+            db.session.flush()
+            db.session.add(AssignmentSubmission(assignment_id=assignment.id, user_id=student.id,
+                                                collaborative_project_id=collab.id,
+                                                submitted_commit_id=commits[0].project_id))
+            db.session.commit()
+            rows, total = assignment.get_roster()
+            assert total == 1 and rows[0]['block_count'] == 3
+            print("✓ Stats stored on the commit and listed in the roster")
+
+            # Test 3: Backfill in a process pool
+            print("\n[Test 3] Backfill...")
+            assert backfill_commit_stats(workers=1) == 1
+            db.session.expire_all()
+            assert db.session.get(Commit, commits[1].id).stats_dict() == stats
+            assert backfill_commit_stats(workers=1) == 0
+            print("✓ Missing stats backfilled")
+
+            db.drop_all()
+
+    finally:
+        os.close(test_db_fd)
+        os.unlink(test_db_path)
+        shutil.rmtree(upload_folder, ignore_errors=True)
+
+if __name__ == '__main__':
+    try:
+        test_commit_stats()
+    except AssertionError as e:
+        print(f"\n✗ Test failed: {e}")
+        sys.exit(1)
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Basic test for response compression.
+Tests buffered and streamed JSON responses and the pass-through cases.
+"""
+
+import sys
+import os
+import gzip
+import json
+import zlib
+import tempfile
+sys.path.insert(0, '.')
+
+# Set environment variables
+os.environ.setdefault('SECRET_KEY', 'test-key')
+os.environ.setdefault('FRONTEND_URL', 'http://localhost:3000')
+
+def test_compression():
+    """Test which responses are gzipped"""
+    from flask import jsonify, Response
+    from app.utils.json_stream import stream_json_response
+    from app import create_app, db
+
+    print("Testing response compression...")
+
+    test_db_fd, test_db_path = tempfile.mkstemp(suffix='.db')
+
+    try:
+        os.environ['DATABASE_URI'] = f'sqlite:///{test_db_path}'
+
+        app = create_app(debug=True)
+        rows = [{'id': i, 'name': f'Projekt {i}', 'owner': 'student'} for i in range(500)]
+
+        @app.route('/test/large')
+        def large():
+            return jsonify({'projects': rows})
+
+        @app.route('/test/small')
+        def small():
+            return jsonify({'success': True})
+
+        @app.route('/test/stream')
+        def stream():
+            return Response((json.dumps(row) + '\n' for row in rows), mimetype='application/json')
+
+        produced = []
+
+        @app.route('/test/listing')
+        def listing():
+            def items():
+                for row in rows * 20:
+                    produced.append(row['id'])
+                    yield row
+            return stream_json_response('projects', items())
+
+        @app.route('/test/zip')
+        def archive():
+            return Response(b'PK' * 5000, mimetype='application/zip')
+
+        client = app.test_client()
+        accept = {'Accept-Encoding': 'gzip, br'}
+
+        # Test 1: Large JSON is compressed
+        print("\n[Test 1] Buffered JSON...")
+        response = client.get('/test/large', headers=accept)
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert 'Accept-Encoding' in response.headers['Vary']
+        assert json.loads(gzip.decompress(response.data)) == {'projects': rows}
+        assert int(response.headers['Content-Length']) == len(response.data)
+        assert 'Content-Encoding' not in client.get('/test/large').headers
+        print("✓ Large JSON gzipped only if accepted")
+
+        # Test 2: Streamed JSON is compressed on the fly
+        print("\n[Test 2] Streamed JSON...")
+        response = client.get('/test/stream', headers=accept)
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert 'Content-Length' not in response.headers
+        lines = gzip.decompress(response.data).decode().splitlines()
+        assert [json.loads(line) for line in lines] == rows
+        print("✓ Streamed body compressed chunk by chunk")
+
+        # Test 3: First rows are decodable before the listing is generated
+        print("\n[Test 3] Incremental output...")
+        response = client.get('/test/listing', headers=accept, buffered=False)
+        decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        text = ''
+        for chunk in response.response:
+            text += decompressor.decompress(chunk).decode()
+            if '"Projekt 0"' in text:
+                break
+        assert '"Projekt 0"' in text
+        assert len(produced) < len(rows) * 20, len(produced)
+        response.close()
+        print("✓ Sync-flushed while the rows are still produced")
+
+        # Test 4: Small and binary responses pass through
+        print("\n[Test 4] Pass-through...")
+        assert 'Content-Encoding' not in client.get('/test/small', headers=accept).headers
+        response = client.get('/test/zip', headers=accept)
+        assert 'Content-Encoding' not in response.headers and response.data == b'PK' * 5000
+
+        app.config['RESPONSE_COMPRESSION_LEVEL'] = 0
+        assert 'Content-Encoding' not in client.get('/test/large', headers=accept).headers
+        print("✓ Small, binary and disabled cases untouched")
+
+    finally:
+        os.close(test_db_fd)
+        os.unlink(test_db_path)
+
+if __name__ == '__main__':
+    try:
+        test_compression()
+    except AssertionError as e:
+        print(f"\n✗ Test failed: {e}")
+        sys.exit(1)
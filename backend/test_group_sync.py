@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Basic test for OAuth group synchronization.
+Tests that login only writes the difference against existing memberships.
+"""
+
+import sys
+import os
+import tempfile
+sys.path.insert(0, '.')
+
+# Set environment variables
+os.environ.setdefault('SECRET_KEY', 'test-key')
+os.environ.setdefault('FRONTEND_URL', 'http://localhost:3000')
+
+def _groups_payload(*groups):
+    """Build a user_data dict the way the OAuth provider sends groups"""
+    return {
+        'groups': {
+            str(i): {'act': act, 'name': name}
+            for i, (act, name) in enumerate(groups)
+        }
+    }
+
+def test_group_sync_diff():
+    """Test that group sync inserts/deletes only changed memberships"""
+    from app.models.oauth_session import OAuthSession
+    from app.models.users import User, user_groups
+    from app.models.groups import Group
+    from app import create_app, db
+    from sqlalchemy import event
+
+    print("Testing group sync...")
+
+    test_db_fd, test_db_path = tempfile.mkstemp(suffix='.db')
+
+    try:
+        os.environ['DATABASE_URI'] = f'sqlite:///{test_db_path}'
+
+        app = create_app(debug=True)
+
+        with app.app_context():
+            db.create_all()
+
+            user = User(id='sync-user-1', username='syncuser')
+            db.session.add(user)
+            db.session.commit()
+
+            # Test 1: Initial sync creates groups and memberships
+            print("\n[Test 1] Initial sync...")
+            OAuthSession._sync_groups(user, _groups_payload(('class-5a', '5a'), ('class-5b', '5b')))
+            db.session.commit()
+
+            assert sorted(g.external_id for g in user.groups) == ['class-5a', 'class-5b']
+            print("✓ Groups and memberships created")
+
+            joined_at = db.session.execute(
+                db.select(user_groups.c.joined_at).where(
+                    user_groups.c.user_id == user.id,
+                    user_groups.c.group_id == Group.query.filter_by(external_id='class-5a').first().id
+                )
+            ).scalar()
+
+            # Test 2: Second sync keeps unchanged rows, removes and adds only the diff
+            print("\n[Test 2] Diff sync...")
+            OAuthSession._sync_groups(user, _groups_payload(('class-5a', '5a renamed'), ('class-6c', '6c')))
+            db.session.commit()
+
+            assert sorted(g.external_id for g in user.groups) == ['class-5a', 'class-6c']
+            joined_at_after = db.session.execute(
+                db.select(user_groups.c.joined_at).where(
+                    user_groups.c.user_id == user.id,
+                    user_groups.c.group_id == Group.query.filter_by(external_id='class-5a').first().id
+                )
+            ).scalar()
+            assert joined_at == joined_at_after, "Unchanged membership should not be rewritten"
+            print("✓ Only changed memberships were written")
+
+            # Test 3: Group names follow the provider, removed groups survive
+            print("\n[Test 3] Group upsert...")
+            assert Group.query.filter_by(external_id='class-5a').first().name == '5a renamed'
+            assert Group.query.filter_by(external_id='class-5b').first() is not None
+            assert Group.query.count() == 3
+
+            statements = []
+
+            def record(conn, cursor, statement, *args):
+                statements.append(statement)
+
+            event.listen(db.engine, 'before_cursor_execute', record)
+            try:
+                ids = Group.upsert_many({'class-6c': '6c', 'class-5a': '5a renamed'})
+                renamed = Group.upsert_many({'class-6c': '6c neu', 'class-7d': '7d'})
+            finally:
+                event.remove(db.engine, 'before_cursor_execute', record)
+            db.session.commit()
+            assert set(ids) == {'class-5a', 'class-6c'}
+            assert not any(s.startswith(('INSERT', 'UPDATE')) for s in statements[:2])
+            assert not any('DO UPDATE' in s for s in statements)
+            assert Group.query.filter_by(external_id='class-6c').first().name == '6c neu'
+            assert set(renamed) == {'class-6c', 'class-7d'} and Group.query.count() == 4
+            print("✓ Groups upserted by external_id, unchanged rows not written")
+
+            db.drop_all()
+
+    finally:
+        os.close(test_db_fd)
+        os.unlink(test_db_path)
+
+if __name__ == '__main__':
+    try:
+        test_group_sync_diff()
+    except AssertionError as e:
+        print(f"\n✗ Test failed: {e}")
+        sys.exit(1)
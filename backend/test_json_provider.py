@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Basic test for the JSON provider and ?fields= on listings.
+Tests orjson encoding of datetimes and request bodies, and that
+unrequested relationships are neither returned nor loaded.
+"""
+
+import sys
+import os
+import tempfile
+from decimal import Decimal
+from datetime import datetime, timezone, timedelta
+sys.path.insert(0, '.')
+
+# Set environment variables
+os.environ.setdefault('SECRET_KEY', 'test-key')
+os.environ.setdefault('FRONTEND_URL', 'http://localhost:3000')
+
+def test_json_provider():
+    """Test the orjson provider and field selection"""
+    from app.models.users import User
+    from app.models.oauth_session import OAuthSession
+    from app.models.projects import Project, CollaborativeProject, Commit
+    from app.models.assignments import Assignment, AssignmentSubmission
+    from app.utils.json_provider import OrjsonProvider
+    from app import create_app, db
+    from sqlalchemy import event
+
+    print("Testing JSON provider...")
+
+    test_db_fd, test_db_path = tempfile.mkstemp(suffix='.db')
+
+    try:
+        os.environ['DATABASE_URI'] = f'sqlite:///{test_db_path}'
+
+        app = create_app(debug=True)
+
+        with app.app_context():
+            db.create_all()
+
+            # Test 1: Encoding
+            print("\n[Test 1] Encoding...")
+            assert isinstance(app.json, OrjsonProvider)
+            naive = datetime(2024, 1, 15, 10, 30)
+            assert app.json.dumps({'at': naive}) == '{"at":"2024-01-15T10:30:00Z"}'
+            assert app.json.dumps({'at': naive.replace(tzinfo=timezone.utc)}) == '{"at":"2024-01-15T10:30:00Z"}'
+            assert app.json.loads(app.json.dumps({1: Decimal('1.50')})) == {'1': '1.50'}
+            assert app.json.dumps({'b': 1, 'a': 2}, sort_keys=True) == '{"a": 2, "b": 1}'
+            print("✓ Datetimes as ISO UTC, stdlib semantics for extra options")
+
+            # Test 2: Request bodies and responses
+            print("\n[Test 2] Requests...")
+            user = User(id='json-user', username='lehrer', role='teacher')
+            db.session.add(user)
+            db.session.add(OAuthSession(
+                id='json-session', user_id=user.id, access_token='token',
+                expires_at=datetime.now(timezone.utc) + timedelta(hours=1)
+            ))
+            collab = CollaborativeProject(name='Spiel', created_by=user.id)
+            assignment = Assignment(name='Spiel bauen', organizers=[user])
+            db.session.add_all([collab, assignment])
+            db.session.flush()
+            for number in (1, 2, 3):
+                project = Project(name=f'Spiel - Commit {number}', owner_id=user.id)
+                db.session.add(project)
+                db.session.flush()
+                db.session.add(Commit(project_id=project.id, collaborative_project_id=collab.id,
+                                      commit_number=number, committed_by=user.id))
+            db.session.add(AssignmentSubmission(assignment_id=assignment.id, user_id=user.id,
+                                                collaborative_project_id=collab.id))
+            db.session.commit()
+
+            client = app.test_client()
+            headers = {'X-Session-ID': 'json-session'}
+            response = client.post('/api/assets/missing', headers=headers, json={'assetIds': ['abc.svg']})
+            assert response.get_json()['missing'] == ['abc.svg']
+            assert client.post('/api/assets/missing', headers=headers, data='{broken',
+                               content_type='application/json').status_code == 400
+            print("✓ Bodies parsed and responses encoded by orjson")
+
+            # Test 3: Field selection
+            print("\n[Test 3] ?fields=...")
+            data = client.get('/api/assignments?fields=id,name', headers=headers).get_json()
+            assert data['assignments'] == [{'id': assignment.id, 'name': 'Spiel bauen'}]
+            full = client.get('/api/assignments', headers=headers).get_json()['assignments'][0]
+            assert full['organizers'][0]['username'] == 'lehrer' and 'statistics' in full
+
+            data = client.get(f'/api/assignments/{assignment.id}/submissions?fields=id,user',
+                              headers=headers).get_json()
+            assert data['submissions'] == [{'id': 1, 'user': {'id': user.id, 'username': 'lehrer'}}]
+
+            projects = client.get('/api/projects/owned?fields=id,last_edited_at', headers=headers).get_json()['projects']
+            assert [set(p) for p in projects] == [{'id', 'last_edited_at'}]
+
+            statements = []
+
+            def count(conn, cursor, statement, *args):
+                statements.append(statement)
+
+            db.session.expire_all()
+            event.listen(db.engine, 'before_cursor_execute', count)
+            try:
+                commits = client.get(f'/api/collaboration/{collab.id}/commits?fields=id,commit_number',
+                                     headers=headers).get_json()['commits']
+            finally:
+                event.remove(db.engine, 'before_cursor_execute', count)
+            assert commits == [{'id': 3, 'commit_number': 3}, {'id': 2, 'commit_number': 2},
+                               {'id': 1, 'commit_number': 1}]
+            assert not any('FROM projects' in s and 'projects.id = ?' in s for s in statements)
+            full = client.get(f'/api/collaboration/{collab.id}/commits', headers=headers).get_json()['commits']
+            assert full[0]['committed_by'] == 'lehrer' and 'thumbnail_url' in full[0]
+            print("✓ Only requested fields returned, skipped lookups not queried")
+
+            db.drop_all()
+
+    finally:
+        os.close(test_db_fd)
+        os.unlink(test_db_path)
+
+if __name__ == '__main__':
+    try:
+        test_json_provider()
+    except AssertionError as e:
+        print(f"\n✗ Test failed: {e}")
+        sys.exit(1)
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Basic test for streamed JSON listings.
+Tests the stream helper and the admin-scale endpoints across several
+cursor batches, with and without gzip.
+"""
+
+import sys
+import os
+import gzip
+import json
+import tempfile
+from datetime import datetime, timezone, timedelta
+sys.path.insert(0, '.')
+
+# Set environment variables
+os.environ.setdefault('SECRET_KEY', 'test-key')
+os.environ.setdefault('FRONTEND_URL', 'http://localhost:3000')
+
+def test_json_stream():
+    """Test streamed students, groups and student projects"""
+    from app.models.users import User
+    from app.models.groups import Group
+    from app.models.oauth_session import OAuthSession
+    from app.models.projects import Project, CollaborativeProject
+    from app.utils import json_stream
+    from app.utils.json_stream import stream_json_response
+    from app import create_app, db
+
+    print("Testing streamed JSON...")
+
+    test_db_fd, test_db_path = tempfile.mkstemp(suffix='.db')
+
+    try:
+        os.environ['DATABASE_URI'] = f'sqlite:///{test_db_path}'
+
+        app = create_app(debug=True)
+
+        with app.app_context():
+            db.create_all()
+
+            # Test 1: Helper output is valid JSON for empty, short and chunked arrays
+            print("\n[Test 1] Helper...")
+            for size in (0, 1, 100, 101, 250):
+                with app.test_request_context():
+                    response = stream_json_response('items', iter(range(size)), head={'a': 1},
+                                                    tail=lambda count: {'count': count})
+                    assert response.is_streamed
+                    data = json.loads(response.get_data())
+                assert data == {'a': 1, 'items': list(range(size)), 'count': size}
+            with app.test_request_context():
+                assert json.loads(stream_json_response('items', iter([])).get_data()) == {'items': []}
+            print("✓ Head, array and tail keys")
+
+            admin = User(id='stream-admin', username='admin', role='admin')
+            student = User(id='stream-student', username='aaa', role='student')
+            users = [User(id=f'stream-{i:04d}', username=f'user{i:04d}', role='student') for i in range(1200)]
+            groups = [Group(name=f'Klasse {i:03d}', external_id=f'stream-{i}') for i in range(700)]
+            db.session.add_all([admin, student] + users + groups)
+            db.session.flush()
+            db.session.add_all([Project(name=f'Projekt {i}', owner_id=student.id) for i in range(30)])
+            db.session.add_all([CollaborativeProject(name=f'Spiel {i}', created_by=student.id) for i in range(20)])
+            db.session.add(OAuthSession(
+                id='stream-session', user_id=admin.id, access_token='token',
+                expires_at=datetime.now(timezone.utc) + timedelta(hours=1)
+            ))
+            db.session.commit()
+
+            client = app.test_client()
+            headers = {'X-Session-ID': 'stream-session'}
+
+            # Test 2: All students for admins, fetched in several batches
+            print("\n[Test 2] Students...")
+            response = client.get('/api/teacher/students', headers=headers)
+            assert response.is_streamed
+            data = response.get_json()
+            assert data['count'] == 1202 and data['hasMore'] is False and data['nextCursor'] is None
+            assert [s['username'] for s in data['students'][:2]] == ['aaa', 'admin']
+            assert data['students'][0]['project_count'] == 50
+            paged = client.get('/api/teacher/students?limit=2', headers=headers).get_json()
+            assert paged['hasMore'] is True and len(paged['students']) == 2
+            print("✓ Streamed, same body as before; pages still buffered")
+
+            # Test 3: Groups, gzip-compressed while streaming
+            print("\n[Test 3] Groups...")
+            response = client.get('/api/groups', headers={**headers, 'Accept-Encoding': 'gzip'})
+            assert response.headers['Content-Encoding'] == 'gzip'
+            names = [g['name'] for g in json.loads(gzip.decompress(response.get_data()))['groups']]
+            assert names == sorted(names) and len(names) == 700
+            print("✓ Groups streamed and compressed incrementally")
+
+            # Test 4: Unpaged student projects loaded batch by batch
+            print("\n[Test 4] Student projects...")
+            yield_per, json_stream.YIELD_PER = json_stream.YIELD_PER, 7
+            try:
+                data = client.get(f'/api/teacher/students/{student.id}/projects', headers=headers).get_json()
+            finally:
+                json_stream.YIELD_PER = yield_per
+            assert data['success'] is True and data['student']['username'] == 'aaa'
+            assert len(data['projects']) == 50
+            assert len({(p['project_type'], p['id']) for p in data['projects']}) == 50
+            edited = [p['last_edited_at'] for p in data['projects']]
+            assert edited == sorted(edited, reverse=True)
+            page = client.get(f'/api/teacher/students/{student.id}/projects?limit=10&offset=45',
+                              headers=headers).get_json()
+            assert page['total'] == 50 and len(page['projects']) == 5 and page['hasMore'] is False
+            print("✓ Order kept across batches, paging unchanged")
+
+            db.drop_all()
+
+    finally:
+        os.close(test_db_fd)
+        os.unlink(test_db_path)
+
+if __name__ == '__main__':
+    try:
+        test_json_stream()
+    except AssertionError as e:
+        print(f"\n✗ Test failed: {e}")
+        sys.exit(1)
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Basic test for the JWKS cache.
+Tests TTL hits and refetches, the forced refresh on an unknown key ID and
+the userinfo fallback of the OAuth callback.
+"""
+
+import sys
+import os
+import time
+import tempfile
+sys.path.insert(0, '.')
+
+# Set environment variables
+os.environ.setdefault('SECRET_KEY', 'test-key')
+os.environ.setdefault('FRONTEND_URL', 'http://localhost:3000')
+os.environ.setdefault('OAUTH_CLIENT_ID', 'test-client')
+os.environ.setdefault('OAUTH_JWKS_URI', 'https://login.example.org/jwks')
+
+class _Response:
+    def __init__(self, data):
+        self.data = data
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.data
+
+def test_jwks_cache():
+    """Test the cache, the OAuth client's key lookup and the callback"""
+    from joserfc import jwt
+    from joserfc.jwk import RSAKey
+    from app.models.users import User
+    from app.models.oauth_session import OAuthSession
+    from app.utils import jwks_cache as jwks_module
+    from app.utils.jwks_cache import JWKSCache
+    from app import create_app, db, oauth
+
+    print("Testing JWKS cache...")
+
+    old_key = RSAKey.generate_key(2048, parameters={'kid': 'old'})
+    new_key = RSAKey.generate_key(2048, parameters={'kid': 'new'})
+    key_sets = [
+        {'keys': [old_key.as_dict(private=False)]},
+        {'keys': [old_key.as_dict(private=False), new_key.as_dict(private=False)]}
+    ]
+    fetched = []
+
+    def fake_get(url, timeout=None):
+        fetched.append(url)
+        return _Response(key_sets[min(len(fetched), len(key_sets)) - 1])
+
+    real_get = jwks_module.requests.get
+    jwks_module.requests.get = fake_get
+
+    test_db_fd, test_db_path = tempfile.mkstemp(suffix='.db')
+
+    try:
+        # Test 1: TTL hit and refetch
+        print("\n[Test 1] TTL...")
+        cache = JWKSCache('https://login.example.org/jwks', ttl=3600, min_refresh_interval=60)
+        assert cache.get() == key_sets[0]
+        assert cache.get() == key_sets[0] and len(fetched) == 1
+        cache._fetched_at = time.monotonic() - 3601
+        assert cache.get() == key_sets[1] and len(fetched) == 2
+        print("✓ Served from memory until the TTL expires")
+
+        # Test 2: Forced refreshes are rate limited
+        print("\n[Test 2] Forced refresh...")
+        assert cache.get(force=True) == key_sets[1] and len(fetched) == 2
+        cache._fetched_at = time.monotonic() - 61
+        cache.get(force=True)
+        assert len(fetched) == 3
+        jwks_module.requests.get = lambda url, timeout=None: 1 / 0
+        cache._fetched_at = 0.0
+        assert cache.get() == key_sets[1]
+        jwks_module.requests.get = fake_get
+        print("✓ At most one forced fetch per interval, stale keys kept on errors")
+
+        os.environ['DATABASE_URI'] = f'sqlite:///{test_db_path}'
+        app = create_app(debug=True)
+
+        with app.app_context():
+            db.create_all()
+
+            # Test 3: Unknown kid in an ID token forces a refresh of the shared cache
+            print("\n[Test 3] Unknown key ID...")
+            del fetched[:]
+            provider = oauth.oauth_provider
+            assert provider.fetch_jwk_set() == key_sets[0] and len(fetched) == 1
+            now = int(time.time())
+            claims = {'iss': 'https://login.example.org', 'sub': 'jwks-user', 'aud': 'test-client',
+                      'iat': now, 'exp': now + 300, 'nonce': 'n'}
+            id_token = jwt.encode({'alg': 'RS256', 'kid': 'new'}, claims, new_key)
+            # Key rotated a while after the last fetch
+            jwks_module.jwks_cache._fetched_at -= 61
+            user_info = provider.parse_id_token({'id_token': id_token, 'access_token': 'a'}, nonce='n')
+            assert user_info['sub'] == 'jwks-user'
+            assert len(fetched) == 2
+            provider.parse_id_token({'id_token': id_token, 'access_token': 'a'}, nonce='n')
+            assert len(fetched) == 2
+            print("✓ Refetched once, then verified from the cache")
+
+            # Test 4: Callback asks the userinfo endpoint only without the groups claim
+            print("\n[Test 4] Userinfo fallback...")
+            groups = {'1': {'act': 'klasse-5a', 'name': 'Klasse 5a'}}
+            userinfo_calls = []
+
+            def callback(id_claims, remote_info):
+                provider.authorize_access_token = lambda: {
+                    'access_token': 'a', 'expires_in': 3600, 'userinfo': id_claims
+                }
+
+                def userinfo(token=None):
+                    userinfo_calls.append(token)
+                    return remote_info
+                provider.userinfo = userinfo
+
+                client = app.test_client()
+                client.set_cookie('oauth_state', 's')
+                response = client.get('/authorize?state=s')
+                assert response.status_code == 302
+                return response.headers['Location']
+
+            try:
+                location = callback({'sub': 'with-groups', 'preferred_username': 'anna', 'groups': groups},
+                                    {'groups': {}})
+                assert 'session_id=' in location and userinfo_calls == []
+
+                location = callback({'sub': 'without-groups', 'preferred_username': 'ben'},
+                                    {'groups': groups, 'email': 'ben@example.org'})
+                assert 'session_id=' in location and len(userinfo_calls) == 1
+            finally:
+                del provider.authorize_access_token
+                del provider.userinfo
+
+            ben = db.session.get(User, 'without-groups')
+            assert ben.email == 'ben@example.org'
+            assert [group.external_id for group in ben.groups] == ['klasse-5a']
+            assert [group.external_id for group in db.session.get(User, 'with-groups').groups] == ['klasse-5a']
+            assert OAuthSession.query.count() == 2
+            print("✓ Groups from the ID token, userinfo merged in when missing")
+
+            db.drop_all()
+
+    finally:
+        jwks_module.requests.get = real_get
+        os.close(test_db_fd)
+        os.unlink(test_db_path)
+
+if __name__ == '__main__':
+    try:
+        test_jwks_cache()
+    except AssertionError as e:
+        print(f"\n✗ Test failed: {e}")
+        sys.exit(1)
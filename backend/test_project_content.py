@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Basic test for the project content index.
+Tests extraction from project.json and the teacher content search.
+"""
+
+import sys
+import os
+import json
+import shutil
+import tempfile
+import zipfile
+from datetime import datetime, timezone, timedelta
+sys.path.insert(0, '.')
+
+# Set environment variables
+os.environ.setdefault('SECRET_KEY', 'test-key')
+os.environ.setdefault('FRONTEND_URL', 'http://localhost:3000')
+
+def _write_sb3(path, opcodes, sprite):
+    project_json = {
+        'extensions': ['pen'] if 'pen_clear' in opcodes else [],
+        'targets': [
+            {'isStage': True, 'name': 'Stage', 'variables': {'v1': ['Punkte', 0]}, 'lists': {}, 'blocks': {}},
+            {
+                'isStage': False, 'name': sprite,
+                'variables': {}, 'lists': {'l1': ['Gegner', []]},
+                'blocks': dict(
+                    [(f'b{i}', {'opcode': opcode, 'shadow': False}) for i, opcode in enumerate(opcodes)]
+                    + [('menu', {'opcode': 'control_create_clone_of_menu', 'shadow': True}),
+                       ('reporter', [12, 'Punkte', 'v1', 10, 10])]
+                )
+            }
+        ]
+    }
+    with zipfile.ZipFile(path, 'w') as archive:
+        archive.writestr('project.json', json.dumps(project_json))
+
+def test_project_content():
+    """Test content extraction, copying and the content search endpoint"""
+    from app.models.users import User
+    from app.models.oauth_session import OAuthSession
+    from app.models.projects import Project, CollaborativeProject, Commit
+    from app.models.project_content import ProjectContentItem, ProjectContentIndex
+    from app.utils import project_content
+    from app.utils.project_content import (
+        index_project_content, copy_project_content, index_missing_project_content, content_filter
+    )
+    from app import create_app, db
+
+    print("Testing project content index...")
+
+    test_db_fd, test_db_path = tempfile.mkstemp(suffix='.db')
+    upload_folder = tempfile.mkdtemp()
+
+    try:
+        os.environ['DATABASE_URI'] = f'sqlite:///{test_db_path}'
+
+        app = create_app(debug=True)
+
+        with app.app_context():
+            db.create_all()
+
+            teacher = User(id='content-teacher', username='teacher', role='teacher')
+            db.session.add(teacher)
+            db.session.add(OAuthSession(
+                id='content-session', user_id=teacher.id, access_token='token',
+                expires_at=datetime.now(timezone.utc) + timedelta(hours=1)
+            ))
+
+            commits = {}
+            for name, opcodes, sprite in (
+                ('anna', ['control_create_clone_of', 'control_create_clone_of', 'event_whenflagclicked'], 'Katze'),
+                ('ben', ['event_whenflagclicked', 'pen_clear'], 'Stift'),
+            ):
+                student = User(id=f'content-{name}', username=name, role='student')
+                collab = CollaborativeProject(name=f'{name} game', created_by=student.id)
+                db.session.add_all([student, collab])
+                db.session.flush()
+                path = os.path.join(upload_folder, f'{name}.sb3')
+                _write_sb3(path, opcodes, sprite)
+                project = Project(name=f'{name} - Commit 1', owner_id=student.id, sb3_file_path=path)
+                db.session.add(project)
+                db.session.flush()
+                db.session.add(Commit(project_id=project.id, collaborative_project_id=collab.id,
+                                      commit_number=1, committed_by=student.id))
+                collab.latest_commit_id = project.id
+                commits[name] = project
+            db.session.commit()
+
+            # Test 1: Extraction (shadows and top-level reporters are not blocks)
+            print("\n[Test 1] Extraction...")
+            assert index_project_content(commits['anna'].id, commits['anna'].sb3_file_path) == 5
+            db.session.commit()
+            items = {(i.kind, i.name): i.count for i in
+                     ProjectContentItem.query.filter_by(project_id=commits['anna'].id)}
+            assert items == {
+                ('opcode', 'control_create_clone_of'): 2, ('opcode', 'event_whenflagclicked'): 1,
+                ('sprite', 'Katze'): 1, ('variable', 'Punkte'): 1, ('list', 'Gegner'): 1
+            }
+            print("✓ Opcodes, sprites, variables and lists extracted")
+
+            # Test 2: Backfill indexes the rest, copies reuse the index
+            print("\n[Test 2] Backfill and copy...")
+            # A failing commit is recorded and skipped, the batch goes on
+            db.session.execute(db.delete(ProjectContentIndex).where(ProjectContentIndex.project_id == commits['anna'].id))
+            db.session.commit()
+            real_index = project_content.index_project_content
+
+            def failing_index(project_id, sb3_path, commit=None):
+                if project_id == commits['ben'].id:
+                    raise RecursionError('maximum recursion depth exceeded')
+                return real_index(project_id, sb3_path, commit)
+
+            project_content.index_project_content = failing_index
+            try:
+                assert index_missing_project_content() == 2
+            finally:
+                project_content.index_project_content = real_index
+            assert 'recursion' in db.session.get(ProjectContentIndex, commits['ben'].id).error
+            assert db.session.get(ProjectContentIndex, commits['anna'].id).error is None
+            assert ProjectContentItem.query.filter_by(project_id=commits['anna'].id).count() == 5
+            assert index_missing_project_content() == 0
+            db.session.execute(db.delete(ProjectContentIndex).where(ProjectContentIndex.project_id == commits['ben'].id))
+            db.session.commit()
+            assert index_missing_project_content() == 1
+            assert index_missing_project_content() == 0
+            copy = Project(name='copy', owner_id='content-anna')
+            db.session.add(copy)
+            db.session.flush()
+            assert copy_project_content(commits['ben'].id, [copy.id])
+            db.session.commit()
+            assert ProjectContentItem.query.filter_by(project_id=copy.id).count() == \
+                ProjectContentItem.query.filter_by(project_id=commits['ben'].id).count()
+            print("✓ Existing commits indexed, copy shares the content")
+
+            # Test 3: Teacher search
+            print("\n[Test 3] Content search...")
+            client = app.test_client()
+            headers = {'X-Session-ID': 'content-session'}
+            data = client.get('/api/teacher/content-search?opcode=control_create_clone_of',
+                              headers=headers).get_json()
+            assert [p['owner']['username'] for p in data['projects']] == ['anna']
+            assert data['projects'][0]['opcode_counts'] == {'control_create_clone_of': 2}
+            data = client.get('/api/teacher/content-search?opcode=event_whenflagclicked&extension=pen',
+                              headers=headers).get_json()
+            assert [p['owner']['username'] for p in data['projects']] == ['ben']
+            data = client.get('/api/teacher/content-search?sprite=katze', headers=headers).get_json()
+            assert data['total'] == 1
+            assert client.get('/api/teacher/content-search', headers=headers).status_code == 400
+            item = ProjectContentItem.query.filter_by(project_id=commits['anna'].id, kind='sprite').one()
+            assert (item.name, item.name_lower) == ('Katze', 'katze')
+            assert {i.name_lower for i in ProjectContentItem.query.filter_by(project_id=copy.id)} == \
+                {i.name.lower() for i in ProjectContentItem.query.filter_by(project_id=commits['ben'].id)}
+            sql = str(db.select(content_filter(db.literal(1), 'sprite', 'KATZE')).compile(db.engine))
+            assert 'name_lower' in sql and 'lower(' not in sql.lower()
+            print("✓ Criteria are combined in SQL, names matched on the indexed name_lower")
+
+            db.drop_all()
+
+    finally:
+        os.close(test_db_fd)
+        os.unlink(test_db_path)
+        shutil.rmtree(upload_folder)
+
+if __name__ == '__main__':
+    try:
+        test_project_content()
+    except AssertionError as e:
+        print(f"\n✗ Test failed: {e}")
+        sys.exit(1)
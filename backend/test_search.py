@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Basic test for full-text search.
+Tests incremental indexing and permission filtering.
+"""
+
+import sys
+import os
+import tempfile
+sys.path.insert(0, '.')
+
+# Set environment variables
+os.environ.setdefault('SECRET_KEY', 'test-key')
+os.environ.setdefault('FRONTEND_URL', 'http://localhost:3000')
+
+def test_search():
+    """Test search results for owners, collaborators, students and admins"""
+    from app.models.users import User
+    from app.models.groups import Group
+    from app.models.projects import (
+        Project, CollaborativeProject, CollaborativeProjectPermission, Commit, PermissionLevel
+    )
+    from app.models.assignments import Assignment
+    from app.utils.search_index import ensure_search_index, search
+    from app import create_app, db
+
+    print("Testing full-text search...")
+
+    test_db_fd, test_db_path = tempfile.mkstemp(suffix='.db')
+
+    try:
+        os.environ['DATABASE_URI'] = f'sqlite:///{test_db_path}'
+
+        app = create_app(debug=True)
+
+        with app.app_context():
+            db.create_all()
+
+            owner = User(id='search-owner', username='owner', role='student')
+            friend = User(id='search-friend', username='friend', role='student')
+            stranger = User(id='search-stranger', username='stranger', role='student')
+            admin = User(id='search-admin', username='admin', role='admin')
+            group = Group(name='8a', external_id='search-8a')
+            db.session.add_all([owner, friend, stranger, admin, group])
+            db.session.flush()
+            group.members.append(friend)
+
+            # Indexed before the index exists, picked up by the initial fill
+            maze = CollaborativeProject(name='Labyrinth Spiel', description='Katze sucht den Ausgang',
+                                        created_by=owner.id)
+            db.session.add(maze)
+            db.session.commit()
+            ensure_search_index()
+
+            # Test 1: Owner finds by prefix
+            print("\n[Test 1] Initial fill...")
+            results = search(owner, 'laby')
+            assert [(r['type'], r['id']) for r in results] == [('project', maze.id)]
+            assert search(stranger, 'labyrinth') == []
+            print("✓ Owner finds the project, stranger does not")
+
+            # Test 2: Incremental updates on insert, rename and group permission
+            print("\n[Test 2] Incremental updates...")
+            commit_project = Project(name='Labyrinth - Commit 1', owner_id=owner.id)
+            db.session.add(commit_project)
+            db.session.flush()
+            db.session.add(Commit(project_id=commit_project.id, collaborative_project_id=maze.id,
+                                  commit_number=1, commit_message='Größere Mauern eingebaut',
+                                  committed_by=owner.id))
+            db.session.add(CollaborativeProjectPermission(collaborative_project_id=maze.id,
+                                                          group_id=group.id, permission=PermissionLevel.READ))
+            maze.name = 'Irrgarten'
+            db.session.commit()
+
+            results = search(friend, 'großere mauer')  # ö matches o
+            assert [r['type'] for r in results] == ['commit']
+            assert results[0]['title'] == 'Irrgarten'
+            assert search(owner, 'labyrinth') == []
+            assert [r['id'] for r in search(owner, 'irrgarten')] == [maze.id]
+            print("✓ Commits, renames and group access are reflected")
+
+            # Test 3: Assignments and deletions
+            print("\n[Test 3] Assignments...")
+            assignment = Assignment(name='Irrgarten bauen')
+            db.session.add(assignment)
+            db.session.flush()
+            assignment.assign_to_group(group)
+            db.session.commit()
+            assert [r['type'] for r in search(friend, 'irrgarten', ['assignment'])] == ['assignment']
+            assert search(owner, 'irrgarten', ['assignment']) == []
+            assert len(search(admin, 'irrgarten')) == 2
+
+            maze.soft_delete(owner.id)
+            db.session.delete(assignment)
+            db.session.commit()
+            assert search(admin, 'irrgarten') == []
+            print("✓ Assignment visibility and deletions handled")
+
+            db.drop_all()
+
+    finally:
+        os.close(test_db_fd)
+        os.unlink(test_db_path)
+
+if __name__ == '__main__':
+    try:
+        test_search()
+    except AssertionError as e:
+        print(f"\n✗ Test failed: {e}")
+        sys.exit(1)
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Basic test for the expired session reaper.
+Tests which sessions are deleted, the batch bounds and the run metrics.
+"""
+
+import sys
+import os
+import tempfile
+from datetime import datetime, timezone, timedelta
+sys.path.insert(0, '.')
+
+# Set environment variables
+os.environ.setdefault('SECRET_KEY', 'test-key')
+os.environ.setdefault('FRONTEND_URL', 'http://localhost:3000')
+
+def test_session_reaper():
+    """Test that only sessions past expires_at + grace are reaped"""
+    from app.models.users import User
+    from app.models.oauth_session import OAuthSession
+    from app.utils import metrics
+    from app.utils.session_reaper import reap_expired_sessions
+    from app import create_app, db
+
+    print("Testing session reaper...")
+
+    test_db_fd, test_db_path = tempfile.mkstemp(suffix='.db')
+
+    try:
+        os.environ['DATABASE_URI'] = f'sqlite:///{test_db_path}'
+
+        app = create_app(debug=True)
+
+        with app.app_context():
+            db.create_all()
+
+            user = User(id='reaper-user', username='user', role='student')
+            db.session.add(user)
+            now = datetime.now(timezone.utc)
+            expiries = {
+                'live': now + timedelta(hours=1),
+                'refreshable': now - timedelta(days=1),
+                **{f'expired-{i}': now - timedelta(days=10 + i) for i in range(5)}
+            }
+            for session_id, expires_at in expiries.items():
+                db.session.add(OAuthSession(id=session_id, user_id=user.id, access_token='token',
+                                            expires_at=expires_at))
+            db.session.commit()
+
+            def remaining():
+                return sorted(db.session.execute(db.select(OAuthSession.id)).scalars().all())
+
+            before = metrics.snapshot()['counters']
+
+            # Test 1: Bounded batches
+            print("\n[Test 1] Batch bounds...")
+            assert reap_expired_sessions(grace=timedelta(days=7), batch_size=2, max_batches=2) == 4
+            assert len(remaining()) == 3
+            run = metrics.snapshot()['last_runs']['session_reaper']
+            assert run['deleted'] == 4 and run['batches'] == 2
+            print("✓ At most max_batches * batch_size sessions per run")
+
+            # Test 2: Expired sessions deleted, live and refreshable ones kept
+            print("\n[Test 2] Expired sessions...")
+            assert reap_expired_sessions(grace=timedelta(days=7), batch_size=2) == 1
+            assert remaining() == ['live', 'refreshable']
+            assert reap_expired_sessions(grace=timedelta(days=7)) == 0
+            assert remaining() == ['live', 'refreshable']
+            assert reap_expired_sessions(grace=timedelta(0)) == 1
+            assert remaining() == ['live']
+            print("✓ Sessions within expires_at + grace survive")
+
+            # Test 3: Metrics
+            print("\n[Test 3] Metrics...")
+            after = metrics.snapshot()['counters']
+            for name, delta in (('session_reaper.runs', 4), ('session_reaper.deleted', 6),
+                                ('session_reaper.batches', 4)):
+                assert after.get(name, 0) - before.get(name, 0) == delta, name
+            assert after.get('session_reaper.errors', 0) == before.get('session_reaper.errors', 0)
+            print("✓ Runs, deletions and batches counted")
+
+            db.drop_all()
+
+    finally:
+        os.close(test_db_fd)
+        os.unlink(test_db_path)
+
+if __name__ == '__main__':
+    try:
+        test_session_reaper()
+    except AssertionError as e:
+        print(f"\n✗ Test failed: {e}")
+        sys.exit(1)
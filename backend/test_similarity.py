@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Basic test for submission similarity.
+Tests MinHash signatures, LSH pairing and the similarity endpoint.
+"""
+
+import sys
+import os
+import json
+import shutil
+import tempfile
+import zipfile
+from datetime import datetime, timezone, timedelta
+sys.path.insert(0, '.')
+
+# Set environment variables
+os.environ.setdefault('SECRET_KEY', 'test-key')
+os.environ.setdefault('FRONTEND_URL', 'http://localhost:3000')
+
+def _script(prefix, opcodes):
+    """Blocks of one script: a chain of the given opcodes"""
+    blocks = {}
+    for i, opcode in enumerate(opcodes):
+        blocks[f'{prefix}{i}'] = {
+            'opcode': opcode,
+            'topLevel': i == 0,
+            'parent': f'{prefix}{i - 1}' if i else None,
+            'next': f'{prefix}{i + 1}' if i + 1 < len(opcodes) else None
+        }
+    return blocks
+
+def _project(scripts):
+    blocks = {}
+    for n, opcodes in enumerate(scripts):
+        blocks.update(_script(f's{n}_', opcodes))
+    return {'targets': [{'isStage': False, 'name': 'Katze', 'blocks': blocks}]}
+
+BASE = [
+    ['event_whenflagclicked', 'motion_gotoxy', 'looks_show', 'control_forever', 'motion_movesteps'],
+    ['event_whenkeypressed', 'motion_changexby', 'sound_play', 'looks_nextcostume'],
+    ['control_start_as_clone', 'motion_glideto', 'control_wait', 'control_delete_this_clone'],
+    ['event_whenbroadcastreceived', 'looks_say', 'control_wait', 'looks_hide', 'data_setvariableto'],
+]
+OTHER = [
+    ['event_whenthisspriteclicked', 'pen_clear', 'pen_pendown', 'control_repeat', 'motion_turnright'],
+    ['event_whengreaterthan', 'sensing_askandwait', 'data_addtolist', 'operator_join'],
+]
+
+def test_similarity():
+    """Test signatures and the similar submission pairs of an assignment"""
+    from app.models.users import User
+    from app.models.oauth_session import OAuthSession
+    from app.models.projects import Project, CollaborativeProject, Commit
+    from app.models.assignments import Assignment, AssignmentSubmission
+    from app.utils.similarity import (
+        project_shingles, project_signature, estimate_similarity, similar_pairs, EMPTY_SIGNATURE,
+        _script_opcodes
+    )
+    from app.utils.commit_stats import backfill_commit_stats
+    from app import create_app, db
+
+    print("Testing submission similarity...")
+
+    # Test 1: Signatures
+    print("\n[Test 1] Signatures...")
+    base = project_signature(_project(BASE))
+    copy = project_signature(_project(BASE + [['event_whenflagclicked', 'looks_say']]))
+    other = project_signature(_project(OTHER))
+    assert len(project_shingles(_project(BASE))) == 3 + 2 + 2 + 3
+    assert project_signature(_project(BASE)) == base
+    assert estimate_similarity(base, copy) > 0.6
+    assert estimate_similarity(base, other) < 0.2
+    assert project_signature({'targets': []}) == EMPTY_SIGNATURE
+    pairs = similar_pairs({'base': base, 'copy': copy, 'other': other, 'empty': EMPTY_SIGNATURE, 'broken': b''})
+    assert [(a, b) for a, b, _ in pairs] in ([('base', 'copy')], [('copy', 'base')])
+    print("✓ Near-copies are similar, different projects are not")
+
+    # Nested stacks inline, in execution order, at any depth
+    nested = _project([['event_whenflagclicked', 'control_forever', 'looks_hide']])
+    blocks = nested['targets'][0]['blocks']
+    blocks['s0_1']['inputs'] = {'SUBSTACK': [2, 'inner0']}
+    blocks.update(_script('inner', ['motion_movesteps', 'motion_turnright']))
+    blocks['inner0']['topLevel'] = False
+    assert _script_opcodes(blocks, 's0_0', set()) == [
+        'event_whenflagclicked', 'control_forever', 'motion_movesteps', 'motion_turnright', 'looks_hide'
+    ]
+    deep = _project([['event_whenflagclicked']])
+    blocks = deep['targets'][0]['blocks']
+    parent = 's0_0'
+    for i in range(sys.getrecursionlimit() * 2):
+        blocks[parent]['inputs'] = {'SUBSTACK': [2, f'deep{i}']}
+        blocks[f'deep{i}'] = {'opcode': 'control_if', 'topLevel': False, 'parent': parent, 'next': None}
+        parent = f'deep{i}'
+    assert project_signature(deep) != EMPTY_SIGNATURE
+    print("✓ Deeply nested scripts are walked without recursion")
+
+    test_db_fd, test_db_path = tempfile.mkstemp(suffix='.db')
+    upload_folder = tempfile.mkdtemp()
+
+    try:
+        os.environ['DATABASE_URI'] = f'sqlite:///{test_db_path}'
+
+        app = create_app(debug=True)
+
+        with app.app_context():
+            db.create_all()
+
+            teacher = User(id='sim-teacher', username='teacher', role='teacher')
+            assignment = Assignment(name='Spiel')
+            db.session.add_all([teacher, assignment])
+            db.session.add(OAuthSession(
+                id='sim-session', user_id=teacher.id, access_token='token',
+                expires_at=datetime.now(timezone.utc) + timedelta(hours=1)
+            ))
+            db.session.flush()
+            assignment.add_organizer(teacher)
+
+            for name, scripts in (('anna', BASE), ('ben', BASE + [['event_whenflagclicked', 'looks_say']]),
+                                  ('cem', OTHER)):
+                student = User(id=f'sim-{name}', username=name, role='student')
+                collab = CollaborativeProject(name=f'{name} game', created_by=student.id)
+                db.session.add_all([student, collab])
+                db.session.flush()
+                path = os.path.join(upload_folder, f'{name}.sb3')
+                with zipfile.ZipFile(path, 'w') as archive:
+                    archive.writestr('project.json', json.dumps(_project(scripts)))
+                project = Project(name=f'{name} game - Commit 1', owner_id=student.id, sb3_file_path=path)
+                db.session.add(project)
+                db.session.flush()
+                db.session.add(Commit(project_id=project.id, collaborative_project_id=collab.id,
+                                      commit_number=1, committed_by=student.id))
+                collab.latest_commit_id = project.id
+                db.session.add(AssignmentSubmission(assignment_id=assignment.id, user_id=student.id,
+                                                    collaborative_project_id=collab.id))
+            db.session.commit()
+
+            # Test 2: Endpoint on backfilled signatures
+            print("\n[Test 2] Similarity endpoint...")
+            assert backfill_commit_stats(workers=1) == 3
+
+            client = app.test_client()
+            headers = {'X-Session-ID': 'sim-session'}
+            data = client.get(f'/api/assignments/{assignment.id}/similarity', headers=headers).get_json()
+            assert data['success']
+            assert len(data['pairs']) == 1
+            assert {data['pairs'][0]['a']['user']['username'], data['pairs'][0]['b']['user']['username']} == {'anna', 'ben'}
+            assert all(s['indexed'] and s['starter_similarity'] is None for s in data['submissions'])
+
+            assert client.get(f'/api/assignments/{assignment.id}/similarity?threshold=2',
+                              headers=headers).status_code == 400
+            print("✓ Near-copy pair reported")
+
+            db.drop_all()
+
+    finally:
+        os.close(test_db_fd)
+        os.unlink(test_db_path)
+        shutil.rmtree(upload_folder, ignore_errors=True)
+
+if __name__ == '__main__':
+    try:
+        test_similarity()
+    except AssertionError as e:
+        print(f"\n✗ Test failed: {e}")
+        sys.exit(1)
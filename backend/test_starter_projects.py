@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Basic test for assignment starter projects.
+Tests that every assigned user gets one project sharing the template file.
+"""
+
+import sys
+import os
+import shutil
+import tempfile
+import threading
+sys.path.insert(0, '.')
+
+# Set environment variables
+os.environ.setdefault('SECRET_KEY', 'test-key')
+os.environ.setdefault('FRONTEND_URL', 'http://localhost:3000')
+
+def test_starter_projects():
+    """Test bulk fan-out, shared files and repeated runs"""
+    from app.models.users import User
+    from app.models.groups import Group
+    from app.models.projects import CollaborativeProject, Project, Commit
+    from app.models.assignments import Assignment, AssignmentStarterProject
+    from app.utils import starter_projects
+    from app import create_app, db
+
+    print("Testing starter projects...")
+
+    test_db_fd, test_db_path = tempfile.mkstemp(suffix='.db')
+    upload_folder = tempfile.mkdtemp()
+
+    try:
+        os.environ['DATABASE_URI'] = f'sqlite:///{test_db_path}'
+
+        app = create_app(debug=True)
+        app.config['UPLOAD_FOLDER'] = upload_folder
+        starter_projects.BATCH_SIZE = 2
+
+        with app.app_context():
+            db.create_all()
+
+            teacher = User(id='starter-teacher', username='teacher', role='teacher')
+            students = [User(id=f'starter-{i}', username=f'student{i}') for i in range(3)]
+            group = Group(name='6b', external_id='starter-6b')
+            db.session.add_all([teacher, group] + students)
+            db.session.flush()
+            group.members.extend(students[:2])
+
+            template_path = os.path.join(upload_folder, 'template.sb3')
+            with open(template_path, 'wb') as f:
+                f.write(b'PK template')
+            template = Project(name='Template', owner_id=teacher.id, sb3_file_path=template_path)
+            db.session.add(template)
+            db.session.flush()
+
+            assignment = Assignment(name='Starter')
+            db.session.add(assignment)
+            db.session.flush()
+            assignment.assign_to_group(group)
+            db.session.commit()
+
+            # Test 1: One project per assigned user, files are hard links
+            print("\n[Test 1] Fan-out...")
+            created = starter_projects.create_starter_projects(assignment.id, template.id, 'Maze', teacher.id)
+            assert created == 2
+            starters = AssignmentStarterProject.query.order_by(AssignmentStarterProject.user_id).all()
+            assert [s.user_id for s in starters] == ['starter-0', 'starter-1']
+            for starter in starters:
+                project = db.session.get(CollaborativeProject, starter.collaborative_project_id)
+                assert project.created_by == starter.user_id
+                assert project.latest_commit.owner_id == starter.user_id
+                assert Commit.query.filter_by(collaborative_project_id=project.id).count() == 1
+                assert os.path.samefile(project.latest_commit.sb3_file_path, template_path)
+            print("✓ 2 projects share the template file")
+
+            # Test 2: Repeating only creates the missing ones (in the background)
+            print("\n[Test 2] Repeated run...")
+            assignment.assign_to_user(students[2])
+            db.session.commit()
+            job_id = starter_projects.start_starter_project_job(app, assignment.id, template.id, 'Maze', teacher.id)
+            for thread in [t for t in threading.enumerate() if t.name.startswith('starter-projects-')]:
+                thread.join(10)
+            job = starter_projects.get_job(job_id)
+            assert job['status'] == 'completed', job
+            assert job['total'] == 1 and job['created'] == 1
+            assert AssignmentStarterProject.query.count() == 3
+            assert os.stat(template_path).st_nlink == 4
+            print("✓ Only the new student got a project")
+
+            # Test 3: Finished jobs expire
+            print("\n[Test 3] Job expiry...")
+
+            def run_job():
+                new_job_id = starter_projects.start_starter_project_job(app, assignment.id, template.id, 'Maze', teacher.id)
+                for thread in [t for t in threading.enumerate() if t.name.startswith('starter-projects-')]:
+                    thread.join(10)
+                return new_job_id
+
+            starter_projects._finished[job_id] -= starter_projects.JOB_TTL + 1
+            second_id = run_job()
+            assert starter_projects.get_job(job_id) is None
+            assert starter_projects.get_job(second_id)['status'] == 'completed'
+            max_finished, starter_projects.MAX_FINISHED_JOBS = starter_projects.MAX_FINISHED_JOBS, 1
+            try:
+                third_id = run_job()
+            finally:
+                starter_projects.MAX_FINISHED_JOBS = max_finished
+            assert starter_projects.get_job(second_id) is None
+            assert starter_projects.get_job(third_id)['total'] == 0
+            print("✓ Expired and surplus finished jobs are forgotten")
+
+            db.drop_all()
+
+    finally:
+        os.close(test_db_fd)
+        os.unlink(test_db_path)
+        shutil.rmtree(upload_folder)
+
+if __name__ == '__main__':
+    try:
+        test_starter_projects()
+    except AssertionError as e:
+        print(f"\n✗ Test failed: {e}")
+        sys.exit(1)
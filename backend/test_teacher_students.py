@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Basic test for the teacher student overview and student project listing.
+Tests project counts, search, group filter and pagination.
+"""
+
+import sys
+import os
+import tempfile
+from datetime import datetime, timezone, timedelta
+sys.path.insert(0, '.')
+
+# Set environment variables
+os.environ.setdefault('SECRET_KEY', 'test-key')
+os.environ.setdefault('FRONTEND_URL', 'http://localhost:3000')
+
+def test_teacher_students():
+    """Test the grouped student query through the endpoint"""
+    from app.models.users import User
+    from app.models.groups import Group
+    from app.models.oauth_session import OAuthSession
+    from app.models.projects import Project, CollaborativeProject
+    from app import create_app, db
+
+    print("Testing teacher student overview...")
+
+    test_db_fd, test_db_path = tempfile.mkstemp(suffix='.db')
+
+    try:
+        os.environ['DATABASE_URI'] = f'sqlite:///{test_db_path}'
+
+        app = create_app(debug=True)
+
+        with app.app_context():
+            db.create_all()
+
+            teacher = User(id='overview-teacher', username='teacher', role='teacher')
+            students = [User(id=f'overview-{name}', username=name, role='student')
+                        for name in ('emil', 'anna', 'ben_1', 'benno', 'carla')]
+            group = Group(name='7c', external_id='overview-7c')
+            db.session.add_all([teacher, group] + students)
+            db.session.flush()
+            group.members.extend(students[1:4])
+
+            db.session.add_all([
+                Project(name='Cat', owner_id='overview-anna'),
+                Project(name='Dog', owner_id='overview-anna'),
+                Project(name='Old', owner_id='overview-anna', deleted_at=datetime.now(timezone.utc)),
+                CollaborativeProject(name='Maze', created_by='overview-anna'),
+                CollaborativeProject(name='Pong', created_by='overview-carla'),
+            ])
+            db.session.add(OAuthSession(
+                id='overview-session', user_id=teacher.id, access_token='token',
+                expires_at=datetime.now(timezone.utc) + timedelta(hours=1)
+            ))
+            db.session.commit()
+
+            client = app.test_client()
+            headers = {'X-Session-ID': 'overview-session'}
+
+            # Test 1: Counts without pagination (teachers only see students)
+            print("\n[Test 1] Project counts...")
+            data = client.get('/api/teacher/students', headers=headers).get_json()
+            counts = {s['username']: s['project_count'] for s in data['students']}
+            assert counts == {'anna': 3, 'ben_1': 0, 'benno': 0, 'carla': 1, 'emil': 0}, counts
+            assert data['hasMore'] is False
+            print("✓ Normal and collaborative projects counted")
+
+            # Test 2: Search treats LIKE wildcards literally, group filter
+            print("\n[Test 2] Search and group filter...")
+            data = client.get('/api/teacher/students?search=N_1', headers=headers).get_json()
+            assert [s['username'] for s in data['students']] == ['ben_1']
+            data = client.get('/api/teacher/students?group_id=%d' % group.id, headers=headers).get_json()
+            assert [s['username'] for s in data['students']] == ['anna', 'ben_1', 'benno']
+            print("✓ Filters applied in SQL")
+
+            # Test 3: Keyset pages cover everything exactly once
+            print("\n[Test 3] Keyset pagination...")
+            names, cursor = [], None
+            while True:
+                url = '/api/teacher/students?limit=2' + (f'&cursor={cursor}' if cursor else '')
+                data = client.get(url, headers=headers).get_json()
+                names += [s['username'] for s in data['students']]
+                if not data['hasMore']:
+                    break
+                cursor = data['nextCursor']
+            assert names == ['anna', 'ben_1', 'benno', 'carla', 'emil']
+            assert client.get('/api/teacher/students?cursor=bogus', headers=headers).status_code == 400
+            print("✓ Pages are complete and ordered")
+
+            db.drop_all()
+
+    finally:
+        os.close(test_db_fd)
+        os.unlink(test_db_path)
+
+def test_student_projects():
+    """Test the aggregated per-student project listing"""
+    from app.models.users import User
+    from app.models.oauth_session import OAuthSession
+    from app.models.projects import (
+        Project, CollaborativeProject, CollaborativeProjectPermission, Commit, WorkingCopy, PermissionLevel
+    )
+    from app import create_app, db
+
+    print("Testing student project listing...")
+
+    test_db_fd, test_db_path = tempfile.mkstemp(suffix='.db')
+
+    try:
+        os.environ['DATABASE_URI'] = f'sqlite:///{test_db_path}'
+
+        app = create_app(debug=True)
+
+        with app.app_context():
+            db.create_all()
+
+            now = datetime.now(timezone.utc)
+            teacher = User(id='listing-teacher', username='teacher', role='teacher')
+            student = User(id='listing-student', username='student', role='student')
+            friend = User(id='listing-friend', username='friend', role='student')
+            db.session.add_all([teacher, student, friend])
+            db.session.flush()
+
+            normal = Project(name='Solo', owner_id=student.id, updated_at=now - timedelta(days=3))
+            owned = CollaborativeProject(name='Owned', created_by=student.id, created_at=now - timedelta(days=5))
+            shared = CollaborativeProject(name='Shared', created_by=friend.id, created_at=now - timedelta(days=4))
+            db.session.add_all([normal, owned, shared])
+            db.session.flush()
+
+            for number in (1, 2):
+                commit_project = Project(name=f'Owned - Commit {number}', owner_id=student.id,
+                                         thumbnail_path='/tmp/thumb.png')
+                db.session.add(commit_project)
+                db.session.flush()
+                db.session.add(Commit(project_id=commit_project.id, collaborative_project_id=owned.id,
+                                      commit_number=number, committed_by=student.id,
+                                      committed_at=now - timedelta(days=2)))
+                owned.latest_commit_id = commit_project.id
+
+            working_copy = Project(name='Shared - WC', owner_id=student.id)
+            db.session.add(working_copy)
+            db.session.flush()
+            db.session.add(WorkingCopy(project_id=working_copy.id, collaborative_project_id=shared.id,
+                                       user_id=student.id, based_on_commit_id=commit_project.id,
+                                       updated_at=now - timedelta(days=1)))
+            db.session.add(CollaborativeProjectPermission(collaborative_project_id=shared.id,
+                                                          user_id=student.id, permission=PermissionLevel.WRITE))
+            db.session.add(OAuthSession(
+                id='listing-session', user_id=teacher.id, access_token='token',
+                expires_at=now + timedelta(hours=1)
+            ))
+            db.session.commit()
+
+            client = app.test_client()
+            headers = {'X-Session-ID': 'listing-session'}
+            url = f'/api/teacher/students/{student.id}/projects'
+
+            # Test 1: All projects, newest edit first, with aggregates
+            print("\n[Test 1] Full listing...")
+            data = client.get(url, headers=headers).get_json()
+            projects = data['projects']
+            assert [p['name'] for p in projects] == ['Shared', 'Owned', 'Solo'], projects
+            assert projects[0]['is_collaborator'] and projects[0]['owner_username'] == 'friend'
+            assert projects[0]['write_admin_count'] == 2
+            assert projects[1]['commit_count'] == 2 and projects[1]['thumbnail_url']
+            assert projects[2]['project_type'] == 'normal'
+            print("✓ Sorted by last edit, commits and working copies excluded")
+
+            # Test 2: Pages and field selection
+            print("\n[Test 2] Pagination and fields...")
+            data = client.get(url + '?limit=2&offset=1&fields=id,name', headers=headers).get_json()
+            assert data['total'] == 3 and data['hasMore'] is False
+            assert data['projects'] == [{'id': owned.id, 'name': 'Owned'}, {'id': normal.id, 'name': 'Solo'}]
+            print("✓ Page contains only the selected fields")
+
+            db.drop_all()
+
+    finally:
+        os.close(test_db_fd)
+        os.unlink(test_db_path)
+
+if __name__ == '__main__':
+    try:
+        test_teacher_students()
+        test_student_projects()
+    except AssertionError as e:
+        print(f"\n✗ Test failed: {e}")
+        sys.exit(1)
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Basic test for the streaming ZIP builder.
+Tests that the archive is valid and that every byte range matches it.
+"""
+
+import sys
+import os
+import io
+import tempfile
+import zipfile
+from datetime import datetime
+sys.path.insert(0, '.')
+
+def _build_archive(paths):
+    from app.utils.zip_stream import ZipStream
+
+    archive = ZipStream()
+    for path in paths:
+        archive.add_file('Schüler.sb3', path, modified=datetime(2025, 3, 4, 5, 6, 7))
+    archive.add_bytes('manifest.csv', b'username,file\n')
+    return archive
+
+def test_zip_stream():
+    """Test full archive and byte ranges"""
+    print("Testing streaming ZIP...")
+
+    test_dir = tempfile.mkdtemp()
+    paths = []
+    for i in range(3):
+        path = os.path.join(test_dir, f'project{i}.sb3')
+        with open(path, 'wb') as f:
+            f.write(os.urandom(70000 * (i + 1)))
+        paths.append(path)
+
+    try:
+        # Test 1: Whole archive is a valid ZIP with unique names
+        print("\n[Test 1] Full archive...")
+        archive = _build_archive(paths)
+        data = b''.join(archive.iter_bytes())
+        assert len(data) == archive.size
+        with zipfile.ZipFile(io.BytesIO(data)) as zf:
+            assert zf.namelist() == ['Schüler.sb3', 'Schüler_2.sb3', 'Schüler_3.sb3', 'manifest.csv']
+            assert zf.testzip() is None
+            with open(paths[1], 'rb') as f:
+                assert zf.read('Schüler_2.sb3') == f.read()
+        print("✓ Archive is valid")
+
+        # Test 2: Ranges (fresh archives, like separate requests)
+        print("\n[Test 2] Byte ranges...")
+        for start, stop in ((0, 10), (5, 150000), (200000, None), (archive.size - 30, None)):
+            part = b''.join(_build_archive(paths).iter_bytes(start, stop))
+            assert part == data[start:stop], f"Range {start}-{stop} differs"
+        assert _build_archive(paths).etag == archive.etag
+        print("✓ Ranges match the full archive")
+
+        # Test 3: Each file is read once, CRCs are reused across archives
+        print("\n[Test 3] Single read...")
+        from app.utils import zip_stream
+        opened = []
+
+        def counting_open(path, *args, **kwargs):
+            opened.append(path)
+            return open(path, *args, **kwargs)
+
+        zip_stream._crc_cache.clear()
+        zip_stream.open = counting_open
+        try:
+            assert b''.join(_build_archive(paths).iter_bytes()) == data
+            assert sorted(opened) == sorted(paths)
+            del opened[:]
+            assert b''.join(_build_archive(paths).iter_bytes(archive.size - 30, None)) == data[-30:]
+            assert opened == []
+            zip_stream._crc_cache.clear()
+            assert b''.join(_build_archive(paths).iter_bytes(200000, None)) == data[200000:]
+            assert len(opened) == len(paths) + 1  # Skipped and partly sent files are read for their CRC
+        finally:
+            del zip_stream.open
+        print("✓ CRCs computed while streaming and cached for ranges")
+
+    finally:
+        for path in paths:
+            os.unlink(path)
+        os.rmdir(test_dir)
+
+if __name__ == '__main__':
+    try:
+        test_zip_stream()
+    except AssertionError as e:
+        print(f"\n✗ Test failed: {e}")
+        sys.exit(1)